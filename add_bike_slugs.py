@@ -0,0 +1,48 @@
+"""
+Add the slug column to the bikes table
+Run this script to add the column, backfill slugs for existing bikes and create the unique index
+"""
+from app import create_app, db
+from app.models.bike import Bike
+from app.services.comparison_catalog import bike_slug
+from sqlalchemy import text
+
+app = create_app()
+
+def add_bike_slugs():
+    with app.app_context():
+        try:
+            inspector = db.inspect(db.engine)
+            existing_columns = [col['name'] for col in inspector.get_columns('bikes')]
+
+            if 'slug' not in existing_columns:
+                db.session.execute(text("ALTER TABLE bikes ADD COLUMN slug VARCHAR(120)"))
+                print("✓ Added column: slug")
+            else:
+                print("⊘ Column already exists: slug")
+
+            # Oldest bikes get the plain slug when two share a brand and model
+            filled = 0
+            for bike in Bike.query.filter(Bike.slug.is_(None)).order_by(Bike.id).all():
+                bike.slug = bike_slug(bike.brand, bike.model, bike.year, bike.id)
+                db.session.flush()
+                filled += 1
+            print(f"✓ Backfilled slugs for {filled} bikes")
+
+            existing_indexes = [index['name'] for index in inspector.get_indexes('bikes')]
+            if 'ix_bikes_slug' not in existing_indexes:
+                db.session.execute(text("CREATE UNIQUE INDEX ix_bikes_slug ON bikes (slug)"))
+                print("✓ Created unique index: ix_bikes_slug")
+            else:
+                print("⊘ Index already exists: ix_bikes_slug")
+
+            db.session.commit()
+            print("\n✓ Bike slugs added successfully!")
+
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error: {str(e)}")
+
+if __name__ == '__main__':
+    print("Adding slugs to bikes table...\n")
+    add_bike_slugs()
@@ -0,0 +1,21 @@
+"""
+Create the simulation_jobs table used by background simulations
+Safe to run more than once
+"""
+from app import create_app, db
+from app.models.simulation_jobs import SimulationJob
+
+app = create_app()
+
+def add_simulation_jobs():
+    with app.app_context():
+        try:
+            SimulationJob.__table__.create(db.engine, checkfirst=True)
+            print("✓ simulation_jobs table ready")
+            
+        except Exception as e:
+            print(f"✗ Error: {str(e)}")
+
+if __name__ == '__main__':
+    print("Adding simulation jobs table...\n")
+    add_simulation_jobs()
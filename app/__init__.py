@@ -10,6 +10,9 @@ def create_app(config_name='development'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
     
+    from app.utils.serialization import ApiJSONProvider
+    app.json = ApiJSONProvider(app)
+    
     # Initialize extensions
     db.init_app(app)
     login_manager.init_app(app)
@@ -31,6 +34,7 @@ def create_app(config_name='development'):
     from app.blueprints.resale import resale_bp
     from app.blueprints.community import community_bp
     from app.blueprints.admin import admin_bp
+    from app.api import api_bp
     
     app.register_blueprint(auth_bp, url_prefix='/auth')
     app.register_blueprint(dashboard_bp, url_prefix='/dashboard')
@@ -43,6 +47,16 @@ def create_app(config_name='development'):
     app.register_blueprint(resale_bp, url_prefix='/resale')
     app.register_blueprint(community_bp, url_prefix='/community')
     app.register_blueprint(admin_bp, url_prefix='/admin')
+    app.register_blueprint(api_bp)
+    
+    from app.utils.query_budget import init_query_budgets
+    init_query_budgets(app)
+    
+    from app.utils.compression import init_compression
+    init_compression(app)
+    
+    from app.services.simulation_jobs import simulation_jobs
+    simulation_jobs.init_app(app)
     
     # Home route
     @app.route('/')
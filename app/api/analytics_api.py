@@ -4,6 +4,7 @@ from app.api import api_bp
 from app.models.bike import Bike
 from app.models.user import User
 from app.models.reviews import Review
+from app.models.bike_rating_summary import BikeRatingSummary
 from app.models.accident_reports import AccidentReport
 from app.models.ride_logs import RideLog
 from app.models.user_bikes import UserBike
@@ -53,19 +54,17 @@ def get_popular_bikes():
         limit = request.args.get('limit', 10, type=int)
         
         # Get bikes with most reviews
-        popular = db.session.query(
-            Bike,
-            func.count(Review.id).label('review_count'),
-            func.avg(Review.rating).label('avg_rating')
-        ).join(Review).filter(
+        popular = db.session.query(Bike, BikeRatingSummary).join(
+            BikeRatingSummary, BikeRatingSummary.bike_id == Bike.id
+        ).filter(
             Bike.is_active == True,
-            Review.is_verified == True
-        ).group_by(Bike.id).order_by(
-            func.count(Review.id).desc()
+            BikeRatingSummary.review_count > 0
+        ).order_by(
+            BikeRatingSummary.review_count.desc()
         ).limit(limit).all()
         
         popular_bikes = []
-        for bike, review_count, avg_rating in popular:
+        for bike, summary in popular:
             popular_bikes.append({
                 'bike': {
                     'id': bike.id,
@@ -75,8 +74,8 @@ def get_popular_bikes():
                     'price': bike.price,
                     'category': bike.category
                 },
-                'review_count': review_count,
-                'average_rating': round(avg_rating, 2)
+                'review_count': summary.review_count,
+                'average_rating': round(summary.average_rating, 2)
             })
         
         return jsonify({
@@ -98,21 +97,17 @@ def get_top_rated_bikes():
         limit = request.args.get('limit', 10, type=int)
         min_reviews = request.args.get('min_reviews', 5, type=int)
         
-        top_rated = db.session.query(
-            Bike,
-            func.avg(Review.rating).label('avg_rating'),
-            func.count(Review.id).label('review_count')
-        ).join(Review).filter(
+        top_rated = db.session.query(Bike, BikeRatingSummary).join(
+            BikeRatingSummary, BikeRatingSummary.bike_id == Bike.id
+        ).filter(
             Bike.is_active == True,
-            Review.is_verified == True
-        ).group_by(Bike.id).having(
-            func.count(Review.id) >= min_reviews
+            BikeRatingSummary.review_count >= max(min_reviews, 1)
         ).order_by(
-            func.avg(Review.rating).desc()
+            (BikeRatingSummary.rating_sum * 1.0 / BikeRatingSummary.review_count).desc()
         ).limit(limit).all()
         
         top_bikes = []
-        for bike, avg_rating, review_count in top_rated:
+        for bike, summary in top_rated:
             top_bikes.append({
                 'bike': {
                     'id': bike.id,
@@ -121,8 +116,8 @@ def get_top_rated_bikes():
                     'year': bike.year,
                     'price': bike.price
                 },
-                'average_rating': round(avg_rating, 2),
-                'review_count': review_count
+                'average_rating': round(summary.average_rating, 2),
+                'review_count': summary.review_count
             })
         
         return jsonify({
@@ -256,17 +251,22 @@ def get_riding_patterns():
 def get_brand_comparison():
     """Compare statistics across brands"""
     try:
+        # One summary row per bike, so the join does not fan out
         brands = db.session.query(
             Bike.brand,
             func.count(Bike.id).label('model_count'),
             func.avg(Bike.price).label('avg_price'),
-            func.avg(Review.rating).label('avg_rating')
-        ).outerjoin(Review).filter(
+            func.sum(BikeRatingSummary.rating_sum).label('rating_sum'),
+            func.sum(BikeRatingSummary.review_count).label('review_count')
+        ).outerjoin(
+            BikeRatingSummary, BikeRatingSummary.bike_id == Bike.id
+        ).filter(
             Bike.is_active == True
         ).group_by(Bike.brand).all()
         
         brand_data = []
-        for brand, model_count, avg_price, avg_rating in brands:
+        for brand, model_count, avg_price, rating_sum, review_count in brands:
+            avg_rating = rating_sum / review_count if review_count else 0
             brand_data.append({
                 'brand': brand,
                 'model_count': model_count,
@@ -1,92 +1,141 @@
-from flask import jsonify, request
+from flask import jsonify, request, Response, stream_with_context
+from sqlalchemy import select
 from app.api import api_bp
 from app.models.bike import Bike
-from app.models.bike_specs import BikeSpec
+from app.models.bike_specs import BikeSpec, DERIVED_METRICS
 from app.models.reviews import Review
+from app.models.bike_rating_summary import BikeRatingSummary
+from app.services.catalog_repository import catalog_repository, BIKE_FIELDS, SPEC_FIELDS
+from app.services.search_engine import search_engine
+from app.services.autocomplete import bike_autocomplete
+from app.services.spec_matrix import get_spec_matrix, resolve_column, UnknownColumn
+from app.services.similarity import get_similarity_index, similarity_score
+from app.services.comparison_engine import comparison_engine
+from app.services.comparison_cache import comparison_cache
+from app.services.skyline import get_skyline, parse_axes
+from app.services.ranking import get_ranking_features, resolve_weights, RANKING_COMPONENTS
+from app.services.physics import physics_engine
+from app.services.performance_simulator import PerformanceSimulator
+from app.services.facets import get_facet_index, mask_to_bits, FACETS
+from app.utils.pagination import page_args, encode_cursor, decode_cursor, InvalidCursor
+from app.utils.decorators import catalog_etag
+from app.utils.export import stream_rows, ndjson_chunks, csv_chunks, EXPORT_FORMATS
+from app.utils.query_budget import query_budget
+from app.models.loading_profiles import load_profile
 from app import db
-from sqlalchemy import func
+
+MAX_BATCH_SIZE = 100
+MAX_SIMILAR = 50
+
+def _bike_summary(bike):
+    """Serialize a bike with its headline specs"""
+    bike_dict = {
+        'id': bike.id,
+        'brand': bike.brand,
+        'model': bike.model,
+        'year': bike.year,
+        'category': bike.category,
+        'price': bike.price,
+        'image_url': bike.image_url,
+        'specs': None
+    }
+    
+    if bike.specs:
+        bike_dict['specs'] = {
+            'engine_cc': bike.specs.engine_cc,
+            'max_power': bike.specs.max_power,
+            'max_torque': bike.specs.max_torque,
+            'top_speed': bike.specs.top_speed,
+            'acceleration_0_100': bike.specs.acceleration_0_100,
+            'mileage_city': bike.specs.mileage_city,
+            'mileage_highway': bike.specs.mileage_highway,
+            'kerb_weight': bike.specs.kerb_weight,
+            'fuel_capacity': bike.specs.fuel_capacity,
+            'seat_height': bike.specs.seat_height
+        }
+    
+    return bike_dict
+
+
+def _range_filters():
+    """Collect min_<attr>/max_<attr> query parameters into column ranges"""
+    ranges = {}
+    for key in request.args:
+        if key[:4] in ('min_', 'max_'):
+            column = resolve_column(key[4:])
+            value = request.args.get(key, type=float)
+            if value is None:
+                continue
+            low, high = ranges.get(column, (None, None))
+            ranges[column] = (value, high) if key[:4] == 'min_' else (low, value)
+    return ranges
+
 
 @api_bp.route('/bikes', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
 def get_bikes():
-    """Get all bikes with optional filters"""
+    """Get all bikes with optional filters
+    
+    Any numeric attribute can be range-filtered with min_<name>/max_<name>
+    (e.g. min_power, max_seat_height) and ordered with sort=<name> or
+    sort=-<name> for descending.
+    """
     try:
         # Query parameters for filtering
         brand = request.args.get('brand')
         category = request.args.get('category')
-        min_price = request.args.get('min_price', type=float)
-        max_price = request.args.get('max_price', type=float)
-        min_cc = request.args.get('min_cc', type=int)
-        max_cc = request.args.get('max_cc', type=int)
-        limit = request.args.get('limit', 50, type=int)
-        offset = request.args.get('offset', 0, type=int)
-        
-        # Build query
-        query = Bike.query.filter_by(is_active=True)
+        sort = request.args.get('sort')
+        limit, cursor, include_total = page_args()
         
-        if brand:
-            query = query.filter(Bike.brand.ilike(f'%{brand}%'))
+        ranges = _range_filters()
         
-        if category:
-            query = query.filter(Bike.category.ilike(f'%{category}%'))
+        descending = False
+        if sort:
+            descending = sort.startswith('-')
+            sort = resolve_column(sort.lstrip('-+'))
         
-        if min_price:
-            query = query.filter(Bike.price >= min_price)
+        # Filter and order in memory against the columnar spec matrix
+        matrix = get_spec_matrix()
+        mask = matrix.mask(ranges, brand=brand, category=category)
         
-        if max_price:
-            query = query.filter(Bike.price <= max_price)
+        sort_key = f"bikes:{'-' if descending else ''}{sort or 'id'}"
+        after = None
+        if cursor:
+            after = tuple(decode_cursor(cursor, sort_key, (float, int)))
         
-        # Join with specs for CC filtering
-        if min_cc or max_cc:
-            query = query.join(BikeSpec)
-            if min_cc:
-                query = query.filter(BikeSpec.engine_cc >= min_cc)
-            if max_cc:
-                query = query.filter(BikeSpec.engine_cc <= max_cc)
-        
-        # Get total count
-        total_count = query.count()
+        positions, keys = matrix.select(mask, sort, descending, after=after, limit=limit + 1)
         
         # Apply pagination
-        bikes = query.limit(limit).offset(offset).all()
+        next_cursor = None
+        if len(positions) > limit:
+            positions = positions[:limit]
+            last = positions[-1]
+            next_cursor = encode_cursor(sort_key, [float(keys[last]), int(matrix.ids[last])])
         
-        # Serialize bikes
-        bikes_data = []
-        for bike in bikes:
-            bike_dict = {
-                'id': bike.id,
-                'brand': bike.brand,
-                'model': bike.model,
-                'year': bike.year,
-                'category': bike.category,
-                'price': bike.price,
-                'image_url': bike.image_url,
-                'specs': None
-            }
-            
-            if bike.specs:
-                bike_dict['specs'] = {
-                    'engine_cc': bike.specs.engine_cc,
-                    'max_power': bike.specs.max_power,
-                    'max_torque': bike.specs.max_torque,
-                    'top_speed': bike.specs.top_speed,
-                    'acceleration_0_100': bike.specs.acceleration_0_100,
-                    'mileage_city': bike.specs.mileage_city,
-                    'mileage_highway': bike.specs.mileage_highway,
-                    'kerb_weight': bike.specs.kerb_weight,
-                    'fuel_capacity': bike.specs.fuel_capacity,
-                    'seat_height': bike.specs.seat_height
-                }
-            
-            bikes_data.append(bike_dict)
+        bikes = [matrix.records[position] for position in positions]
         
-        return jsonify({
+        bikes_data = [_bike_summary(bike) for bike in bikes]
+        
+        response = {
             'success': True,
-            'total_count': total_count,
             'returned_count': len(bikes_data),
             'limit': limit,
-            'offset': offset,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
             'data': bikes_data
-        }), 200
+        }
+        
+        if include_total:
+            response['total_count'] = int(mask.sum())
+        
+        return jsonify(response), 200
+        
+    except (InvalidCursor, UnknownColumn) as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
         
     except Exception as e:
         return jsonify({
@@ -95,94 +144,126 @@ def get_bikes():
         }), 500
 
 
+def _review_stamp(bike_id):
+    """Cheap validator for the review data embedded in bike details"""
+    summary = db.session.get(BikeRatingSummary, bike_id)
+    if summary is None:
+        return '0'
+    return f'{summary.review_count}:{summary.updated_at}'
+
+
+def _recent_reviews(summaries):
+    """Load the recent reviews of every summary in one query
+
+    Returns {bike_id: [Review, ...]} newest first.
+    """
+    review_ids = [rid for summary in summaries for rid in summary.recent_ids]
+    if not review_ids:
+        return {}
+    
+    by_id = {
+        review.id: review
+        for review in Review.query.options(*load_profile('review_with_author')).filter(
+            Review.id.in_(review_ids)
+        )
+    }
+    return {
+        summary.bike_id: [by_id[rid] for rid in summary.recent_ids if rid in by_id]
+        for summary in summaries
+    }
+
+
+def _bike_details(bike, summary, recent_reviews):
+    """Serialize a bike with specs, rating summary and recent reviews
+
+    bike may be a Bike or a catalog BikeRecord.
+    """
+    reviews_data = []
+    for review in recent_reviews:
+        reviews_data.append({
+            'id': review.id,
+            'rating': review.rating,
+            'title': review.title,
+            'content': review.content[:200],
+            'author': review.author.username,
+            'created_at': review.created_at.strftime('%Y-%m-%d')
+        })
+    
+    bike_data = {
+        'id': bike.id,
+        'brand': bike.brand,
+        'model': bike.model,
+        'year': bike.year,
+        'category': bike.category,
+        'price': bike.price,
+        'image_url': bike.image_url,
+        'ratings': {
+            'average': round(summary.average_rating, 2) if summary else 0,
+            'count': summary.review_count if summary else 0,
+            'categories': {
+                category: round(average, 2)
+                for category, average in summary.category_averages.items()
+            } if summary else {},
+            'histogram': summary.histogram if summary else {}
+        },
+        'recent_reviews': reviews_data
+    }
+    
+    if bike.specs:
+        bike_data['specifications'] = {
+            'engine': {
+                'cc': bike.specs.engine_cc,
+                'type': bike.specs.engine_type,
+                'max_power': bike.specs.max_power,
+                'max_power_rpm': bike.specs.max_power_rpm,
+                'max_torque': bike.specs.max_torque,
+                'max_torque_rpm': bike.specs.max_torque_rpm,
+                'fuel_system': bike.specs.fuel_system
+            },
+            'performance': {
+                'top_speed': bike.specs.top_speed,
+                'acceleration_0_100': bike.specs.acceleration_0_100,
+                'mileage_city': bike.specs.mileage_city,
+                'mileage_highway': bike.specs.mileage_highway
+            },
+            'dimensions': {
+                'length': bike.specs.length,
+                'width': bike.specs.width,
+                'height': bike.specs.height,
+                'wheelbase': bike.specs.wheelbase,
+                'ground_clearance': bike.specs.ground_clearance,
+                'seat_height': bike.specs.seat_height,
+                'kerb_weight': bike.specs.kerb_weight,
+                'fuel_capacity': bike.specs.fuel_capacity
+            },
+            'brakes_suspension': {
+                'front_brake': bike.specs.front_brake,
+                'rear_brake': bike.specs.rear_brake,
+                'front_suspension': bike.specs.front_suspension,
+                'rear_suspension': bike.specs.rear_suspension
+            },
+            'tyres': {
+                'front': bike.specs.front_tyre,
+                'rear': bike.specs.rear_tyre
+            }
+        }
+    
+    return bike_data
+
+
 @api_bp.route('/bikes/<int:bike_id>', methods=['GET'])
+@catalog_etag(validator=_review_stamp)
+@query_budget(3)
 def get_bike_details(bike_id):
     """Get detailed information about a specific bike"""
     try:
-        bike = Bike.query.get_or_404(bike_id)
-        
-        # Calculate average rating
-        avg_rating = db.session.query(func.avg(Review.rating)).filter_by(
-            bike_id=bike_id, 
-            is_verified=True
-        ).scalar() or 0
-        
-        # Get review count
-        review_count = Review.query.filter_by(
-            bike_id=bike_id, 
-            is_verified=True
-        ).count()
-        
-        # Get recent reviews
-        recent_reviews = Review.query.filter_by(
-            bike_id=bike_id, 
-            is_verified=True
-        ).order_by(Review.created_at.desc()).limit(5).all()
-        
-        reviews_data = []
-        for review in recent_reviews:
-            reviews_data.append({
-                'id': review.id,
-                'rating': review.rating,
-                'title': review.title,
-                'content': review.content[:200],
-                'author': review.author.username,
-                'created_at': review.created_at.strftime('%Y-%m-%d')
-            })
-        
-        bike_data = {
-            'id': bike.id,
-            'brand': bike.brand,
-            'model': bike.model,
-            'year': bike.year,
-            'category': bike.category,
-            'price': bike.price,
-            'image_url': bike.image_url,
-            'ratings': {
-                'average': round(avg_rating, 2),
-                'count': review_count
-            },
-            'recent_reviews': reviews_data
-        }
+        bike = Bike.query.options(*load_profile('bike_details')).filter_by(
+            id=bike_id
+        ).first_or_404()
         
-        if bike.specs:
-            bike_data['specifications'] = {
-                'engine': {
-                    'cc': bike.specs.engine_cc,
-                    'type': bike.specs.engine_type,
-                    'max_power': bike.specs.max_power,
-                    'max_power_rpm': bike.specs.max_power_rpm,
-                    'max_torque': bike.specs.max_torque,
-                    'max_torque_rpm': bike.specs.max_torque_rpm,
-                    'fuel_system': bike.specs.fuel_system
-                },
-                'performance': {
-                    'top_speed': bike.specs.top_speed,
-                    'acceleration_0_100': bike.specs.acceleration_0_100,
-                    'mileage_city': bike.specs.mileage_city,
-                    'mileage_highway': bike.specs.mileage_highway
-                },
-                'dimensions': {
-                    'length': bike.specs.length,
-                    'width': bike.specs.width,
-                    'height': bike.specs.height,
-                    'wheelbase': bike.specs.wheelbase,
-                    'ground_clearance': bike.specs.ground_clearance,
-                    'seat_height': bike.specs.seat_height,
-                    'kerb_weight': bike.specs.kerb_weight,
-                    'fuel_capacity': bike.specs.fuel_capacity
-                },
-                'brakes_suspension': {
-                    'front_brake': bike.specs.front_brake,
-                    'rear_brake': bike.specs.rear_brake,
-                    'front_suspension': bike.specs.front_suspension,
-                    'rear_suspension': bike.specs.rear_suspension
-                },
-                'tyres': {
-                    'front': bike.specs.front_tyre,
-                    'rear': bike.specs.rear_tyre
-                }
-            }
+        summary = bike.rating_summary
+        recent_reviews = _recent_reviews([summary] if summary else [])
+        bike_data = _bike_details(bike, summary, recent_reviews.get(bike.id, []))
         
         return jsonify({
             'success': True,
@@ -196,20 +277,297 @@ def get_bike_details(bike_id):
         }), 404
 
 
+@api_bp.route('/bikes/<int:bike_id>/similar', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
+def get_similar_bikes(bike_id):
+    """Get the bikes most similar to bike_id by spec profile
+    
+    Optional ?k= (default 10, max 50) and ?weights=power:2,price:0.5 to
+    change how much each feature counts.
+    """
+    try:
+        k = min(max(request.args.get('k', 10, type=int), 1), MAX_SIMILAR)
+        weights = None
+        if request.args.get('weights'):
+            weights = {}
+            for pair in request.args['weights'].split(','):
+                name, _, value = pair.partition(':')
+                weights[name.strip()] = float(value)
+        
+        index = get_similarity_index()
+        neighbours = index.similar(bike_id, k=k, weights=weights)
+        if neighbours is None:
+            return jsonify({
+                'success': False,
+                'error': 'Bike not found'
+            }), 404
+        
+        similar = []
+        for bike, distance in neighbours:
+            bike_dict = _bike_summary(bike)
+            bike_dict['similarity'] = round(similarity_score(distance), 4)
+            similar.append(bike_dict)
+        
+        return jsonify({
+            'success': True,
+            'bike_id': bike_id,
+            'count': len(similar),
+            'data': similar
+        }), 200
+        
+    except UnknownColumn as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+        
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'weights must look like power:2,price:0.5'
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/bikes/<int:bike_id>/acceleration', methods=['GET'])
+@query_budget(1)
+def get_bike_acceleration(bike_id):
+    """Simulate a full-throttle launch and top-gear roll-ons for a bike
+    
+    Optional ?rider_weight= (kg, default 75), ?weather= and ?road_type=
+    (as in the simulator) and ?curve_step= (seconds between speed curve
+    samples, default 0.5).
+    """
+    try:
+        rider_weight = request.args.get('rider_weight', 75, type=float)
+        curve_step = request.args.get('curve_step', 0.5, type=float)
+        if not 0 <= rider_weight <= 300 or not 0.1 <= curve_step <= 5:
+            return jsonify({
+                'success': False,
+                'error': 'rider_weight must be 0-300 kg and curve_step 0.1-5 s'
+            }), 400
+        
+        bike = catalog_repository.snapshot().get(bike_id)
+        if bike is None:
+            return jsonify({
+                'success': False,
+                'error': 'Bike not found'
+            }), 404
+        
+        power_modifier = PerformanceSimulator().get_power_modifier(
+            request.args.get('weather', 'sunny'), request.args.get('road_type', 'highway')
+        )
+        run = physics_engine.simulate(bike, rider_weight, power_modifier, curve_step=curve_step)
+        if run is None:
+            return jsonify({
+                'success': False,
+                'error': 'Bike specifications not available'
+            }), 422
+        
+        return jsonify({
+            'success': True,
+            'bike_id': bike_id,
+            'rider_weight': rider_weight,
+            'data': run
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/bikes/batch', methods=['GET'])
+@query_budget(3)
+def get_bikes_batch_get():
+    """Get details for several bikes given as ?ids=1,2,3"""
+    raw_ids = request.args.get('ids', '')
+    try:
+        bike_ids = [int(value) for value in raw_ids.split(',') if value.strip()]
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'error': 'ids must be a comma-separated list of integers'
+        }), 400
+    return _batch_response(bike_ids)
+
+
+@api_bp.route('/bikes/batch', methods=['POST'])
+@query_budget(3)
+def get_bikes_batch():
+    """Get details for several bikes given as {"bike_ids": [...]}"""
+    data = request.get_json(silent=True) or {}
+    try:
+        bike_ids = [int(value) for value in data.get('bike_ids', [])]
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'bike_ids must be a list of integers'
+        }), 400
+    return _batch_response(bike_ids)
+
+
+def _batch_response(bike_ids):
+    """Build get_bike_details payloads for bike_ids with set-based queries
+
+    Bikes come from the catalog snapshot; rating summaries and recent
+    reviews take one query each, however many ids are requested.
+    """
+    try:
+        bike_ids = list(dict.fromkeys(bike_ids))
+        if not bike_ids:
+            return jsonify({
+                'success': False,
+                'error': 'At least 1 bike ID required'
+            }), 400
+        
+        if len(bike_ids) > MAX_BATCH_SIZE:
+            return jsonify({
+                'success': False,
+                'error': f'At most {MAX_BATCH_SIZE} bike IDs per request'
+            }), 400
+        
+        snapshot = catalog_repository.snapshot()
+        bikes = [bike for bike in (snapshot.get(bike_id, include_inactive=True) for bike_id in bike_ids) if bike]
+        
+        summaries = {}
+        if bikes:
+            summaries = {
+                summary.bike_id: summary
+                for summary in BikeRatingSummary.query.filter(
+                    BikeRatingSummary.bike_id.in_([bike.id for bike in bikes])
+                )
+            }
+        recent_reviews = _recent_reviews(list(summaries.values()))
+        
+        found = {bike.id: bike for bike in bikes}
+        bikes_data = []
+        errors = []
+        for bike_id in bike_ids:
+            bike = found.get(bike_id)
+            if bike is None:
+                errors.append({'id': bike_id, 'error': 'Bike not found'})
+                continue
+            bikes_data.append(_bike_details(
+                bike, summaries.get(bike_id), recent_reviews.get(bike_id, [])
+            ))
+        
+        return jsonify({
+            'success': True,
+            'returned_count': len(bikes_data),
+            'data': bikes_data,
+            'errors': errors
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/bikes/export', methods=['GET'])
+@query_budget(1)
+def export_bikes():
+    """Stream the full catalog with every spec column as NDJSON or CSV
+    
+    ?format=ndjson (default) or csv; ?include_inactive=true adds
+    deactivated bikes. ?sort=<metric> or sort=-<metric> orders by one of
+    the stored derived metrics (e.g. -performance_score) using its index;
+    bikes without specs are left out of a sorted export.
+    """
+    export_format = request.args.get('format', 'ndjson').lower()
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({
+            'success': False,
+            'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        }), 400
+    
+    columns = BIKE_FIELDS + SPEC_FIELDS
+    statement = select(
+        *(getattr(Bike, field) for field in BIKE_FIELDS),
+        *(getattr(BikeSpec, field) for field in SPEC_FIELDS)
+    )
+    
+    sort = request.args.get('sort')
+    if sort:
+        descending = sort.startswith('-')
+        try:
+            metric = resolve_column(sort.lstrip('-+'))
+        except UnknownColumn:
+            metric = None
+        if metric not in DERIVED_METRICS:
+            return jsonify({
+                'success': False,
+                'error': f"sort must be one of: {', '.join(DERIVED_METRICS)}"
+            }), 400
+        
+        # Walk the metric's index; ties fall back to rowid order within it
+        order = (getattr(BikeSpec, metric), BikeSpec.id)
+        statement = statement.select_from(BikeSpec).join(Bike, Bike.id == BikeSpec.bike_id).order_by(
+            *(column.desc() if descending else column for column in order)
+        )
+    else:
+        statement = statement.outerjoin(BikeSpec, BikeSpec.bike_id == Bike.id).order_by(Bike.id)
+    if request.args.get('include_inactive', '').lower() not in ('1', 'true', 'yes'):
+        statement = statement.where(Bike.is_active == True)
+    
+    write_chunks = csv_chunks if export_format == 'csv' else ndjson_chunks
+    response = Response(
+        stream_with_context(write_chunks(stream_rows(statement), columns)),
+        mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename=bikes.{export_format}'
+    return response
+
+
+@api_bp.route('/bikes/compare', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
+def compare_bikes_get():
+    """Compare multiple bikes given as ?ids=1,2,3 (cacheable)"""
+    raw_ids = request.args.get('ids', '')
+    return _compare_response([value for value in raw_ids.split(',') if value.strip()])
+
+
 @api_bp.route('/bikes/compare', methods=['POST'])
+@query_budget(1)
 def compare_bikes():
     """Compare multiple bikes"""
+    data = request.get_json(silent=True) or {}
+    return _compare_response(data.get('bike_ids', []))
+
+
+def _compare_response(bike_ids):
+    """Build the comparison payload for bike_ids"""
+    try:
+        bike_ids = [int(bike_id) for bike_id in bike_ids]
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'Invalid bike IDs provided'
+        }), 400
+    
     try:
-        data = request.get_json()
-        bike_ids = data.get('bike_ids', [])
-        
         if len(bike_ids) < 2:
             return jsonify({
                 'success': False,
                 'error': 'At least 2 bike IDs required for comparison'
             }), 400
         
-        bikes = Bike.query.filter(Bike.id.in_(bike_ids)).all()
+        snapshot = catalog_repository.snapshot()
+        bikes = []
+        for bike_id in dict.fromkeys(bike_ids):
+            bike = snapshot.get(bike_id, include_inactive=True)
+            if bike is not None:
+                bikes.append(bike)
         
         if len(bikes) < 2:
             return jsonify({
@@ -217,35 +575,191 @@ def compare_bikes():
                 'error': 'Invalid bike IDs provided'
             }), 400
         
-        comparison_data = []
+        cached = comparison_cache.get_or_build(
+            'api', [bike.id for bike in bikes], lambda: _build_comparison(bikes)
+        )
+        comparison_data = [cached['rows'][bike.id] for bike in bikes]
         
-        for bike in bikes:
-            bike_comparison = {
-                'id': bike.id,
-                'name': f"{bike.brand} {bike.model}",
-                'price': bike.price,
-                'specifications': {}
+        return jsonify({
+            'success': True,
+            'data': comparison_data,
+            'recommendations': cached['recommendations']
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _build_comparison(bikes):
+    """Engine results and serialized rows for a set of bikes"""
+    comparison = comparison_engine.compare_bikes(bikes)
+    scores = {row['bike'].id: row['score'] for row in comparison['performance']}
+    
+    rows = {}
+    for bike in bikes:
+        bike_comparison = {
+            'id': bike.id,
+            'name': f"{bike.brand} {bike.model}",
+            'price': bike.price,
+            'performance_score': scores.get(bike.id),
+            'specifications': {}
+        }
+        
+        if bike.specs:
+            bike_comparison['specifications'] = {
+                'engine_cc': bike.specs.engine_cc,
+                'max_power': bike.specs.max_power,
+                'max_torque': bike.specs.max_torque,
+                'top_speed': bike.specs.top_speed,
+                'acceleration_0_100': bike.specs.acceleration_0_100,
+                'mileage_avg': bike.specs.mileage_avg,
+                'kerb_weight': bike.specs.kerb_weight,
+                'fuel_capacity': bike.specs.fuel_capacity
             }
-            
-            if bike.specs:
-                bike_comparison['specifications'] = {
-                    'engine_cc': bike.specs.engine_cc,
-                    'max_power': bike.specs.max_power,
-                    'max_torque': bike.specs.max_torque,
-                    'top_speed': bike.specs.top_speed,
-                    'acceleration_0_100': bike.specs.acceleration_0_100,
-                    'mileage_avg': (bike.specs.mileage_city + bike.specs.mileage_highway) / 2,
-                    'kerb_weight': bike.specs.kerb_weight,
-                    'fuel_capacity': bike.specs.fuel_capacity
-                }
-            
-            comparison_data.append(bike_comparison)
+        
+        rows[bike.id] = bike_comparison
+    
+    return {
+        'comparison': comparison,
+        'rows': rows,
+        'recommendations': _recommendation_ids(comparison['recommendations'])
+    }
+
+
+def _recommendation_ids(recommendations):
+    """Map each recommendation to the id of the bike it picks"""
+    return {name: bike.id for name, bike in recommendations.items()}
+
+
+@api_bp.route('/bikes/compare/catalog', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
+def compare_catalog():
+    """Rank every active bike by performance score and fuel economy
+    
+    Optional ?limit= (default 20, max 100), ?category= and ?brand=.
+    """
+    try:
+        limit = min(max(request.args.get('limit', 20, type=int), 1), MAX_BATCH_SIZE)
+        comparison = comparison_engine.rank_catalog(
+            limit=limit,
+            category=request.args.get('category'),
+            brand=request.args.get('brand')
+        )
+        
+        performance = []
+        for row in comparison['performance']:
+            bike_dict = _bike_summary(row['bike'])
+            bike_dict['performance_score'] = row['score']
+            performance.append(bike_dict)
+        
+        economy = []
+        for row in comparison['economy']:
+            bike_dict = _bike_summary(row['bike'])
+            bike_dict['avg_mileage'] = row['avg_mileage']
+            economy.append(bike_dict)
+        
+        return jsonify({
+            'success': True,
+            'performance': performance,
+            'economy': economy,
+            'recommendations': _recommendation_ids(comparison['recommendations'])
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/bikes/rank', methods=['GET'])
+@query_budget(2)
+def rank_bikes():
+    """Get the top k bikes for the user's priorities
+    
+    Weights for performance, economy, comfort, price and rating are
+    given as query parameters (default 1 each, 0 to ignore), e.g.
+    ?performance=3&price=1&comfort=0&k=5. Optional brand, category and
+    min_<attr>/max_<attr> filters narrow the candidates.
+    """
+    try:
+        k = min(max(request.args.get('k', 10, type=int), 1), MAX_BATCH_SIZE)
+        weights = {name: request.args[name] for name in RANKING_COMPONENTS if name in request.args}
+        
+        features = get_ranking_features()
+        mask = features.matrix.mask(
+            _range_filters(),
+            brand=request.args.get('brand'),
+            category=request.args.get('category')
+        )
+        ranked = features.rank(weights, k=k, mask=mask)
+        
+        bikes_data = []
+        for bike, score, components in ranked:
+            bike_dict = _bike_summary(bike)
+            bike_dict['score'] = round(score, 4)
+            bike_dict['components'] = components
+            bikes_data.append(bike_dict)
         
         return jsonify({
             'success': True,
-            'data': comparison_data
+            'weights': resolve_weights(weights),
+            'count': len(bikes_data),
+            'data': bikes_data
         }), 200
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/bikes/skyline', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
+def get_bike_skyline():
+    """Get the Pareto frontier of bikes over the chosen axes
+    
+    ?axes=price:min,power:max,weight:min (the default) takes 2-5 numeric
+    attributes, each minimized or maximized. A bike is on the frontier
+    when no other bike is at least as good on every axis and better on
+    one. Bikes missing a value on any axis are left out.
+    """
+    try:
+        axes = parse_axes(request.args.get('axes'))
+        skyline = get_skyline(axes)
+        
+        frontier = []
+        for bike, values in zip(skyline.records, skyline.values):
+            bike_dict = _bike_summary(bike)
+            bike_dict['axes'] = values
+            frontier.append(bike_dict)
+        
+        return jsonify({
+            'success': True,
+            'axes': [{'attribute': column, 'goal': direction} for column, direction in axes],
+            'candidates': skyline.candidates,
+            'count': len(frontier),
+            'data': frontier
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+        
     except Exception as e:
         return jsonify({
             'success': False,
@@ -254,11 +768,12 @@ def compare_bikes():
 
 
 @api_bp.route('/bikes/search', methods=['GET'])
+@query_budget(1)
 def search_bikes():
     """Search bikes by keyword"""
     try:
         query = request.args.get('q', '')
-        limit = request.args.get('limit', 20, type=int)
+        limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
         
         if not query:
             return jsonify({
@@ -266,23 +781,19 @@ def search_bikes():
                 'error': 'Search query required'
             }), 400
         
-        bikes = Bike.query.filter(
-            db.or_(
-                Bike.brand.ilike(f'%{query}%'),
-                Bike.model.ilike(f'%{query}%'),
-                Bike.category.ilike(f'%{query}%')
-            )
-        ).filter_by(is_active=True).limit(limit).all()
+        # Ranked lookup against the in-memory index, no table scan
+        matches = search_engine.search(catalog_repository.snapshot(), query, limit)
         
         results = []
-        for bike in bikes:
+        for bike, score in matches:
             results.append({
                 'id': bike.id,
                 'brand': bike.brand,
                 'model': bike.model,
                 'year': bike.year,
                 'price': bike.price,
-                'category': bike.category
+                'category': bike.category,
+                'score': score
             })
         
         return jsonify({
@@ -299,14 +810,100 @@ def search_bikes():
         }), 500
 
 
+@api_bp.route('/bikes/suggest', methods=['GET'])
+@query_budget(2)
+def suggest_bikes():
+    """Autocomplete bike names for selector inputs"""
+    try:
+        prefix = request.args.get('prefix', '')
+        limit = min(max(request.args.get('limit', 8, type=int), 1), 100)
+        
+        if not prefix.strip():
+            return jsonify({
+                'success': False,
+                'error': 'Prefix required'
+            }), 400
+        
+        suggestions = bike_autocomplete.suggest(
+            catalog_repository.snapshot(), prefix, limit
+        )
+        
+        results = []
+        for bike, owners in suggestions:
+            results.append({
+                'id': bike.id,
+                'label': f"{bike.brand} {bike.model} ({bike.year})",
+                'brand': bike.brand,
+                'model': bike.model,
+                'year': bike.year,
+                'owners': owners
+            })
+        
+        return jsonify({
+            'success': True,
+            'prefix': prefix,
+            'count': len(results),
+            'data': results
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@api_bp.route('/bikes/facets', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
+def get_bike_facets():
+    """Filter bikes by facet and return counts for every facet value
+    
+    Facets: brand, category, cc, price, layout, features. Repeat a
+    parameter to select several values of one facet. min_<attr>/max_<attr>
+    range filters apply as well.
+    """
+    try:
+        limit = min(max(request.args.get('limit', 50, type=int), 1), 100)
+        selections = {facet: request.args.getlist(facet) for facet in FACETS}
+        
+        index = get_facet_index()
+        base = None
+        ranges = _range_filters()
+        if ranges:
+            base = mask_to_bits(get_spec_matrix().mask(ranges))
+        
+        result_bits, counts = index.search(selections, base=base)
+        positions = index.positions(result_bits)
+        
+        return jsonify({
+            'success': True,
+            'total_count': len(positions),
+            'returned_count': min(len(positions), limit),
+            'data': [_bike_summary(index.records[position]) for position in positions[:limit]],
+            'facets': counts
+        }), 200
+        
+    except UnknownColumn as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @api_bp.route('/bikes/categories', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
 def get_categories():
     """Get all bike categories"""
     try:
-        categories = db.session.query(
-            Bike.category, 
-            func.count(Bike.id).label('count')
-        ).filter_by(is_active=True).group_by(Bike.category).all()
+        categories = get_facet_index().value_counts('category')
         
         categories_data = [
             {'category': cat, 'count': count} 
@@ -326,13 +923,12 @@ def get_categories():
 
 
 @api_bp.route('/bikes/brands', methods=['GET'])
+@catalog_etag()
+@query_budget(1)
 def get_brands():
     """Get all bike brands"""
     try:
-        brands = db.session.query(
-            Bike.brand, 
-            func.count(Bike.id).label('count')
-        ).filter_by(is_active=True).group_by(Bike.brand).all()
+        brands = get_facet_index().value_counts('brand')
         
         brands_data = [
             {'brand': brand, 'count': count} 
@@ -6,8 +6,15 @@ from app.models.user_bikes import UserBike
 from app.models.ride_logs import RideLog
 from app.models.maintenance_records import MaintenanceRecord
 from app.models.reviews import Review
+from app.models.loading_profiles import load_profile
+from app.utils.pagination import page_args, paginate_keyset, count_cache, InvalidCursor
+from app.utils.query_budget import query_budget
 from app import db
 from functools import wraps
+from datetime import datetime
+
+# Sort key for rides logged without a date, which list last
+UNDATED_RIDE = datetime(1970, 1, 1)
 
 def token_required(f):
     """Decorator for API token authentication"""
@@ -31,6 +38,7 @@ def token_required(f):
 
 @api_bp.route('/user/profile', methods=['GET'])
 @login_required
+@query_budget(1)
 def get_user_profile():
     """Get current user profile"""
     try:
@@ -61,10 +69,11 @@ def get_user_profile():
 
 @api_bp.route('/user/bikes', methods=['GET'])
 @login_required
+@query_budget(2)
 def get_user_bikes():
     """Get all bikes owned by current user"""
     try:
-        user_bikes = UserBike.query.filter_by(
+        user_bikes = UserBike.query.options(*load_profile('user_bike_list')).filter_by(
             user_id=current_user.id, 
             is_active=True
         ).all()
@@ -102,10 +111,11 @@ def get_user_bikes():
 
 @api_bp.route('/user/bikes/<int:user_bike_id>', methods=['GET'])
 @login_required
+@query_budget(5)
 def get_user_bike_details(user_bike_id):
     """Get detailed information about user's bike"""
     try:
-        user_bike = UserBike.query.filter_by(
+        user_bike = UserBike.query.options(*load_profile('user_bike_list')).filter_by(
             id=user_bike_id, 
             user_id=current_user.id
         ).first_or_404()
@@ -157,23 +167,24 @@ def get_user_bike_details(user_bike_id):
 
 @api_bp.route('/user/rides', methods=['GET'])
 @login_required
+@query_budget(3)
 def get_user_rides():
     """Get ride logs for user's bikes"""
     try:
-        limit = request.args.get('limit', 50, type=int)
-        offset = request.args.get('offset', 0, type=int)
+        limit, cursor, include_total = page_args()
         bike_id = request.args.get('bike_id', type=int)
         
         # Build query
-        query = RideLog.query.join(UserBike).filter(
+        query = RideLog.query.options(*load_profile('ride_list')).join(UserBike).filter(
             UserBike.user_id == current_user.id
         )
         
         if bike_id:
             query = query.filter(RideLog.user_bike_id == bike_id)
         
-        total_count = query.count()
-        rides = query.order_by(RideLog.ride_date.desc()).limit(limit).offset(offset).all()
+        rides, next_cursor = paginate_keyset(
+            query, RideLog.ride_date, RideLog.id, cursor=cursor, limit=limit, null_key=UNDATED_RIDE
+        )
         
         rides_data = []
         for ride in rides:
@@ -183,7 +194,7 @@ def get_user_rides():
                     'brand': ride.user_bike.bike.brand,
                     'model': ride.user_bike.bike.model
                 },
-                'ride_date': ride.ride_date.strftime('%Y-%m-%d %H:%M'),
+                'ride_date': ride.ride_date.strftime('%Y-%m-%d %H:%M') if ride.ride_date else None,
                 'distance': ride.distance,
                 'duration': ride.duration,
                 'avg_speed': ride.avg_speed,
@@ -196,12 +207,26 @@ def get_user_rides():
                 'end_location': ride.end_location
             })
         
-        return jsonify({
+        response = {
             'success': True,
-            'total_count': total_count,
             'returned_count': len(rides_data),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
             'data': rides_data
-        }), 200
+        }
+        
+        if include_total:
+            count_key = ('rides', current_user.id, bike_id)
+            response['total_count'] = count_cache.count(count_key, query)
+        
+        return jsonify(response), 200
+        
+    except InvalidCursor as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
         
     except Exception as e:
         return jsonify({
@@ -212,22 +237,24 @@ def get_user_rides():
 
 @api_bp.route('/user/maintenance', methods=['GET'])
 @login_required
+@query_budget(3)
 def get_user_maintenance():
     """Get maintenance records for user's bikes"""
     try:
-        limit = request.args.get('limit', 50, type=int)
+        limit, cursor, include_total = page_args()
         bike_id = request.args.get('bike_id', type=int)
         
-        query = MaintenanceRecord.query.join(UserBike).filter(
+        query = MaintenanceRecord.query.options(*load_profile('maintenance_list')).join(UserBike).filter(
             UserBike.user_id == current_user.id
         )
         
         if bike_id:
             query = query.filter(MaintenanceRecord.user_bike_id == bike_id)
         
-        records = query.order_by(
-            MaintenanceRecord.service_date.desc()
-        ).limit(limit).all()
+        records, next_cursor = paginate_keyset(
+            query, MaintenanceRecord.service_date, MaintenanceRecord.id,
+            cursor=cursor, limit=limit
+        )
         
         records_data = []
         for record in records:
@@ -246,11 +273,26 @@ def get_user_maintenance():
                 'service_center': record.service_center
             })
         
-        return jsonify({
+        response = {
             'success': True,
             'count': len(records_data),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
             'data': records_data
-        }), 200
+        }
+        
+        if include_total:
+            count_key = ('maintenance', current_user.id, bike_id)
+            response['total_count'] = count_cache.count(count_key, query)
+        
+        return jsonify(response), 200
+        
+    except InvalidCursor as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
         
     except Exception as e:
         return jsonify({
@@ -261,12 +303,16 @@ def get_user_maintenance():
 
 @api_bp.route('/user/reviews', methods=['GET'])
 @login_required
+@query_budget(3)
 def get_user_reviews():
     """Get reviews written by current user"""
     try:
-        reviews = Review.query.filter_by(
-            user_id=current_user.id
-        ).order_by(Review.created_at.desc()).all()
+        limit, cursor, include_total = page_args()
+        
+        query = Review.query.options(*load_profile('review_list')).filter_by(user_id=current_user.id)
+        reviews, next_cursor = paginate_keyset(
+            query, Review.created_at, Review.id, cursor=cursor, limit=limit
+        )
         
         reviews_data = []
         for review in reviews:
@@ -293,11 +339,26 @@ def get_user_reviews():
                 'created_at': review.created_at.strftime('%Y-%m-%d')
             })
         
-        return jsonify({
+        response = {
             'success': True,
             'count': len(reviews_data),
+            'limit': limit,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None,
             'data': reviews_data
-        }), 200
+        }
+        
+        if include_total:
+            count_key = ('reviews', current_user.id)
+            response['total_count'] = count_cache.count(count_key, query)
+        
+        return jsonify(response), 200
+        
+    except InvalidCursor as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
         
     except Exception as e:
         return jsonify({
@@ -308,6 +369,7 @@ def get_user_reviews():
 
 @api_bp.route('/user/stats', methods=['GET'])
 @login_required
+@query_budget(6)
 def get_user_stats():
     """Get user statistics"""
     try:
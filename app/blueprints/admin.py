@@ -1,4 +1,4 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
 from flask_login import login_required, current_user
 from app import db
 from app.models.user import User
@@ -9,6 +9,13 @@ from app.models.admin_logs import AdminLog
 from app.models.accident_reports import AccidentReport
 from app.models.user_bikes import UserBike
 from app.models.ride_logs import RideLog
+from app.models.loading_profiles import load_profile
+from app.services.catalog_repository import catalog_repository
+from app.services.comparison_catalog import bike_slug
+from app.services.comparison_cache import comparison_cache
+from app.services.derived_metrics import derived_metrics_service
+from app.services.rating_summary import rating_summary_service
+from app.utils.query_budget import query_budget
 from functools import wraps
 from datetime import datetime, timedelta
 from sqlalchemy import func
@@ -27,21 +34,30 @@ def admin_required(f):
 @admin_bp.route('/')
 @login_required
 @admin_required
+@query_budget(6)
 def index():
     total_users = User.query.count()
     total_bikes = Bike.query.count()
     pending_reviews = Review.query.filter_by(is_verified=False).count()
     
+    recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
+    pending_reviews_list = Review.query.options(*load_profile('review_list')).filter_by(
+        is_verified=False
+    ).order_by(Review.created_at.desc()).limit(5).all()
+    
     return render_template('admin/dashboard.html',
                          total_users=total_users,
                          total_bikes=total_bikes,
-                         pending_reviews=pending_reviews)
+                         pending_reviews=pending_reviews,
+                         recent_users=recent_users,
+                         pending_reviews_list=pending_reviews_list)
 
 @admin_bp.route('/manage-bikes')
 @login_required
 @admin_required
+@query_budget(2)
 def manage_bikes():
-    bikes = Bike.query.all()
+    bikes = Bike.query.options(*load_profile('bike_with_specs')).all()
     return render_template('admin/manage_bikes.html', bikes=bikes)
 
 @admin_bp.route('/manage-users')
@@ -119,6 +135,39 @@ def analytics():
                          total_reviews=total_reviews,
                          pending_reviews=pending_reviews)
 
+# (form field, BikeSpec column, type) for the add/edit bike forms
+SPEC_FORM_FIELDS = (
+    ('engine_cc', 'engine_cc', int),
+    ('engine_type', 'engine_type', str),
+    ('max_power', 'max_power', float),
+    ('max_torque', 'max_torque', float),
+    ('top_speed', 'top_speed', float),
+    ('mileage_city', 'mileage_city', float),
+    ('mileage_highway', 'mileage_highway', float),
+    ('fuel_capacity', 'fuel_capacity', float),
+    ('weight', 'kerb_weight', float),
+    ('seat_height', 'seat_height', float)
+)
+
+def _spec_form_values(clear_blank=False):
+    """BikeSpec fields from the add/edit bike form
+
+    Blank inputs are left out, or set to None with clear_blank so an edit
+    can clear a field.
+    """
+    values = {}
+    for field, column, value_type in SPEC_FORM_FIELDS:
+        if field not in request.form:
+            continue
+        if not request.form[field].strip():
+            if clear_blank:
+                values[column] = None
+            continue
+        value = request.form.get(field, type=value_type)
+        if value is not None:
+            values[column] = value
+    return values
+
 @admin_bp.route('/add-bike', methods=['GET', 'POST'])
 @login_required
 @admin_required
@@ -134,27 +183,19 @@ def add_bike():
                 image_url=request.form.get('image_url'),
                 is_active=True
             )
+            bike.slug = bike_slug(bike.brand, bike.model, bike.year)
             
             db.session.add(bike)
             db.session.flush()  # Get the bike ID
             
             # Add specifications if provided
             if request.form.get('engine_cc'):
-                specs = BikeSpec(
-                    bike_id=bike.id,
-                    engine_cc=request.form.get('engine_cc', type=int),
-                    engine_type=request.form.get('engine_type'),
-                    max_power=request.form.get('max_power', type=float),
-                    max_torque=request.form.get('max_torque', type=float),
-                    top_speed=request.form.get('top_speed', type=int),
-                    mileage=request.form.get('mileage', type=int),
-                    fuel_capacity=request.form.get('fuel_capacity', type=float),
-                    weight=request.form.get('weight', type=int),
-                    seat_height=request.form.get('seat_height', type=int)
-                )
+                specs = BikeSpec(bike_id=bike.id, **_spec_form_values())
+                derived_metrics_service.refresh(specs, bike.price)
                 db.session.add(specs)
             
             db.session.commit()
+            catalog_repository.bump_version()
             
             # Log action
             log = AdminLog(
@@ -188,34 +229,21 @@ def edit_bike(bike_id):
             bike.price = request.form.get('price', type=float)
             bike.image_url = request.form.get('image_url')
             bike.is_active = request.form.get('is_active') == 'on'
+            if not bike.slug:
+                bike.slug = bike_slug(bike.brand, bike.model, bike.year, bike.id)
             
-            # Update specifications
+            # Update specifications, clearing the fields left blank
             if bike.specs:
-                bike.specs.engine_cc = request.form.get('engine_cc', type=int)
-                bike.specs.engine_type = request.form.get('engine_type')
-                bike.specs.max_power = request.form.get('max_power', type=float)
-                bike.specs.max_torque = request.form.get('max_torque', type=float)
-                bike.specs.top_speed = request.form.get('top_speed', type=int)
-                bike.specs.mileage = request.form.get('mileage', type=int)
-                bike.specs.fuel_capacity = request.form.get('fuel_capacity', type=float)
-                bike.specs.weight = request.form.get('weight', type=int)
-                bike.specs.seat_height = request.form.get('seat_height', type=int)
+                for field, value in _spec_form_values(clear_blank=True).items():
+                    setattr(bike.specs, field, value)
+                derived_metrics_service.refresh(bike.specs, bike.price)
             elif request.form.get('engine_cc'):
-                specs = BikeSpec(
-                    bike_id=bike.id,
-                    engine_cc=request.form.get('engine_cc', type=int),
-                    engine_type=request.form.get('engine_type'),
-                    max_power=request.form.get('max_power', type=float),
-                    max_torque=request.form.get('max_torque', type=float),
-                    top_speed=request.form.get('top_speed', type=int),
-                    mileage=request.form.get('mileage', type=int),
-                    fuel_capacity=request.form.get('fuel_capacity', type=float),
-                    weight=request.form.get('weight', type=int),
-                    seat_height=request.form.get('seat_height', type=int)
-                )
+                specs = BikeSpec(bike_id=bike.id, **_spec_form_values())
+                derived_metrics_service.refresh(specs, bike.price)
                 db.session.add(specs)
             
             db.session.commit()
+            catalog_repository.bump_version()
             
             # Log action
             log = AdminLog(
@@ -244,6 +272,7 @@ def delete_bike(bike_id):
         # Soft delete - just mark as inactive
         bike.is_active = False
         db.session.commit()
+        catalog_repository.bump_version()
         
         # Log action
         log = AdminLog(
@@ -293,6 +322,74 @@ def toggle_user(user_id):
     
     return redirect(url_for('admin.manage_users'))
 
+@admin_bp.route('/reviews/<int:review_id>/approve', methods=['POST'])
+@login_required
+@admin_required
+def approve_review(review_id):
+    review = Review.query.get_or_404(review_id)
+    
+    try:
+        if not review.is_verified:
+            review.is_verified = True
+            rating_summary_service.record_review(review)
+        
+        log = AdminLog(
+            admin_id=current_user.id,
+            action='approve_review',
+            entity_type='review',
+            entity_id=review.id,
+            description=f'Approved review: {review.title}'
+        )
+        db.session.add(log)
+        db.session.commit()
+        
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@admin_bp.route('/reviews/<int:review_id>/reject', methods=['POST'])
+@login_required
+@admin_required
+def reject_review(review_id):
+    review = Review.query.get_or_404(review_id)
+    
+    try:
+        if review.is_verified:
+            rating_summary_service.retract_review(review)
+        
+        log = AdminLog(
+            admin_id=current_user.id,
+            action='reject_review',
+            entity_type='review',
+            entity_id=review.id,
+            description=f'Rejected review: {review.title}'
+        )
+        db.session.add(log)
+        db.session.delete(review)
+        db.session.commit()
+        
+        return jsonify({'success': True})
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@admin_bp.route('/cache-stats')
+@login_required
+@admin_required
+def cache_stats():
+    """Hit and miss counters for the comparison and compressed response caches"""
+    stats = {'comparison': comparison_cache.stats()}
+    compressed = current_app.extensions.get('compressed_cache')
+    if compressed is not None:
+        stats['compressed'] = {
+            'bytes': compressed.size,
+            'max_bytes': compressed.max_bytes,
+            'hits': compressed.hits,
+            'misses': compressed.misses
+        }
+    return jsonify({'success': True, 'data': stats})
+
 @admin_bp.route('/view-accidents')
 @login_required
 @admin_required
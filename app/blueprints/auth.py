@@ -2,11 +2,13 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required, current_user
 from app import db
 from app.models.user import User
+from app.utils.decorators import public_page
 from werkzeug.security import generate_password_hash
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
+@public_page
 def register():
     if current_user.is_authenticated:
         return redirect(url_for('dashboard.index'))
@@ -51,6 +53,7 @@ def register():
     return render_template('auth/register.html')
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@public_page
 def login():
     if current_user.is_authenticated:
         return redirect(url_for('dashboard.index'))
@@ -1,12 +1,14 @@
 from flask import Blueprint, render_template, request, jsonify
 from app.models.bike import Bike
 from app.services.cost_calculator import CostCalculator
+from app.services.catalog_repository import catalog_repository
+from app.utils.helpers import owned_user_bike_id
 
 calculator_bp = Blueprint('calculator', __name__)
 
 @calculator_bp.route('/')
 def index():
-    bikes = Bike.query.filter_by(is_active=True).all()
+    bikes = catalog_repository.snapshot().bikes
     return render_template('calculator/ownership_cost.html', bikes=bikes)
 
 @calculator_bp.route('/calculate', methods=['POST'])
@@ -23,7 +25,8 @@ def calculate():
         bike=bike,
         yearly_km=yearly_km,
         fuel_price=fuel_price,
-        insurance_type=insurance_type
+        insurance_type=insurance_type,
+        user_bike_id=owned_user_bike_id(bike.id, request.form.get('user_bike_id', type=int))
     )
     
     return jsonify(results)
@@ -2,14 +2,18 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from app import db
 from app.models.reviews import Review
-from app.models.bike import Bike
 from app.models.user_bikes import UserBike
+from app.models.loading_profiles import load_profile
+from app.services.catalog_repository import catalog_repository
+from app.services.rating_summary import rating_summary_service
+from app.utils.query_budget import query_budget
 
 community_bp = Blueprint('community', __name__)
 
 @community_bp.route('/')
+@query_budget(2)
 def index():
-    reviews = Review.query.order_by(
+    reviews = Review.query.options(*load_profile('review_list')).order_by(
         Review.created_at.desc()
     ).limit(20).all()
     return render_template('community/reviews.html', reviews=reviews)
@@ -61,6 +65,8 @@ def post_review():
             )
             
             db.session.add(review)
+            if review.is_verified:
+                rating_summary_service.record_review(review)
             db.session.commit()
             
             flash('Review posted successfully! 🎉', 'success')
@@ -73,12 +79,13 @@ def post_review():
             return redirect(url_for('community.post_review'))
     
     # GET request - show form
-    user_bikes = UserBike.query.filter_by(user_id=current_user.id).all() if current_user.is_authenticated else []
-    all_bikes = Bike.query.filter_by(is_active=True).order_by(Bike.brand, Bike.model).all()
+    user_bikes = UserBike.query.options(*load_profile('user_bike_list')).filter_by(user_id=current_user.id).all() if current_user.is_authenticated else []
+    all_bikes = catalog_repository.snapshot().bikes
     
     return render_template('community/post_review.html', user_bikes=user_bikes, all_bikes=all_bikes)
 
 @community_bp.route('/review/<int:review_id>')
+@query_budget(2)
 def single_review(review_id):
-    review = Review.query.get_or_404(review_id)
+    review = Review.query.options(*load_profile('review_list')).filter_by(id=review_id).first_or_404()
     return render_template('community/single_review.html', review=review)
@@ -4,6 +4,9 @@ from app.models.user_bikes import UserBike
 from app.models.ride_logs import RideLog
 from app.models.maintenance_records import MaintenanceRecord
 from app.models.bike import Bike
+from app.models.loading_profiles import load_profile
+from app.services.catalog_repository import catalog_repository
+from app.utils.query_budget import query_budget
 from app import db
 from datetime import datetime
 from werkzeug.utils import secure_filename
@@ -19,9 +22,10 @@ def allowed_file(filename):
 
 @dashboard_bp.route('/')
 @login_required
+@query_budget(5)
 def index():
     # Get user's bikes
-    user_bikes = UserBike.query.filter_by(user_id=current_user.id, is_active=True).all()
+    user_bikes = UserBike.query.options(*load_profile('user_bike_list')).filter_by(user_id=current_user.id, is_active=True).all()
     
     # Get total stats
     total_bikes = len(user_bikes)
@@ -42,9 +46,10 @@ def index():
 
 @dashboard_bp.route('/my-bikes')
 @login_required
+@query_budget(3)
 def my_bikes():
-    user_bikes = UserBike.query.filter_by(user_id=current_user.id, is_active=True).all()
-    all_bikes = Bike.query.filter_by(is_active=True).order_by(Bike.brand, Bike.model).all()
+    user_bikes = UserBike.query.options(*load_profile('user_bike_list')).filter_by(user_id=current_user.id, is_active=True).all()
+    all_bikes = catalog_repository.snapshot().bikes
     return render_template('dashboard/my_bikes.html', user_bikes=user_bikes, all_bikes=all_bikes)
 
 @dashboard_bp.route('/add-bike', methods=['POST'])
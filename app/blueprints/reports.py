@@ -2,7 +2,7 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
 from app import db
 from app.models.accident_reports import AccidentReport
-from app.models.bike import Bike
+from app.services.catalog_repository import catalog_repository
 from datetime import datetime
 
 reports_bp = Blueprint('reports', __name__)
@@ -39,7 +39,7 @@ def submit():
         flash('Report submitted successfully!', 'success')
         return redirect(url_for('reports.index'))
     
-    bikes = Bike.query.filter_by(is_active=True).all()
+    bikes = catalog_repository.snapshot().bikes
     return render_template('reports/submit_report.html', bikes=bikes)
 
 @reports_bp.route('/public')
@@ -69,7 +69,7 @@ def public_reports():
     ).paginate(page=page, per_page=per_page, error_out=False)
     
     # Get all bikes for filter dropdown
-    bikes = Bike.query.filter_by(is_active=True).order_by(Bike.brand, Bike.model).all()
+    bikes = catalog_repository.snapshot().bikes
     
     # Get statistics for info cards
     from sqlalchemy import func
@@ -3,15 +3,19 @@ from flask_login import current_user
 from app.models.bike import Bike
 from app.models.user_bikes import UserBike
 from app.services.resale_predictor import ResalePredictor
+from app.models.loading_profiles import load_profile
+from app.services.catalog_repository import catalog_repository
+from app.utils.query_budget import query_budget
 
 resale_bp = Blueprint('resale', __name__)
 
 @resale_bp.route('/')
+@query_budget(3)
 def index():
-    all_bikes = Bike.query.filter_by(is_active=True).all()
+    all_bikes = catalog_repository.snapshot().bikes
     user_bikes = None
     if current_user.is_authenticated:
-        user_bikes = UserBike.query.filter_by(user_id=current_user.id).all()
+        user_bikes = UserBike.query.options(*load_profile('user_bike_list')).filter_by(user_id=current_user.id).all()
     return render_template('resale/prediction.html', all_bikes=all_bikes, user_bikes=user_bikes)
 
 @resale_bp.route('/predict', methods=['POST'])
@@ -1,21 +1,38 @@
-from flask import Blueprint, render_template, request, jsonify
+import math
+import secrets
+
+from flask import Blueprint, render_template, request, jsonify, current_app, url_for
+from flask_login import login_required, current_user
+from app import db
 from app.models.bike import Bike
 from app.services.performance_simulator import PerformanceSimulator
+from app.models.simulation_jobs import SimulationJob, ACTIVE_STATUSES
+from app.services.simulation_jobs import simulation_jobs, parse_job_params, JobLimitExceeded
+from app.models.loading_profiles import load_profile
+from app.services.catalog_repository import catalog_repository
+from app.utils.query_budget import query_budget
+from app.utils.helpers import owned_user_bike_id
 
 simulator_bp = Blueprint('simulator', __name__)
 
+MAX_GRID_ROWS = 10000
+MAX_SYNC_SAMPLES = 100000  # larger Monte Carlo runs go through /simulator/jobs
+RECENT_JOBS = 20
+JOB_POLL_INTERVAL = 1  # seconds clients are asked to wait between status polls
+
 @simulator_bp.route('/')
+@query_budget(3)
 def index():
     from flask_login import current_user
     from app.models.user_bikes import UserBike
     
     # Get all active bikes
-    all_bikes = Bike.query.filter_by(is_active=True).order_by(Bike.brand, Bike.model).all()
+    all_bikes = catalog_repository.snapshot().bikes
     
     # Get user's bikes if logged in
     user_bikes = []
     if current_user.is_authenticated:
-        user_bikes = UserBike.query.filter_by(user_id=current_user.id).all()
+        user_bikes = UserBike.query.options(*load_profile('user_bike_with_specs')).filter_by(user_id=current_user.id).all()
     
     return render_template('simulator/input_form.html', all_bikes=all_bikes, user_bikes=user_bikes)
 
@@ -35,7 +52,273 @@ def simulate():
         rider_weight=rider_weight,
         road_type=road_type,
         weather=weather,
-        riding_style=riding_style
+        riding_style=riding_style,
+        user_bike_id=owned_user_bike_id(bike.id, request.form.get('user_bike_id', type=int))
     )
     
     return render_template('simulator/results.html', bike=bike, results=results)
+
+
+@simulator_bp.route('/simulate/batch', methods=['POST'])
+@login_required
+@query_budget(3)  # login, catalog snapshot and fuel calibration reloads
+def simulate_batch():
+    """Simulate every combination of the given bikes and conditions
+    
+    JSON body: bike_ids plus lists of rider_weights, road_types, weathers
+    and riding_styles (each defaults to the single-simulation default).
+    Returns a table of columns and rows, one row per combination.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        bike_ids = [int(bike_id) for bike_id in data.get('bike_ids', [])]
+        rider_weights = [float(weight) for weight in data.get('rider_weights', [70])]
+        road_types = [str(value) for value in data.get('road_types', ['city'])]
+        weathers = [str(value) for value in data.get('weathers', ['sunny'])]
+        riding_styles = [str(value) for value in data.get('riding_styles', ['moderate'])]
+    except (TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'bike_ids and rider_weights must be lists of numbers; other dimensions lists of strings'
+        }), 400
+    
+    dimensions = (bike_ids, rider_weights, road_types, weathers, riding_styles)
+    if not all(dimensions):
+        return jsonify({
+            'success': False,
+            'error': 'bike_ids and every condition list must be non-empty'
+        }), 400
+    if math.prod(len(values) for values in dimensions) > MAX_GRID_ROWS:
+        return jsonify({
+            'success': False,
+            'error': f'Grid too large; at most {MAX_GRID_ROWS} combinations per request'
+        }), 400
+    
+    try:
+        snapshot = catalog_repository.snapshot()
+        bikes = []
+        errors = {}
+        for bike_id in dict.fromkeys(bike_ids):
+            bike = snapshot.get(bike_id)
+            if bike is None:
+                errors[str(bike_id)] = 'Bike not found'
+            elif not bike.specs:
+                errors[str(bike_id)] = 'Bike specifications not available'
+            else:
+                bikes.append(bike)
+        
+        table = {'columns': [], 'rows': []}
+        if bikes:
+            table = PerformanceSimulator().simulate_grid(bikes, rider_weights, road_types, weathers, riding_styles)
+        
+        return jsonify({
+            'success': True,
+            'count': len(table['rows']),
+            'columns': table['columns'],
+            'rows': table['rows'],
+            'errors': errors
+        }), 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@simulator_bp.route('/simulate/monte-carlo', methods=['POST'])
+@login_required
+@query_budget(3)  # login, catalog snapshot and fuel calibration reloads
+def simulate_monte_carlo():
+    """Percentile performance for one bike over randomly varied conditions
+    
+    JSON body: bike_id, rider_weight, road_type, weather, riding_style,
+    samples (default 10000, at most MAX_SYNC_SAMPLES here; submit a
+    monte_carlo job for more) and seed. Without a seed a random one is
+    chosen and returned so the run can be repeated.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        bike_id = int(data['bike_id'])
+        rider_weight = float(data.get('rider_weight', 70))
+        samples = int(data.get('samples', 10000))
+        seed = int(data['seed']) if data.get('seed') is not None else secrets.randbits(32)
+    except (KeyError, TypeError, ValueError):
+        return jsonify({
+            'success': False,
+            'error': 'bike_id is required; bike_id, rider_weight, samples and seed must be numbers'
+        }), 400
+    if seed < 0:
+        return jsonify({'success': False, 'error': 'seed must be non-negative'}), 400
+    if not 1 <= samples <= MAX_SYNC_SAMPLES:
+        return jsonify({
+            'success': False,
+            'error': f'samples must be between 1 and {MAX_SYNC_SAMPLES}; submit a monte_carlo job for larger runs'
+        }), 400
+    
+    try:
+        bike = catalog_repository.snapshot().get(bike_id)
+        if bike is None:
+            return jsonify({'success': False, 'error': 'Bike not found'}), 404
+        
+        results = PerformanceSimulator().simulate_monte_carlo(
+            bike,
+            rider_weight,
+            str(data.get('road_type', 'city')),
+            str(data.get('weather', 'sunny')),
+            str(data.get('riding_style', 'moderate')),
+            samples=samples,
+            seed=seed,
+            workers=current_app.config.get('SIMULATION_WORKERS')
+        )
+        if 'error' in results:
+            return jsonify({'success': False, 'error': results['error']}), 422
+        
+        return jsonify({
+            'success': True,
+            'bike_id': bike.id,
+            'data': results
+        }), 200
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _job_payload(job):
+    return {
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'progress': round(job.progress or 0.0, 4),
+        'error': job.error,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'status_url': url_for('simulator.job_status', job_id=job.id),
+        'result_url': url_for('simulator.job_result', job_id=job.id)
+    }
+
+
+def _user_job(job_id):
+    return SimulationJob.query.filter_by(id=job_id, user_id=current_user.id).first()
+
+
+@simulator_bp.route('/jobs', methods=['POST'])
+@login_required
+@query_budget(6)
+def submit_job():
+    """Queue a Monte Carlo or grid simulation and return its id at once
+    
+    JSON body: kind ('monte_carlo' or 'grid') plus the parameters of the
+    matching endpoint; a grid job without bike_ids covers the whole
+    catalog. Poll status_url until it finishes, then fetch result_url.
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        params = parse_job_params(data.get('kind'), data)
+        job = simulation_jobs.submit(
+            current_app._get_current_object(), current_user.id, data['kind'], params,
+            limit=current_app.config['SIMULATION_JOB_LIMIT']
+        )
+        db.session.refresh(job)
+        response = jsonify({
+            'success': True,
+            'job': _job_payload(job)
+        })
+        response.headers['Location'] = url_for('simulator.job_status', job_id=job.id)
+        return response, 202
+        
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    except JobLimitExceeded as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 429
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@simulator_bp.route('/jobs')
+@login_required
+@query_budget(2)
+def list_jobs():
+    """The current user's most recent simulation jobs"""
+    jobs = SimulationJob.query.filter_by(user_id=current_user.id).order_by(
+        SimulationJob.created_at.desc()
+    ).limit(RECENT_JOBS).all()
+    return jsonify({
+        'success': True,
+        'count': len(jobs),
+        'jobs': [_job_payload(job) for job in jobs]
+    }), 200
+
+
+@simulator_bp.route('/jobs/<job_id>')
+@login_required
+@query_budget(2)
+def job_status(job_id):
+    """Status and progress of one of the current user's jobs
+    
+    While the job is queued or running, Retry-After says how long to wait
+    before polling again.
+    """
+    job = _user_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    response = jsonify({'success': True, 'job': _job_payload(job)})
+    if job.status in ACTIVE_STATUSES:
+        response.headers['Retry-After'] = str(JOB_POLL_INTERVAL)
+    return response, 200
+
+
+@simulator_bp.route('/jobs/<job_id>/result')
+@login_required
+@query_budget(2)
+def job_result(job_id):
+    """Result of a completed job; 409 while it is queued, running or failed"""
+    job = _user_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if job.status != 'completed':
+        return jsonify({
+            'success': False,
+            'error': job.error or f'Job is {job.status}',
+            'job': _job_payload(job)
+        }), 409
+    return jsonify({
+        'success': True,
+        'job': _job_payload(job),
+        'data': job.result_data
+    }), 200
+
+
+@simulator_bp.route('/jobs/<job_id>', methods=['DELETE'])
+@login_required
+@query_budget(4)
+def cancel_job(job_id):
+    """Cancel a queued or running job"""
+    job = _user_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if not simulation_jobs.cancel(job):
+        return jsonify({
+            'success': False,
+            'error': f'Job is already {job.status}'
+        }), 409
+    db.session.refresh(job)
+    return jsonify({'success': True, 'job': _job_payload(job)}), 200
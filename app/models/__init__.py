@@ -8,6 +8,9 @@ from app.models.accident_reports import AccidentReport
 from app.models.reviews import Review
 from app.models.resale_predictions import ResalePrediction
 from app.models.admin_logs import AdminLog
+from app.models.bike_rating_summary import BikeRatingSummary
+from app.models.simulation_jobs import SimulationJob
+from app.models.fuel_calibrations import FuelCalibration
 
 __all__ = [
     'User',
@@ -19,5 +22,8 @@ __all__ = [
     'AccidentReport',
     'Review',
     'ResalePrediction',
-    'AdminLog'
+    'AdminLog',
+    'BikeRatingSummary',
+    'SimulationJob',
+    'FuelCalibration'
 ]
@@ -1,12 +1,21 @@
+import re
+
 from app import db
 from datetime import datetime
 
+
+def slugify(text):
+    """Lowercase, hyphen-separated form of text for use in URLs"""
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
 class Bike(db.Model):
     __tablename__ = 'bikes'
     
     id = db.Column(db.Integer, primary_key=True)
     brand = db.Column(db.String(50), nullable=False, index=True)
     model = db.Column(db.String(100), nullable=False, index=True)
+    slug = db.Column(db.String(120), unique=True, index=True)
     year = db.Column(db.Integer, nullable=False)
     category = db.Column(db.String(50))  # sport, supersport, naked, touring
     image_url = db.Column(db.String(255))
@@ -0,0 +1,61 @@
+from app import db
+from datetime import datetime
+import json
+
+RATING_CATEGORIES = ('performance', 'comfort', 'mileage', 'looks')
+RECENT_REVIEWS = 5
+
+class BikeRatingSummary(db.Model):
+    """Running totals over a bike's verified reviews"""
+    __tablename__ = 'bike_rating_summary'
+
+    bike_id = db.Column(db.Integer, db.ForeignKey('bikes.id'), primary_key=True)
+
+    review_count = db.Column(db.Integer, nullable=False, default=0, index=True)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+
+    # Category ratings are optional, so each keeps its own count
+    performance_sum = db.Column(db.Integer, nullable=False, default=0)
+    performance_count = db.Column(db.Integer, nullable=False, default=0)
+    comfort_sum = db.Column(db.Integer, nullable=False, default=0)
+    comfort_count = db.Column(db.Integer, nullable=False, default=0)
+    mileage_sum = db.Column(db.Integer, nullable=False, default=0)
+    mileage_count = db.Column(db.Integer, nullable=False, default=0)
+    looks_sum = db.Column(db.Integer, nullable=False, default=0)
+    looks_count = db.Column(db.Integer, nullable=False, default=0)
+
+    # Rating histogram
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
+
+    recent_review_ids = db.Column(db.Text)  # JSON list, newest first
+
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    bike = db.relationship('Bike', backref=db.backref('rating_summary', uselist=False))
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.review_count if self.review_count else 0
+
+    @property
+    def category_averages(self):
+        averages = {}
+        for category in RATING_CATEGORIES:
+            count = getattr(self, f'{category}_count')
+            averages[category] = getattr(self, f'{category}_sum') / count if count else 0
+        return averages
+
+    @property
+    def histogram(self):
+        return {stars: getattr(self, f'rating_{stars}') for stars in range(1, 6)}
+
+    @property
+    def recent_ids(self):
+        return json.loads(self.recent_review_ids) if self.recent_review_ids else []
+
+    def __repr__(self):
+        return f'<BikeRatingSummary for Bike ID {self.bike_id}>'
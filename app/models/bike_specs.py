@@ -1,6 +1,10 @@
 from app import db
 from datetime import datetime
 
+# Stored metrics computed from the specs and the bike's price; kept
+# current by derived_metrics_service so they can be sorted in SQL
+DERIVED_METRICS = ('power_to_weight', 'price_per_hp', 'mileage_avg', 'performance_score')
+
 class BikeSpec(db.Model):
     __tablename__ = 'bike_specs'
     
@@ -42,6 +46,12 @@ class BikeSpec(db.Model):
     front_tyre = db.Column(db.String(50))
     rear_tyre = db.Column(db.String(50))
     
+    # Derived metrics
+    power_to_weight = db.Column(db.Float, index=True)  # in HP per tonne
+    price_per_hp = db.Column(db.Float, index=True)
+    mileage_avg = db.Column(db.Float, index=True)  # in km/l
+    performance_score = db.Column(db.Float, index=True)  # 0-100
+    
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
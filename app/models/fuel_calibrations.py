@@ -0,0 +1,40 @@
+from app import db
+from datetime import datetime
+
+# Multiplicative fuel factors and the (condition, value) each applies to;
+# other values (moderate style, track or other roads, dry weather) are 1
+FUEL_FACTORS = (
+    ('style_smooth', 'riding_style', 'smooth'),
+    ('style_aggressive', 'riding_style', 'aggressive'),
+    ('road_city', 'road_type', 'city'),
+    ('road_highway', 'road_type', 'highway'),
+    ('weather_rainy', 'weather', 'rainy')
+)
+
+class FuelCalibration(db.Model):
+    """Fuel consumption coefficients fitted from ride logs
+
+    One row per bike model (user_bike_id empty) and per user bike with
+    enough rides. Consumption in L/100 km is base_consumption times the
+    factors matching the ride's conditions.
+    """
+    __tablename__ = 'fuel_calibrations'
+
+    id = db.Column(db.Integer, primary_key=True)
+    bike_id = db.Column(db.Integer, db.ForeignKey('bikes.id'), nullable=False, index=True)
+    user_bike_id = db.Column(db.Integer, db.ForeignKey('user_bikes.id'), unique=True)
+
+    base_consumption = db.Column(db.Float, nullable=False)  # L/100 km
+    style_smooth = db.Column(db.Float, nullable=False, default=1.0)
+    style_aggressive = db.Column(db.Float, nullable=False, default=1.0)
+    road_city = db.Column(db.Float, nullable=False, default=1.0)
+    road_highway = db.Column(db.Float, nullable=False, default=1.0)
+    weather_rainy = db.Column(db.Float, nullable=False, default=1.0)
+
+    ride_count = db.Column(db.Integer, nullable=False, default=0)
+    distance = db.Column(db.Float, nullable=False, default=0.0)  # km of rides fitted
+    fitted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        scope = f'UserBike {self.user_bike_id}' if self.user_bike_id else f'Bike {self.bike_id}'
+        return f'<FuelCalibration for {scope}>'
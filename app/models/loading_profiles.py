@@ -0,0 +1,53 @@
+"""
+Declared relationship loading strategies
+
+Every list path that walks a relationship names one of these profiles
+instead of relying on lazy loading, so the number of queries it runs
+does not grow with the number of rows. Many-to-one hops use joinedload;
+collections would use selectinload.
+"""
+
+from sqlalchemy.orm import joinedload
+
+from app.models.bike import Bike
+from app.models.user_bikes import UserBike
+from app.models.ride_logs import RideLog
+from app.models.maintenance_records import MaintenanceRecord
+from app.models.reviews import Review
+
+
+# Built on demand: backref attributes such as RideLog.user_bike only
+# exist once the mappers are configured
+LOAD_PROFILES = {
+    'bike_with_specs': lambda: (
+        joinedload(Bike.specs),
+    ),
+    'bike_details': lambda: (
+        joinedload(Bike.specs),
+        joinedload(Bike.rating_summary)
+    ),
+    'user_bike_list': lambda: (
+        joinedload(UserBike.bike),
+    ),
+    'user_bike_with_specs': lambda: (
+        joinedload(UserBike.bike).joinedload(Bike.specs),
+    ),
+    'ride_list': lambda: (
+        joinedload(RideLog.user_bike).joinedload(UserBike.bike),
+    ),
+    'maintenance_list': lambda: (
+        joinedload(MaintenanceRecord.user_bike).joinedload(UserBike.bike),
+    ),
+    'review_list': lambda: (
+        joinedload(Review.bike),
+        joinedload(Review.author)
+    ),
+    'review_with_author': lambda: (
+        joinedload(Review.author),
+    )
+}
+
+
+def load_profile(name):
+    """Get the loader options for a named profile"""
+    return LOAD_PROFILES[name]()
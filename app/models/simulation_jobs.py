@@ -0,0 +1,49 @@
+from app import db
+from datetime import datetime
+from sqlalchemy.dialects.mysql import LONGTEXT
+import json
+
+JOB_KINDS = ('monte_carlo', 'grid')
+JOB_STATUSES = ('queued', 'running', 'completed', 'failed', 'cancelled')
+ACTIVE_STATUSES = ('queued', 'running')
+
+class SimulationJob(db.Model):
+    """A simulation run in the background, polled by its owner"""
+    __tablename__ = 'simulation_jobs'
+    __table_args__ = (
+        db.Index('ix_simulation_jobs_user_status', 'user_id', 'status'),
+    )
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    kind = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    progress = db.Column(db.Float, nullable=False, default=0.0)  # 0-1
+
+    params = db.Column(db.Text, nullable=False)  # JSON
+    result = db.Column(db.Text().with_variant(LONGTEXT, 'mysql'))  # JSON, set when completed
+    error = db.Column(db.Text)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # Touched with every progress update; a running job that stops
+    # updating has lost its worker
+    heartbeat_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    user = db.relationship('User', backref=db.backref('simulation_jobs', lazy='dynamic'))
+
+    @property
+    def is_active(self):
+        return self.status in ACTIVE_STATUSES
+
+    @property
+    def params_data(self):
+        return json.loads(self.params) if self.params else {}
+
+    @property
+    def result_data(self):
+        return json.loads(self.result) if self.result else None
+
+    def __repr__(self):
+        return f'<SimulationJob {self.id} {self.kind} {self.status}>'
@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+
+from sqlalchemy import func
+
+from app import db
+from app.models.user_bikes import UserBike
+
+
+MAX_SUGGESTIONS = 20
+POPULARITY_TTL = 300  # seconds between ownership count refreshes
+
+_SEPARATOR_RE = re.compile(r'[^a-z0-9]+')
+
+
+def normalize(text):
+    """Lowercase and collapse punctuation so "ZX-6R" and "zx 6r" agree"""
+    return _SEPARATOR_RE.sub(' ', str(text).lower()).strip()
+
+
+class _TrieNode:
+    __slots__ = ('children', 'items', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.items = []
+        self.top = ()
+
+
+class PrefixTrie:
+    """Character trie that keeps the best completions at every node
+
+    Items are (score, label, key) tuples; each node stores its top
+    max_results items so a lookup costs O(len(prefix)).
+    """
+
+    def __init__(self, max_results=MAX_SUGGESTIONS):
+        self.max_results = max_results
+        self._root = _TrieNode()
+
+    def insert(self, text, item):
+        """Add item under text; call finalize() after the last insert"""
+        node = self._root
+        for char in text:
+            node = node.children.setdefault(char, _TrieNode())
+        node.items.append(item)
+
+    def finalize(self):
+        """Compute the per-node top lists bottom-up"""
+        stack = [(self._root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+
+            candidates = list(node.items)
+            for child in node.children.values():
+                candidates.extend(child.top)
+            node.top = tuple(_best(candidates, self.max_results))
+
+    def complete(self, prefix, limit):
+        """Best items whose text starts with prefix"""
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return list(node.top[:limit])
+
+
+class BikeAutocomplete:
+    """Suggests catalog bikes for a typed prefix, most owned first"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._trie = None
+        self._version = None
+        self._built_at = 0
+
+    def suggest(self, snapshot, prefix, limit=8):
+        """Get up to limit (BikeRecord, owners) pairs for prefix"""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        trie = self._current_trie(snapshot)
+        results = []
+        for owners, label, bike_id in trie.complete(prefix, min(limit, MAX_SUGGESTIONS)):
+            record = snapshot.get(bike_id)
+            if record is not None:
+                results.append((record, -owners))
+        return results
+
+    def _current_trie(self, snapshot):
+        trie = self._trie
+        if (trie is not None and self._version == snapshot.version
+                and time.monotonic() - self._built_at < POPULARITY_TTL):
+            return trie
+
+        with self._lock:
+            if (self._trie is None or self._version != snapshot.version
+                    or time.monotonic() - self._built_at >= POPULARITY_TTL):
+                self._trie = self._build(snapshot)
+                self._version = snapshot.version
+                self._built_at = time.monotonic()
+            return self._trie
+
+    def _build(self, snapshot):
+        owners = dict(
+            db.session.query(UserBike.bike_id, func.count(UserBike.id))
+            .filter(UserBike.is_active == True)
+            .group_by(UserBike.bike_id)
+            .all()
+        )
+
+        trie = PrefixTrie()
+        for bike in snapshot.bikes:
+            # Negated count so plain tuple ordering puts popular bikes first
+            item = (-owners.get(bike.id, 0), normalize(f'{bike.brand} {bike.model}'), bike.id)
+            trie.insert(normalize(f'{bike.brand} {bike.model} {bike.year}'), item)
+            # Also reachable from any word of the model ("zx 6r" -> Ninja ZX-6R)
+            words = normalize(f'{bike.model} {bike.year}').split(' ')
+            for start in range(len(words) - 1):
+                trie.insert(' '.join(words[start:]), item)
+        trie.finalize()
+        return trie
+
+
+def _best(items, limit):
+    """Sorted, de-duplicated (by key) head of items"""
+    seen = set()
+    best = []
+    for item in sorted(items):
+        if item[2] in seen:
+            continue
+        seen.add(item[2])
+        best.append(item)
+        if len(best) == limit:
+            break
+    return best
+
+
+bike_autocomplete = BikeAutocomplete()
@@ -0,0 +1,128 @@
+import hashlib
+import threading
+from collections import namedtuple
+
+from sqlalchemy.orm import joinedload
+
+from app.models.bike import Bike
+from app.models.bike_specs import DERIVED_METRICS
+
+
+SPEC_FIELDS = (
+    'engine_cc', 'engine_type', 'max_power', 'max_power_rpm', 'max_torque',
+    'max_torque_rpm', 'fuel_system', 'top_speed', 'acceleration_0_100',
+    'mileage_city', 'mileage_highway', 'length', 'width', 'height', 'wheelbase',
+    'ground_clearance', 'seat_height', 'kerb_weight', 'fuel_capacity',
+    'front_brake', 'rear_brake', 'front_suspension', 'rear_suspension',
+    'front_tyre', 'rear_tyre'
+) + DERIVED_METRICS
+
+BIKE_FIELDS = (
+    'id', 'brand', 'model', 'slug', 'year', 'category', 'image_url', 'price', 'is_active'
+)
+
+# Immutable row types; attribute access matches the ORM models so templates
+# and services can take either
+SpecRecord = namedtuple('SpecRecord', SPEC_FIELDS)
+BikeRecord = namedtuple('BikeRecord', BIKE_FIELDS + ('specs',))
+
+
+class CatalogSnapshot:
+    """Read-only view of the bike catalog at a single version"""
+
+    __slots__ = ('version', 'fingerprint', 'bikes', 'by_id', 'by_slug')
+
+    def __init__(self, version, records):
+        self.version = version
+        # Hash of the contents; unlike version, the same in every process
+        self.fingerprint = hashlib.sha1(repr(records).encode('utf-8')).hexdigest()
+        self.by_id = {record.id: record for record in records}
+        self.by_slug = {record.slug: record for record in records if record.slug}
+        # Active bikes in display order (brand, model)
+        self.bikes = tuple(record for record in records if record.is_active)
+
+    def get(self, bike_id, include_inactive=False):
+        """Get a bike record by id, or None"""
+        record = self.by_id.get(bike_id)
+        if record is None or (not record.is_active and not include_inactive):
+            return None
+        return record
+
+    def __len__(self):
+        return len(self.bikes)
+
+    def __iter__(self):
+        return iter(self.bikes)
+
+
+class CatalogRepository:
+    """Process-wide cache of the bike catalog
+
+    The snapshot is loaded with a single query and reused by every request
+    until an admin write calls bump_version(). Values derived from the
+    catalog (indexes, matrices) can be cached against the same version
+    through derived().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = 1
+        self._snapshot = None
+        self._derived = {}
+
+    @property
+    def version(self):
+        """Current catalog version"""
+        return self._version
+
+    def snapshot(self):
+        """Get the snapshot for the current version, loading it if stale"""
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == self._version:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is None or self._snapshot.version != self._version:
+                self._snapshot = self._load(self._version)
+                self._derived = {}
+            return self._snapshot
+
+    def bump_version(self):
+        """Invalidate the snapshot after a catalog write"""
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    def derived(self, key, builder):
+        """Get builder(snapshot), computed once per catalog version"""
+        snapshot = self.snapshot()
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] == snapshot.version:
+            return cached[1]
+
+        value = builder(snapshot)
+        with self._lock:
+            if self._snapshot is snapshot:
+                self._derived[key] = (snapshot.version, value)
+        return value
+
+    def _load(self, version):
+        """Load every bike and its specs in one query"""
+        bikes = Bike.query.options(joinedload(Bike.specs)).order_by(
+            Bike.brand, Bike.model, Bike.id
+        ).all()
+
+        records = []
+        for bike in bikes:
+            specs = None
+            if bike.specs:
+                specs = SpecRecord(*(getattr(bike.specs, field) for field in SPEC_FIELDS))
+            records.append(BikeRecord(
+                *(getattr(bike, field) for field in BIKE_FIELDS),
+                specs=specs
+            ))
+
+        return CatalogSnapshot(version, records)
+
+
+catalog_repository = CatalogRepository()
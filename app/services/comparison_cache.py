@@ -0,0 +1,66 @@
+import threading
+from collections import OrderedDict
+
+from app.services.catalog_repository import catalog_repository
+
+
+COMPARISON_CACHE_SIZE = 512  # entries across all kinds
+
+
+class ComparisonCache:
+    """LRU cache of comparison results
+
+    Entries are keyed by kind (e.g. 'api', 'fragment'), the catalog version
+    and the sorted set of bikes compared, so the same matchup picked in any
+    order is computed once per catalog version; values that depend on the
+    order, like rendered HTML, are keyed on the bikes in order instead.
+    Entries for older versions are never hit again and age out of the LRU.
+    """
+
+    def __init__(self, max_entries=COMPARISON_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get_or_build(self, kind, bike_keys, builder, ordered=False):
+        """Get the cached value for this comparison, calling builder() on a miss"""
+        bike_keys = tuple(bike_keys) if ordered else tuple(sorted(set(bike_keys)))
+        key = (kind, catalog_repository.version, bike_keys)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = builder()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        """Hit and miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None
+            }
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+comparison_cache = ComparisonCache()
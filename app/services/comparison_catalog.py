@@ -0,0 +1,207 @@
+import itertools
+import re
+
+from app.models.bike import Bike, slugify
+from app.services.catalog_repository import catalog_repository
+
+
+# Editorial notes for catalog bikes on the comparison page, keyed by slug.
+# Specs always come from the catalog; bikes not in it are not compared.
+COMPARISON_LINEUP = {
+    'yamaha-r15-v4': {
+        'gearbox': '6-speed with slipper clutch',
+        'features': ['VVA technology', 'Traction Control', 'Quick-shifter (upshift)', 'Dual-channel ABS'],
+        'owner_notes': 'Very reliable. Low maintenance. Best for beginners & daily + highway'
+    },
+    'bajaj-pulsar-rs200': {
+        'gearbox': '6-speed',
+        'features': ['Triple spark engine', 'Dual-channel ABS', 'Comfortable riding posture'],
+        'owner_notes': 'Affordable full-faired bike. Parts easily available. Slight vibration at high RPM'
+    },
+    'ktm-rc160': {
+        'gearbox': '6-speed',
+        'features': ['Aggressive KTM design', 'Stiff chassis', 'Track-focused ergonomics'],
+        'owner_notes': 'Sporty but not comfortable for city. Maintenance cost medium'
+    },
+    'ktm-rc125': {
+        'gearbox': '6-speed',
+        'features': ['Trellis frame', 'WP suspension'],
+        'owner_notes': 'Looks big, power is low. High price for 125 cc'
+    },
+    'suzuki-gixxer-sf250': {
+        'gearbox': '6-speed',
+        'features': ['Strong low-end torque', 'Good highway stability'],
+        'owner_notes': 'Best daily + touring sport bike. Low vibration'
+    },
+    'bajaj-pulsar-ns200': {
+        'gearbox': '6-speed',
+        'features': ['Naked sport', 'Strong performance'],
+        'owner_notes': 'Easy to ride. Good spare availability'
+    },
+    'tvs-apache-rr310': {
+        'gearbox': '6-speed',
+        'features': ['Ride modes', 'TFT display', 'Bi-directional quick-shifter'],
+        'owner_notes': 'Best Indian-made track bike. Service quality depends on city'
+    },
+    'bmw-g310rr': {
+        'gearbox': '6-speed',
+        'features': ['BMW styling', 'Premium build quality'],
+        'owner_notes': 'Premium feel. Service cost higher than TVS'
+    },
+    'ktm-rc200': {
+        'gearbox': '6-speed',
+        'features': ['Trellis frame', 'WP suspension', 'Aggressive ergonomics'],
+        'owner_notes': 'Hardcore riding position. Fun on track, tiring in city'
+    },
+    'ktm-rc390': {
+        'gearbox': '6-speed',
+        'features': ['Ride-by-wire', 'Cornering ABS', 'TFT display'],
+        'owner_notes': 'Very fast. Requires skilled rider. Higher maintenance'
+    },
+    'kawasaki-ninja300': {
+        'gearbox': '6-speed',
+        'features': ['Twin-cylinder smoothness', 'Dual-channel ABS', 'Slipper clutch'],
+        'owner_notes': 'Smooth engine. Reliable. Expensive spare parts'
+    },
+    'yamaha-r3': {
+        'gearbox': '6-speed',
+        'features': ['Twin-cylinder', 'Slipper clutch', 'Dual-channel ABS'],
+        'owner_notes': 'Very refined. High price'
+    },
+    'aprilia-rs457': {
+        'gearbox': '6-speed',
+        'features': ['Ride modes', 'TFT display', 'Traction control'],
+        'owner_notes': 'Excellent handling. New service network'
+    },
+    'kawasaki-ninja650': {
+        'gearbox': '6-speed',
+        'features': ['Comfortable ergonomics', 'Slipper clutch', 'Dual-channel ABS'],
+        'owner_notes': 'Comfortable sport touring. Beginner-friendly big bike'
+    },
+    'honda-cbr650r': {
+        'gearbox': '6-speed',
+        'features': ['Inline-4 engine', 'Showa suspension', 'LED lighting'],
+        'owner_notes': 'Smooth sound. Very reliable. Expensive'
+    },
+    'kawasaki-zx6r': {
+        'gearbox': '6-speed',
+        'features': ['High-revving engine', 'Track-focused', 'Quick-shifter'],
+        'owner_notes': 'Track weapon. Not city-friendly'
+    },
+    'suzuki-hayabusa': {
+        'gearbox': '6-speed',
+        'features': ['Advanced electronics', 'Cruise control', 'Launch control'],
+        'owner_notes': 'Heavy. Comfortable superbike. Expensive tyres'
+    },
+    'kawasaki-zx10r': {
+        'gearbox': '6-speed',
+        'features': ['Race-derived electronics', 'Quick-shifter', 'Cornering ABS'],
+        'owner_notes': 'Race machine. Needs expert rider'
+    },
+    'ducati-panigale-v4': {
+        'gearbox': '6-speed',
+        'features': ['V4 engine', 'Cornering ABS', 'Wheelie control', 'Quick-shifter'],
+        'owner_notes': 'Very expensive maintenance'
+    },
+    'bmw-s1000rr': {
+        'gearbox': '6-speed',
+        'features': ['Advanced electronics', 'Dynamic traction control', 'Cornering ABS'],
+        'owner_notes': 'Best electronics. High service cost'
+    },
+    'honda-cbr1000rr': {
+        'gearbox': '6-speed',
+        'features': ['Race-derived engine', 'Advanced electronics', 'Aerodynamic design'],
+        'owner_notes': 'Legendary reliability'
+    }
+}
+
+# Catalog (brand, model) pairs whose lineup slug isn't their name
+LINEUP_ALIASES = {
+    ('Yamaha', 'YZF-R3'): 'yamaha-r3',
+    ('Kawasaki', 'Ninja ZX-6R'): 'kawasaki-zx6r',
+    ('Kawasaki', 'Ninja ZX-10R'): 'kawasaki-zx10r'
+}
+
+
+def _match_key(name):
+    return re.sub(r'[^a-z0-9]', '', name.lower())
+
+
+_LINEUP_KEYS = {_match_key(slug): slug for slug in COMPARISON_LINEUP}
+_LINEUP_KEYS.update({_match_key(f'{brand}{model}'): slug for (brand, model), slug in LINEUP_ALIASES.items()})
+
+
+def bike_slug(brand, model, year=None, bike_id=None):
+    """Unused slug for a bike, preferring its comparison lineup slug"""
+    base = _LINEUP_KEYS.get(_match_key(f'{brand}{model}')) or slugify(f'{brand} {model}')
+    candidates = [base]
+    if year:
+        candidates.append(f'{base}-{year}')
+    # Then a numeric suffix until one is free
+    candidates = itertools.chain(candidates, (f'{base}-{number}' for number in itertools.count(2)))
+
+    for slug in candidates:
+        owner = Bike.query.filter_by(slug=slug).with_entities(Bike.id).scalar()
+        if owner is None or owner == bike_id:
+            return slug
+
+
+def comparison_payload(record, editorial=None):
+    """Comparison row for a catalog record, with its editorial notes if any
+
+    Returns None when price, power or weight is missing.
+    """
+    editorial = editorial or {}
+    specs = record.specs
+
+    payload = {
+        'slug': record.slug,
+        'brand': record.brand,
+        'model': record.model,
+        'price': record.price,
+        'category': record.category,
+        'engine_cc': specs.engine_cc if specs else None,
+        'engine_type': specs.engine_type if specs else None,
+        'power': specs.max_power if specs else None,
+        'torque': specs.max_torque if specs else None,
+        'mileage': _mileage(specs),
+        'weight': specs.kerb_weight if specs else None,
+        'seat_height': specs.seat_height if specs else None,
+        'gearbox': editorial.get('gearbox'),
+        'features': editorial.get('features', []),
+        'owner_notes': editorial.get('owner_notes', '')
+    }
+
+    if not payload['price'] or not payload['power'] or not payload['weight']:
+        return None
+    # Stored by derived_metrics_service alongside the specs
+    payload['power_to_weight'] = round(specs.power_to_weight, 2) if specs.power_to_weight is not None else None
+    payload['price_per_hp'] = round(specs.price_per_hp, 0) if specs.price_per_hp is not None else None
+    return payload
+
+
+def _mileage(specs):
+    if specs is None:
+        return None
+    values = [value for value in (specs.mileage_city, specs.mileage_highway) if value]
+    if not values:
+        return None
+    low, high = min(values), max(values)
+    return f'{low:g}' if low == high else f'{low:g}-{high:g}'
+
+
+def build_comparison_index(snapshot):
+    """Comparison rows by slug for every active bike"""
+    index = {}
+    for record in snapshot.bikes:
+        if not record.slug:
+            continue
+        payload = comparison_payload(record, COMPARISON_LINEUP.get(record.slug))
+        if payload is not None:
+            index[record.slug] = payload
+    return index
+
+
+def get_comparison_index():
+    """Comparison rows by slug for the current catalog version"""
+    return catalog_repository.derived('comparison_index', build_comparison_index)
@@ -1,103 +1,151 @@
-from app.models.bike_specs import BikeSpec
+import numpy as np
+
+from app.services.catalog_repository import catalog_repository
+from app.services.derived_metrics import performance_scores
+from app.services.spec_matrix import get_spec_matrix
+
+
+# Spec matrix columns the comparison reads
+COMPARISON_COLUMNS = (
+    'top_speed', 'acceleration_0_100', 'max_power', 'max_torque',
+    'mileage_city', 'mileage_highway', 'price', 'kerb_weight', 'seat_height',
+    'fuel_capacity', 'wheelbase'
+)
+
+
+def _descending(values):
+    """Positions sorted by value, highest first, missing last, ties by position"""
+    keys = -values
+    keys[np.isnan(keys)] = np.inf
+    return np.lexsort((np.arange(len(values)), keys))
+
 
 class ComparisonEngine:
-    """Engine for comparing sport bikes across multiple parameters"""
-    
+    """Engine for comparing sport bikes across multiple parameters
+
+    Specs are gathered into column arrays once and every score, ranking
+    and pick is computed over the arrays, so comparing 2 bikes and
+    ranking the whole catalog run the same code.
+    """
+
     def compare_bikes(self, bikes):
         """Compare multiple bikes and return detailed comparison data"""
-        comparison_data = {
-            'performance': self._compare_performance(bikes),
-            'economy': self._compare_economy(bikes),
-            'dimensions': self._compare_dimensions(bikes),
-            'recommendations': self._generate_recommendations(bikes)
+        bikes = [bike for bike in bikes if bike.specs]
+        columns = self._columns(bikes)
+        return self._compare(bikes, columns)
+
+    def rank_catalog(self, limit=None, category=None, brand=None):
+        """Compare every active catalog bike, optionally filtered
+
+        Uses the scores cached for the current catalog version, so the
+        cost is a mask and two argsorts.
+        """
+        scores = get_catalog_scores()
+        positions = np.flatnonzero(scores.matrix.mask(category=category, brand=brand) & scores.has_specs)
+        bikes = [scores.matrix.records[position] for position in positions]
+        columns = {name: values[positions] for name, values in scores.columns.items()}
+        return self._compare(bikes, columns, limit=limit)
+
+    def _columns(self, bikes):
+        """Column arrays for bikes, NaN where a value is missing"""
+        columns = {
+            name: np.fromiter(
+                (np.nan if getattr(bike.specs, name, None) is None else float(getattr(bike.specs, name))
+                 for bike in bikes),
+                float, len(bikes)
+            )
+            for name in COMPARISON_COLUMNS if name != 'price'
+        }
+        columns['price'] = np.fromiter(
+            (np.nan if bike.price is None else float(bike.price) for bike in bikes), float, len(bikes)
+        )
+        return _with_scores(columns)
+
+    def _compare(self, bikes, columns, limit=None):
+        performance_order = _descending(columns['score'])[:limit]
+        economy_order = _descending(columns['avg_mileage'])[:limit]
+
+        return {
+            'performance': self._compare_performance(bikes, columns, performance_order),
+            'economy': self._compare_economy(bikes, columns, economy_order),
+            'dimensions': self._compare_dimensions(bikes, columns, limit),
+            'recommendations': self._generate_recommendations(bikes, columns)
         }
-        return comparison_data
-    
-    def _compare_performance(self, bikes):
-        """Compare performance metrics"""
-        performance = []
-        
-        for bike in bikes:
-            if bike.specs:
-                score = self._calculate_performance_score(bike.specs)
-                performance.append({
-                    'bike': bike,
-                    'top_speed': bike.specs.top_speed,
-                    'acceleration': bike.specs.acceleration_0_100,
-                    'power': bike.specs.max_power,
-                    'torque': bike.specs.max_torque,
-                    'score': score
-                })
-        
-        return sorted(performance, key=lambda x: x['score'], reverse=True)
-    
-    def _compare_economy(self, bikes):
-        """Compare fuel economy and costs"""
-        economy = []
-        
-        for bike in bikes:
-            if bike.specs:
-                avg_mileage = (bike.specs.mileage_city + bike.specs.mileage_highway) / 2
-                economy.append({
-                    'bike': bike,
-                    'city_mileage': bike.specs.mileage_city,
-                    'highway_mileage': bike.specs.mileage_highway,
-                    'avg_mileage': avg_mileage,
-                    'price': bike.price
-                })
-        
-        return sorted(economy, key=lambda x: x['avg_mileage'], reverse=True)
-    
-    def _compare_dimensions(self, bikes):
+
+    def _compare_performance(self, bikes, columns, order):
+        """Compare performance metrics, best score first"""
+        return [{
+            'bike': bikes[position],
+            'top_speed': _value(columns['top_speed'][position]),
+            'acceleration': _value(columns['acceleration_0_100'][position]),
+            'power': _value(columns['max_power'][position]),
+            'torque': _value(columns['max_torque'][position]),
+            'score': float(columns['score'][position])
+        } for position in order]
+
+    def _compare_economy(self, bikes, columns, order):
+        """Compare fuel economy and costs, best mileage first"""
+        return [{
+            'bike': bikes[position],
+            'city_mileage': _value(columns['mileage_city'][position]),
+            'highway_mileage': _value(columns['mileage_highway'][position]),
+            'avg_mileage': _value(columns['avg_mileage'][position]),
+            'price': _value(columns['price'][position])
+        } for position in order]
+
+    def _compare_dimensions(self, bikes, columns, limit=None):
         """Compare physical dimensions and weight"""
-        dimensions = []
-        
-        for bike in bikes:
-            if bike.specs:
-                dimensions.append({
-                    'bike': bike,
-                    'weight': bike.specs.kerb_weight,
-                    'seat_height': bike.specs.seat_height,
-                    'fuel_capacity': bike.specs.fuel_capacity,
-                    'wheelbase': bike.specs.wheelbase
-                })
-        
-        return dimensions
-    
-    def _calculate_performance_score(self, specs):
-        """Calculate overall performance score"""
-        score = 0
-        
-        if specs.top_speed:
-            score += (specs.top_speed / 300) * 30  # Max 30 points
-        
-        if specs.acceleration_0_100:
-            score += (10 / specs.acceleration_0_100) * 30  # Max 30 points (lower is better)
-        
-        if specs.max_power:
-            score += (specs.max_power / 200) * 20  # Max 20 points
-        
-        if specs.max_torque:
-            score += (specs.max_torque / 150) * 20  # Max 20 points
-        
-        return round(score, 2)
-    
-    def _generate_recommendations(self, bikes):
+        return [{
+            'bike': bikes[position],
+            'weight': _value(columns['kerb_weight'][position]),
+            'seat_height': _value(columns['seat_height'][position]),
+            'fuel_capacity': _value(columns['fuel_capacity'][position]),
+            'wheelbase': _value(columns['wheelbase'][position])
+        } for position in range(len(bikes))[:limit]]
+
+    def _generate_recommendations(self, bikes, columns):
         """Generate intelligent recommendations"""
         recommendations = {}
-        
+
         if bikes:
-            performance_sorted = sorted(bikes, 
-                key=lambda b: b.specs.max_power if b.specs else 0, 
-                reverse=True)
-            
-            economy_sorted = sorted(bikes,
-                key=lambda b: (b.specs.mileage_city + b.specs.mileage_highway) / 2 if b.specs else 0,
-                reverse=True)
-            
-            recommendations['best_performance'] = performance_sorted[0] if performance_sorted else None
-            recommendations['best_economy'] = economy_sorted[0] if economy_sorted else None
-            recommendations['best_track'] = performance_sorted[0] if performance_sorted else None
-            recommendations['best_daily'] = economy_sorted[0] if economy_sorted else None
-        
+            most_powerful = bikes[_descending(columns['max_power'])[0]]
+            most_economical = bikes[_descending(columns['avg_mileage'])[0]]
+
+            recommendations['best_performance'] = most_powerful
+            recommendations['best_economy'] = most_economical
+            recommendations['best_track'] = most_powerful
+            recommendations['best_daily'] = most_economical
+
         return recommendations
+
+
+class CatalogScores:
+    """Comparison columns and scores for every active bike at one catalog version"""
+
+    def __init__(self, matrix):
+        self.version = matrix.version
+        self.matrix = matrix
+        self.has_specs = np.fromiter((bike.specs is not None for bike in matrix.records), bool, len(matrix))
+        self.columns = {name: matrix.column(name) for name in COMPARISON_COLUMNS}
+        self.columns['score'] = matrix.column('performance_score')
+        self.columns['avg_mileage'] = matrix.column('mileage_avg')
+
+
+def get_catalog_scores():
+    """Comparison scores for the current catalog version"""
+    return catalog_repository.derived('comparison_scores', lambda snapshot: CatalogScores(get_spec_matrix()))
+
+
+def _with_scores(columns):
+    columns['score'] = performance_scores(
+        columns['top_speed'], columns['acceleration_0_100'], columns['max_power'], columns['max_torque']
+    )
+    columns['avg_mileage'] = (columns['mileage_city'] + columns['mileage_highway']) / 2
+    return columns
+
+
+def _value(value):
+    return None if np.isnan(value) else float(value)
+
+
+comparison_engine = ComparisonEngine()
@@ -1,3 +1,6 @@
+from app.services.fuel_calibration import fuel_calibration_service
+
+
 class CostCalculator:
     """Calculates total ownership cost"""
     
@@ -17,14 +20,15 @@ class CostCalculator:
         }
     }
     
-    def calculate_ownership_cost(self, bike, yearly_km, fuel_price, insurance_type):
+    def calculate_ownership_cost(self, bike, yearly_km, fuel_price, insurance_type, user_bike_id=None):
         """Calculate total ownership cost"""
         
         if not bike.specs:
             return {'error': 'Bike specifications not available'}
         
         # Calculate annual costs
-        fuel_cost = self._calculate_fuel_cost(bike.specs, yearly_km, fuel_price)
+        fuel_model = fuel_calibration_service.model_for(bike.id, user_bike_id)
+        fuel_cost = self._calculate_fuel_cost(bike.specs, yearly_km, fuel_price, fuel_model)
         insurance_cost = self._calculate_insurance(bike.specs.engine_cc, insurance_type)
         maintenance_cost = self._calculate_maintenance_cost(bike.specs, yearly_km)
         depreciation = self._calculate_depreciation(bike.price)
@@ -54,6 +58,10 @@ class CostCalculator:
                 'registration_annual': round(registration / 5, 2),
                 'accessories': round(accessories, 2)
             },
+            'fuel_model': {
+                'source': fuel_model.source if fuel_model else 'specs',
+                'rides': fuel_model.rides if fuel_model else 0
+            },
             'totals': {
                 'annual_cost': round(total_annual_cost, 2),
                 'monthly_cost': round(cost_per_month, 2),
@@ -65,8 +73,12 @@ class CostCalculator:
             }
         }
     
-    def _calculate_fuel_cost(self, specs, yearly_km, fuel_price):
+    def _calculate_fuel_cost(self, specs, yearly_km, fuel_price, fuel_model=None):
         """Calculate annual fuel cost"""
+        if fuel_model is not None:
+            # Fitted from ride logs: moderate riding, half city and half highway
+            return yearly_km * fuel_model.average_consumption() / 100 * fuel_price
+        
         avg_mileage = (specs.mileage_city + specs.mileage_highway) / 2
         liters_needed = yearly_km / avg_mileage
         return liters_needed * fuel_price
@@ -0,0 +1,67 @@
+import numpy as np
+
+from app import db
+from app.models.bike import Bike
+from app.models.bike_specs import BikeSpec
+
+
+def performance_scores(top_speed, acceleration, power, torque):
+    """Overall performance score for arrays of specs; NaN counts as missing"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        parts = np.vstack((
+            top_speed / 300 * 30,  # Max 30 points
+            np.where(acceleration > 0, 10 / acceleration, np.nan) * 30,  # Max 30 points (lower is better)
+            power / 200 * 20,  # Max 20 points
+            torque / 150 * 20  # Max 20 points
+        ))
+    return np.round(np.nansum(parts, axis=0), 2)
+
+
+def derived_metrics(specs, price):
+    """Derived metric values for one bike's specs and price"""
+    def number(value):
+        return np.nan if value is None else float(value)
+
+    power = number(specs.max_power)
+    weight = number(specs.kerb_weight)
+    price = number(price)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        values = {
+            'power_to_weight': power / (weight / 1000),  # HP per tonne
+            'price_per_hp': price / power,
+            'mileage_avg': (number(specs.mileage_city) + number(specs.mileage_highway)) / 2,
+            'performance_score': performance_scores(
+                np.array([number(specs.top_speed)]), np.array([number(specs.acceleration_0_100)]),
+                np.array([power]), np.array([number(specs.max_torque)])
+            )[0]
+        }
+    return {name: float(value) if np.isfinite(value) else None for name, value in values.items()}
+
+
+class DerivedMetricsService:
+    """Keeps the stored derived metric columns on bike_specs current
+
+    Call refresh() after changing a bike's specs or price; the change is
+    committed together with the write.
+    """
+
+    def refresh(self, specs, price):
+        """Recompute the derived metrics on specs for a bike priced at price"""
+        if specs is None:
+            return None
+        for name, value in derived_metrics(specs, price).items():
+            setattr(specs, name, value)
+        return specs
+
+    def backfill(self):
+        """Recompute derived metrics for every bike; returns rows written"""
+        rows = 0
+        specs_rows = BikeSpec.query.join(Bike, Bike.id == BikeSpec.bike_id).add_columns(Bike.price).all()
+        for specs, price in specs_rows:
+            self.refresh(specs, price)
+            rows += 1
+        db.session.flush()
+        return rows
+
+
+derived_metrics_service = DerivedMetricsService()
@@ -0,0 +1,183 @@
+import re
+
+import numpy as np
+
+from app.services.catalog_repository import catalog_repository
+
+
+# (key, label, low, high) with low inclusive and high exclusive
+CC_BUCKETS = (
+    ('under_150', 'Under 150cc', 0, 150),
+    ('150_250', '150-250cc', 150, 250),
+    ('250_400', '250-400cc', 250, 400),
+    ('400_650', '400-650cc', 400, 650),
+    ('650_1000', '650-1000cc', 650, 1000),
+    ('over_1000', '1000cc+', 1000, float('inf'))
+)
+
+PRICE_BANDS = (
+    ('under_1.5l', 'Under ₹1.5L', 0, 150000),
+    ('1.5l_3l', '₹1.5L-3L', 150000, 300000),
+    ('3l_6l', '₹3L-6L', 300000, 600000),
+    ('6l_12l', '₹6L-12L', 600000, 1200000),
+    ('12l_25l', '₹12L-25L', 1200000, 2500000),
+    ('over_25l', '₹25L+', 2500000, float('inf'))
+)
+
+# Checked in order against engine_type; first match wins
+LAYOUT_PATTERNS = (
+    ('single', 'Single', re.compile(r'single')),
+    ('parallel_twin', 'Parallel twin', re.compile(r'parallel[- ]?twin')),
+    ('v_twin', 'V/L twin', re.compile(r'\b[vl][- ]?twin')),
+    ('inline_3', 'Inline 3', re.compile(r'inline[- ]?3|triple')),
+    ('inline_4', 'Inline 4', re.compile(r'inline[- ]?4')),
+    ('v4', 'V4', re.compile(r'\bv[- ]?4\b'))
+)
+
+FEATURE_PATTERNS = (
+    ('abs', 'ABS', re.compile(r'\babs\b')),
+    ('quick_shifter', 'Quick-shifter', re.compile(r'quick[- ]?shift'))
+)
+
+# Spec text scanned for features
+FEATURE_FIELDS = (
+    'engine_type', 'fuel_system', 'front_brake', 'rear_brake',
+    'front_suspension', 'rear_suspension'
+)
+
+FACETS = ('brand', 'category', 'cc', 'price', 'layout', 'features')
+
+
+class FacetIndex:
+    """Per-value bitsets over the active catalog
+
+    Bit i of every bitset refers to snapshot.bikes[i], the same order
+    used by SpecMatrix, so range masks can be combined directly.
+    Selected values are OR'ed within a facet and AND'ed across facets.
+    """
+
+    def __init__(self, snapshot):
+        self.version = snapshot.version
+        self.records = snapshot.bikes
+        self.all_bits = (1 << len(self.records)) - 1
+        self.bitsets = {facet: {} for facet in FACETS}
+        self.labels = {facet: {} for facet in FACETS}
+
+        for position, bike in enumerate(self.records):
+            bit = 1 << position
+            for facet, values in self._facet_values(bike).items():
+                for key, label in values:
+                    self.bitsets[facet][key] = self.bitsets[facet].get(key, 0) | bit
+                    self.labels[facet].setdefault(key, label)
+
+    def search(self, selections, base=None):
+        """Intersect selections and count every facet value
+
+        selections maps facet name to a list of selected values. Counts
+        for a facet apply every other facet's selection (and base), so
+        they show how many results picking that value would give.
+        Returns (result_bits, counts).
+        """
+        base = self.all_bits if base is None else base & self.all_bits
+        filters = {}
+        for facet, values in selections.items():
+            if values:
+                bits = 0
+                for value in values:
+                    bits |= self.bitsets[facet].get(str(value).lower(), 0)
+                filters[facet] = bits
+
+        result = base
+        for bits in filters.values():
+            result &= bits
+
+        counts = {}
+        for facet in FACETS:
+            others = base
+            for other, bits in filters.items():
+                if other != facet:
+                    others &= bits
+            counts[facet] = [
+                {'value': key, 'label': self.labels[facet][key], 'count': (bits & others).bit_count()}
+                for key, bits in self._ordered(facet)
+            ]
+
+        return result, counts
+
+    def positions(self, bits):
+        """Positions of the set bits, lowest first"""
+        positions = []
+        while bits:
+            lowest = bits & -bits
+            positions.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return positions
+
+    def value_counts(self, facet):
+        """Unfiltered (label, count) pairs for one facet"""
+        return [
+            (self.labels[facet][key], bits.bit_count())
+            for key, bits in self._ordered(facet)
+        ]
+
+    def _ordered(self, facet):
+        items = self.bitsets[facet].items()
+        if facet in ('cc', 'price', 'layout', 'features'):
+            order = {key: rank for rank, key in enumerate(_facet_keys(facet))}
+            return sorted(items, key=lambda item: order[item[0]])
+        return sorted(items, key=lambda item: (-item[1].bit_count(), item[0]))
+
+    def _facet_values(self, bike):
+        values = {facet: [] for facet in FACETS}
+        if bike.brand:
+            values['brand'].append((bike.brand.lower(), bike.brand))
+        if bike.category:
+            values['category'].append((bike.category.lower(), bike.category))
+        if bike.price is not None:
+            values['price'].extend(_bucket(PRICE_BANDS, bike.price))
+
+        specs = bike.specs
+        if specs is not None:
+            if specs.engine_cc is not None:
+                values['cc'].extend(_bucket(CC_BUCKETS, specs.engine_cc))
+
+            engine_type = (specs.engine_type or '').lower()
+            for key, label, pattern in LAYOUT_PATTERNS:
+                if pattern.search(engine_type):
+                    values['layout'].append((key, label))
+                    break
+
+            text = ' '.join((getattr(specs, field) or '') for field in FEATURE_FIELDS).lower()
+            for key, label, pattern in FEATURE_PATTERNS:
+                if pattern.search(text):
+                    values['features'].append((key, label))
+
+        return values
+
+
+def mask_to_bits(mask):
+    """Convert a boolean NumPy mask to a bitset with bit i = mask[i]"""
+    packed = np.packbits(np.asarray(mask, dtype=bool), bitorder='little')
+    return int.from_bytes(packed.tobytes(), 'little')
+
+
+def get_facet_index():
+    """Facet index for the current catalog version"""
+    return catalog_repository.derived('facet_index', FacetIndex)
+
+
+def _bucket(buckets, value):
+    for key, label, low, high in buckets:
+        if low <= value < high:
+            return [(key, label)]
+    return []
+
+
+def _facet_keys(facet):
+    source = {
+        'cc': CC_BUCKETS,
+        'price': PRICE_BANDS,
+        'layout': LAYOUT_PATTERNS,
+        'features': FEATURE_PATTERNS
+    }[facet]
+    return [entry[0] for entry in source]
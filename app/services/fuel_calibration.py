@@ -0,0 +1,219 @@
+"""
+Ride-log-calibrated fuel consumption
+
+Each ride's consumption (L/100 km) is modelled as a base figure times a
+factor for its riding style, road type and weather. The logs of each
+bike model, and of each user bike, are fitted in log space by
+distance-weighted ridge regression that shrinks toward a prior: the
+spec mileage and the simulator's fixed multipliers for a model, the
+model's own fit for a user bike. A handful of rides nudges the
+coefficients; a long history overrides the prior.
+
+The fitted rows are loaded into dicts once per CALIBRATION_TTL, so a
+lookup at request time is a dict get.
+"""
+
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import delete, select
+
+from app import db
+from app.models.fuel_calibrations import FUEL_FACTORS, FuelCalibration
+from app.models.ride_logs import RideLog
+from app.models.user_bikes import UserBike
+from app.services.catalog_repository import catalog_repository
+
+
+# The simulator's fixed multipliers (see PerformanceSimulator._get_fuel_modifier)
+DEFAULT_FACTORS = {
+    'style_smooth': 0.85,
+    'style_aggressive': 1.3,
+    'road_city': 1.2,
+    'road_highway': 0.9,
+    'weather_rainy': 1.0
+}
+PRIOR_WEIGHT = 5.0  # the prior counts as this many average-length rides
+MIN_RIDES = 3  # rides needed before a bike or user bike gets its own row
+CONSUMPTION_RANGE = (0.5, 30.0)  # L/100 km; rides outside are logging errors
+CALIBRATION_TTL = 300  # seconds a process keeps its loaded coefficients
+
+
+class FuelModel:
+    """Fitted consumption for one bike model or user bike"""
+
+    __slots__ = ('base', 'factors', 'source', 'rides')
+
+    def __init__(self, base, factors, source, rides):
+        self.base = base
+        self.source = source  # 'bike' or 'user_bike'
+        self.rides = rides
+        # (condition, value) -> factor
+        self.factors = {(condition, value): factors[name] for name, condition, value in FUEL_FACTORS}
+
+    def modifier(self, riding_style, road_type, weather=None):
+        """Product of the factors matching the conditions"""
+        return (
+            self.factors.get(('riding_style', riding_style), 1.0)
+            * self.factors.get(('road_type', road_type), 1.0)
+            * self.factors.get(('weather', weather), 1.0)
+        )
+
+    def consumption(self, riding_style, road_type, weather=None):
+        """L/100 km under the given conditions"""
+        return self.base * self.modifier(riding_style, road_type, weather)
+
+    def average_consumption(self):
+        """L/100 km riding moderately, half city and half highway, like the spec average"""
+        return (self.consumption('moderate', 'city') + self.consumption('moderate', 'highway')) / 2
+
+
+class FuelCalibrationService:
+    """Fits fuel coefficients from ride logs and serves them from a process cache"""
+
+    def __init__(self, ttl=CALIBRATION_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._models = None
+        self._loaded_at = 0.0
+
+    def model_for(self, bike_id, user_bike_id=None):
+        """FuelModel for the user bike if fitted, else for the bike model, else None"""
+        by_bike, by_user_bike = self._load()
+        if user_bike_id is not None and user_bike_id in by_user_bike:
+            return by_user_bike[user_bike_id]
+        return by_bike.get(bike_id)
+
+    def invalidate(self):
+        """Reload the coefficients on the next lookup"""
+        with self._lock:
+            self._models = None
+
+    def fit(self):
+        """Refit every calibration from the ride logs, replacing the table
+
+        Returns (bike models, user bikes) fitted. The caller commits, then
+        calls invalidate() if this process serves lookups.
+        """
+        rides = db.session.execute(
+            select(
+                RideLog.user_bike_id, UserBike.bike_id, RideLog.distance, RideLog.fuel_consumed,
+                RideLog.riding_style, RideLog.road_type, RideLog.weather_condition
+            )
+            .join(UserBike, UserBike.id == RideLog.user_bike_id)
+            .where(RideLog.distance > 0, RideLog.fuel_consumed > 0)
+        ).all()
+        db.session.execute(delete(FuelCalibration))
+        if not rides:
+            return 0, 0
+
+        user_bike_ids, bike_ids, distance, fuel, styles, roads, weathers = (np.array(column) for column in zip(*rides))
+        distance = distance.astype(float)
+        consumption = 100 * fuel.astype(float) / distance
+        keep = (consumption >= CONSUMPTION_RANGE[0]) & (consumption <= CONSUMPTION_RANGE[1])
+        if not keep.any():
+            return 0, 0
+
+        conditions = {'riding_style': styles[keep], 'road_type': roads[keep], 'weather': weathers[keep]}
+        design = np.column_stack(
+            [np.ones(keep.sum())] + [conditions[condition] == value for _, condition, value in FUEL_FACTORS]
+        ).astype(float)
+        log_consumption = np.log(consumption[keep])
+        distance = distance[keep]
+        weights = distance / distance.mean()
+        effects_prior = np.log([DEFAULT_FACTORS[name] for name, _, _ in FUEL_FACTORS])
+
+        # Bike models, shrunk toward spec mileage and the fixed multipliers
+        bikes, bike_groups = np.unique(bike_ids[keep], return_inverse=True)
+        bike_prior = np.empty((len(bikes), design.shape[1]))
+        bike_prior[:, 1:] = effects_prior
+        observed = (np.bincount(bike_groups, weights=weights * log_consumption)
+                    / np.bincount(bike_groups, weights=weights))
+        snapshot = catalog_repository.snapshot()
+        for group, bike_id in enumerate(bikes.tolist()):
+            record = snapshot.get(bike_id, include_inactive=True)
+            specs = record.specs if record else None
+            if specs and specs.mileage_city and specs.mileage_highway:
+                # The simulator's base consumption
+                bike_prior[group, 0] = np.log(100 / ((specs.mileage_city + specs.mileage_highway) / 2))
+            else:
+                bike_prior[group, 0] = observed[group]
+        bike_coefficients = _ridge(design, log_consumption, weights, bike_groups, bike_prior)
+
+        # User bikes, shrunk toward their model's fit
+        user_bikes, first, user_groups = np.unique(user_bike_ids[keep], return_index=True, return_inverse=True)
+        user_prior = bike_coefficients[bike_groups[first]]
+        user_coefficients = _ridge(design, log_consumption, weights, user_groups, user_prior)
+
+        fitted_at = datetime.utcnow()
+        written = []
+        for ids, groups, coefficients, owners in (
+            (bikes, bike_groups, bike_coefficients, None),
+            (user_bikes, user_groups, user_coefficients, bikes[bike_groups[first]])
+        ):
+            counts = np.bincount(groups, minlength=len(ids))
+            distances = np.bincount(groups, weights=distance, minlength=len(ids))
+            rows = 0
+            for group in np.flatnonzero(counts >= MIN_RIDES):
+                values = np.exp(coefficients[group])
+                db.session.add(FuelCalibration(
+                    bike_id=int(ids[group] if owners is None else owners[group]),
+                    user_bike_id=None if owners is None else int(ids[group]),
+                    base_consumption=float(values[0]),
+                    ride_count=int(counts[group]),
+                    distance=float(distances[group]),
+                    fitted_at=fitted_at,
+                    **{name: float(value) for (name, _, _), value in zip(FUEL_FACTORS, values[1:])}
+                ))
+                rows += 1
+            written.append(rows)
+        db.session.flush()
+        return tuple(written)
+
+    def _load(self):
+        models = self._models
+        if models is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return models
+        with self._lock:
+            if self._models is None or time.monotonic() - self._loaded_at >= self.ttl:
+                by_bike, by_user_bike = {}, {}
+                for row in db.session.scalars(select(FuelCalibration)):
+                    model = FuelModel(
+                        row.base_consumption,
+                        {name: getattr(row, name) for name, _, _ in FUEL_FACTORS},
+                        'user_bike' if row.user_bike_id else 'bike',
+                        row.ride_count
+                    )
+                    if row.user_bike_id:
+                        by_user_bike[row.user_bike_id] = model
+                    else:
+                        by_bike[row.bike_id] = model
+                self._models = (by_bike, by_user_bike)
+                self._loaded_at = time.monotonic()
+            return self._models
+
+
+def _ridge(design, targets, weights, groups, prior):
+    """Weighted least squares per group, shrunk toward that group's prior row
+
+    Solves (X'WX + lambda I) b = X'Wy + lambda b0 for every group at once;
+    the normal equations are accumulated with bincount over the rides.
+    """
+    n_groups, k = prior.shape
+    gram = np.empty((n_groups, k, k))
+    for i in range(k):
+        for j in range(i, k):
+            gram[:, i, j] = gram[:, j, i] = np.bincount(
+                groups, weights=weights * design[:, i] * design[:, j], minlength=n_groups
+            )
+    moment = np.column_stack([
+        np.bincount(groups, weights=weights * design[:, i] * targets, minlength=n_groups) for i in range(k)
+    ])
+    gram += PRIOR_WEIGHT * np.eye(k)
+    moment += PRIOR_WEIGHT * prior
+    return np.linalg.solve(gram, moment[..., None])[..., 0]
+
+
+fuel_calibration_service = FuelCalibrationService()
@@ -0,0 +1,148 @@
+"""
+Monte Carlo sampling for the performance simulator
+
+Each sample draws a rider weight, an air temperature for the weather, a
+road grip level for the surface and a throttle-use factor for the riding
+style, then evaluates the simulator's formulas on the whole batch with
+NumPy. Samples are generated in fixed-size chunks, each with its own
+child of one SeedSequence, so a seed gives the same samples whether the
+chunks run inline or on a process pool.
+
+The pool is created once per process on first use. Its workers come
+from a forkserver rather than a fork of the app process, so they don't
+inherit the app's database connections, locks or threads.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+CHUNK_SIZE = 100000  # samples per worker task
+MAX_SAMPLES = 1000000
+PERCENTILES = (5, 50, 95)
+METRICS = ('adjusted_acceleration', 'estimated_top_speed', 'fuel_consumption')
+
+RIDER_WEIGHT_SD = 8.0  # kg
+RIDER_WEIGHT_RANGE = (40.0, 200.0)
+# (mean, sd) air temperature in C for each weather; power scales with air density
+WEATHER_TEMPERATURE = {
+    'sunny': (25.0, 5.0),
+    'hot': (38.0, 4.0),
+    'cold': (5.0, 5.0),
+    'rainy': (15.0, 4.0)
+}
+DEFAULT_TEMPERATURE = (20.0, 8.0)
+# (mean, sd) tyre grip coefficient for each road type
+ROAD_GRIP = {
+    'track': (1.0, 0.03),
+    'highway': (0.9, 0.05),
+    'city': (0.85, 0.07)
+}
+DEFAULT_GRIP = (0.85, 0.08)
+WET_GRIP_FACTOR = 0.7
+# Log-normal spread of throttle use around the style's fuel modifier
+STYLE_VARIANCE = {
+    'smooth': 0.05,
+    'moderate': 0.1,
+    'aggressive': 0.15
+}
+DEFAULT_STYLE_VARIANCE = 0.1
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def sample_chunk(params, seed_sequence, size):
+    """Evaluate size samples for one bike and set of conditions
+
+    params holds the bike's specs and the simulator's point modifiers as
+    plain floats (NaN when missing) so chunks can be sent to worker
+    processes. Returns a (len(METRICS), size) array.
+    """
+    rng = np.random.default_rng(seed_sequence)
+
+    rider_weight = np.clip(
+        rng.normal(params['rider_weight'], RIDER_WEIGHT_SD, size), *RIDER_WEIGHT_RANGE
+    )
+    temperature_mean, temperature_sd = params['temperature']
+    temperature = rng.normal(temperature_mean, temperature_sd, size)
+    grip_mean, grip_sd = params['grip']
+    grip = np.clip(rng.normal(grip_mean, grip_sd, size), 0.2 * grip_mean, None)
+    throttle = rng.lognormal(0.0, params['style_variance'], size)
+
+    # Denser (colder) air than the weather's typical temperature makes more power
+    power_modifier = params['power_modifier'] * (temperature_mean + 273.15) / (temperature + 273.15)
+    kerb_weight = params['kerb_weight']
+    total_weight = kerb_weight + rider_weight
+    adjusted_power = params['max_power'] * power_modifier
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Same as PerformanceSimulator._calculate_acceleration, slowed by less grip than usual
+        acceleration = (
+            params['acceleration_0_100'] * (total_weight / kerb_weight) / (adjusted_power / total_weight) * 10
+            * grip_mean / grip
+        )
+        if not params['acceleration_0_100'] > 0:
+            acceleration = np.zeros(size)
+        top_speed = params['top_speed'] * power_modifier
+        fuel_consumption = params['fuel_base'] * params['fuel_modifier'] * throttle
+
+    return np.vstack((acceleration, np.broadcast_to(top_speed, size), fuel_consumption))
+
+
+def run_samples(params, samples, seed, workers=None, progress=None):
+    """All samples as a (len(METRICS), samples) array
+
+    More than one chunk is spread across the shared process pool, sized
+    by workers (default: one per CPU) when it is first created; a single
+    chunk or workers=1 runs inline. progress, if given, is called with
+    the fraction of chunks done after each one.
+    """
+    sizes = [CHUNK_SIZE] * (samples // CHUNK_SIZE)
+    if samples % CHUNK_SIZE:
+        sizes.append(samples % CHUNK_SIZE)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    pool_size = workers or os.cpu_count() or 1
+    chunks = []
+    if min(pool_size, len(sizes)) > 1:
+        for chunk in _get_pool(pool_size).map(sample_chunk, [params] * len(sizes), seeds, sizes):
+            chunks.append(chunk)
+            if progress:
+                progress(len(chunks) / len(sizes))
+    else:
+        for seed_sequence, size in zip(seeds, sizes):
+            chunks.append(sample_chunk(params, seed_sequence, size))
+            if progress:
+                progress(len(chunks) / len(sizes))
+    return np.hstack(chunks)
+
+
+def _get_pool(size):
+    """The process-wide sampling pool, created with size workers on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=size,
+                mp_context=multiprocessing.get_context('forkserver')
+            )
+        return _pool
+
+
+def summarize(values):
+    """p5/p50/p95 and mean of samples, None when the bike lacks the specs"""
+    finite = values[np.isfinite(values)]
+    if not len(finite):
+        return None
+    low, median, high = np.percentile(finite, PERCENTILES)
+    return {
+        'p5': round(float(low), 2),
+        'p50': round(float(median), 2),
+        'p95': round(float(high), 2),
+        'mean': round(float(finite.mean()), 2)
+    }
@@ -1,10 +1,27 @@
 import math
 
+import numpy as np
+
+from app.services import monte_carlo
+from app.services.fuel_calibration import fuel_calibration_service
+from app.services.physics import physics_engine
+
+# Result columns of simulate_grid, one row per bike and condition combination
+GRID_COLUMNS = (
+    'bike_id', 'rider_weight', 'road_type', 'weather', 'riding_style',
+    'adjusted_power', 'adjusted_acceleration', 'estimated_top_speed',
+    'fuel_consumption', 'heat_level', 'brake_wear', 'tyre_wear', 'chain_wear'
+)
+
 class PerformanceSimulator:
     """Simulates bike performance under various conditions"""
     
-    def simulate_performance(self, bike, rider_weight, road_type, weather, riding_style):
-        """Simulate performance based on conditions"""
+    def simulate_performance(self, bike, rider_weight, road_type, weather, riding_style, user_bike_id=None):
+        """Simulate performance based on conditions
+        
+        Fuel use comes from coefficients fitted to the user bike's or the
+        model's ride logs when there are enough, else from the specs.
+        """
         
         if not bike.specs:
             return {'error': 'Bike specifications not available'}
@@ -15,13 +32,14 @@ class PerformanceSimulator:
         base_torque = bike.specs.max_torque
         
         # Apply modifiers
-        power_modifier = self._get_power_modifier(weather, road_type)
+        power_modifier = self.get_power_modifier(weather, road_type)
         style_modifier = self._get_style_modifier(riding_style)
         
         # Calculate adjusted performance
         adjusted_power = base_power * power_modifier
         adjusted_acceleration = self._calculate_acceleration(bike.specs, total_weight, adjusted_power)
-        fuel_consumption = self._calculate_fuel_consumption(bike.specs, riding_style, road_type)
+        fuel_model = fuel_calibration_service.model_for(bike.id, user_bike_id)
+        fuel_consumption = self._calculate_fuel_consumption(bike.specs, riding_style, road_type, weather, fuel_model)
         heat_level = self._calculate_heat_level(riding_style, weather)
         wear_prediction = self._predict_component_wear(riding_style, road_type)
         
@@ -30,10 +48,15 @@ class PerformanceSimulator:
             'adjusted_acceleration': round(adjusted_acceleration, 2),
             'estimated_top_speed': round(bike.specs.top_speed * power_modifier, 2),
             'fuel_consumption': round(fuel_consumption, 2),
+            'fuel_model': {
+                'source': fuel_model.source if fuel_model else 'specs',
+                'rides': fuel_model.rides if fuel_model else 0
+            },
             'heat_level': heat_level,
             'brake_wear': wear_prediction['brake_wear'],
             'tyre_wear': wear_prediction['tyre_wear'],
             'chain_wear': wear_prediction['chain_wear'],
+            'performance_run': physics_engine.simulate(bike, rider_weight, power_modifier),
             'conditions': {
                 'rider_weight': rider_weight,
                 'total_weight': total_weight,
@@ -43,7 +66,147 @@ class PerformanceSimulator:
             }
         }
     
-    def _get_power_modifier(self, weather, road_type):
+    def simulate_grid(self, bikes, rider_weights, road_types, weathers, riding_styles):
+        """Simulate every combination of bikes and conditions at once
+        
+        Modifiers are looked up once per distinct condition value and the
+        formulas of simulate_performance are evaluated over the whole
+        (bike, rider_weight, road_type, weather, riding_style) grid with
+        NumPy broadcasting. Rows come out in that nesting order; values a
+        bike's specs cannot support are None.
+        """
+        specs = [bike.specs for bike in bikes]
+        
+        def column(name):
+            return np.array([np.nan if getattr(s, name) is None else float(getattr(s, name)) for s in specs])
+        
+        # Axes: bike, rider weight, road type, weather, riding style
+        kerb_weight = column('kerb_weight')[:, None, None, None, None]
+        max_power = column('max_power')[:, None, None, None, None]
+        top_speed = column('top_speed')[:, None, None, None, None]
+        acceleration = column('acceleration_0_100')[:, None, None, None, None]
+        with np.errstate(divide='ignore'):
+            fuel_base = 100 / ((column('mileage_city') + column('mileage_highway')) / 2)
+        rider_weight = np.asarray(rider_weights, dtype=float)[None, :, None, None, None]
+        
+        power_modifier = np.array([
+            [self.get_power_modifier(weather, road_type) for weather in weathers] for road_type in road_types
+        ])[None, None, :, :, None]
+        fuel_modifier = np.empty((len(bikes), len(road_types), len(weathers), len(riding_styles)))
+        fuel_modifier[:] = np.array([
+            [self._get_fuel_modifier(style, road_type) for style in riding_styles] for road_type in road_types
+        ])[:, None, :]
+        # Bikes calibrated from ride logs get their own base and factors, which may depend on weather too
+        for position, bike in enumerate(bikes):
+            model = fuel_calibration_service.model_for(bike.id)
+            if model:
+                fuel_base[position] = model.base
+                fuel_modifier[position] = [
+                    [[model.modifier(style, road_type, weather) for style in riding_styles] for weather in weathers]
+                    for road_type in road_types
+                ]
+        fuel_base = fuel_base[:, None, None, None, None]
+        fuel_modifier = fuel_modifier[:, None]
+        heat_level = np.array([
+            [self._calculate_heat_level(style, weather) for style in riding_styles] for weather in weathers
+        ])[None, None, None, :, :]
+        wear = [[self._predict_component_wear(style, road_type) for style in riding_styles] for road_type in road_types]
+        
+        shape = (len(bikes), len(rider_weights), len(road_types), len(weathers), len(riding_styles))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            total_weight = kerb_weight + rider_weight
+            adjusted_power = max_power * power_modifier
+            # Same as _calculate_acceleration: time * weight factor / (power / weight) * 10
+            adjusted_acceleration = np.where(
+                acceleration > 0,
+                acceleration * (total_weight / kerb_weight) / (adjusted_power / total_weight) * 10,
+                0.0
+            )
+            fuel_consumption = fuel_base * fuel_modifier
+            estimated_top_speed = top_speed * power_modifier
+        
+        bike_index, weight_index, road_index, weather_index, style_index = np.indices(shape).reshape(5, -1)
+        columns = {
+            'bike_id': [bikes[i].id for i in bike_index],
+            'rider_weight': [rider_weights[i] for i in weight_index],
+            'road_type': [road_types[i] for i in road_index],
+            'weather': [weathers[i] for i in weather_index],
+            'riding_style': [riding_styles[i] for i in style_index],
+            'adjusted_power': _rounded(adjusted_power, shape),
+            'adjusted_acceleration': _rounded(adjusted_acceleration, shape),
+            'estimated_top_speed': _rounded(estimated_top_speed, shape),
+            'fuel_consumption': _rounded(fuel_consumption, shape),
+            'heat_level': np.broadcast_to(heat_level, shape).ravel().tolist()
+        }
+        for part in ('brake_wear', 'tyre_wear', 'chain_wear'):
+            columns[part] = [wear[r][s][part] for r, s in zip(road_index, style_index)]
+        
+        return {
+            'columns': list(GRID_COLUMNS),
+            'rows': [list(row) for row in zip(*(columns[name] for name in GRID_COLUMNS))]
+        }
+    
+    def simulate_monte_carlo(self, bike, rider_weight, road_type, weather, riding_style,
+                             samples=10000, seed=0, workers=None, progress=None):
+        """Percentiles of performance over randomly varied conditions
+        
+        Rider weight, temperature, road grip and throttle use are sampled
+        around the given conditions; the same seed always gives the same
+        result. Large sample counts are spread over a process pool;
+        progress, if given, is called with the fraction done.
+        """
+        if not bike.specs:
+            return {'error': 'Bike specifications not available'}
+        if not 1 <= samples <= monte_carlo.MAX_SAMPLES:
+            raise ValueError(f'samples must be between 1 and {monte_carlo.MAX_SAMPLES}')
+        
+        specs = bike.specs
+        
+        def number(value):
+            return np.nan if value is None else float(value)
+        
+        fuel_model = fuel_calibration_service.model_for(bike.id)
+        if fuel_model:
+            fuel_base = fuel_model.base
+            fuel_modifier = fuel_model.modifier(riding_style, road_type, weather)
+        else:
+            mileage_avg = (number(specs.mileage_city) + number(specs.mileage_highway)) / 2
+            fuel_base = 100 / mileage_avg if mileage_avg else np.nan
+            fuel_modifier = self._get_fuel_modifier(riding_style, road_type)
+        
+        grip = monte_carlo.ROAD_GRIP.get(road_type, monte_carlo.DEFAULT_GRIP)
+        if weather == 'rainy':
+            grip = (grip[0] * monte_carlo.WET_GRIP_FACTOR, grip[1])
+        params = {
+            'kerb_weight': number(specs.kerb_weight),
+            'max_power': number(specs.max_power),
+            'top_speed': number(specs.top_speed),
+            'acceleration_0_100': number(specs.acceleration_0_100),
+            'fuel_base': fuel_base,
+            'rider_weight': float(rider_weight),
+            'power_modifier': self.get_power_modifier(weather, road_type),
+            'fuel_modifier': fuel_modifier,
+            'temperature': monte_carlo.WEATHER_TEMPERATURE.get(weather, monte_carlo.DEFAULT_TEMPERATURE),
+            'grip': grip,
+            'style_variance': monte_carlo.STYLE_VARIANCE.get(riding_style, monte_carlo.DEFAULT_STYLE_VARIANCE)
+        }
+        values = monte_carlo.run_samples(params, samples, seed, workers, progress)
+        
+        return {
+            'samples': samples,
+            'seed': seed,
+            'percentiles': {
+                name: monte_carlo.summarize(row) for name, row in zip(monte_carlo.METRICS, values)
+            },
+            'conditions': {
+                'rider_weight': rider_weight,
+                'road_type': road_type,
+                'weather': weather,
+                'riding_style': riding_style
+            }
+        }
+    
+    def get_power_modifier(self, weather, road_type):
         """Calculate power modifier based on conditions"""
         modifier = 1.0
         
@@ -81,23 +244,31 @@ class PerformanceSimulator:
         
         return specs.acceleration_0_100 * weight_factor / power_to_weight * 10
     
-    def _calculate_fuel_consumption(self, specs, riding_style, road_type):
+    def _calculate_fuel_consumption(self, specs, riding_style, road_type, weather=None, fuel_model=None):
         """Calculate fuel consumption"""
+        if fuel_model is not None:
+            return fuel_model.consumption(riding_style, road_type, weather)
+        
         base_consumption = 100 / ((specs.mileage_city + specs.mileage_highway) / 2)
+        return base_consumption * self._get_fuel_modifier(riding_style, road_type)
+    
+    def _get_fuel_modifier(self, riding_style, road_type):
+        """Calculate fuel consumption modifier based on conditions"""
+        modifier = 1.0
         
         # Style impact
         if riding_style == 'aggressive':
-            base_consumption *= 1.3
+            modifier *= 1.3
         elif riding_style == 'smooth':
-            base_consumption *= 0.85
+            modifier *= 0.85
         
         # Road type impact
         if road_type == 'city':
-            base_consumption *= 1.2
+            modifier *= 1.2
         elif road_type == 'highway':
-            base_consumption *= 0.9
+            modifier *= 0.9
         
-        return base_consumption
+        return modifier
     
     def _calculate_heat_level(self, riding_style, weather):
         """Calculate engine heat level"""
@@ -141,3 +312,9 @@ class PerformanceSimulator:
             'tyre_wear': f"{round(tyre_wear * 100)}%",
             'chain_wear': f"{round(chain_wear * 100)}%"
         }
+
+
+def _rounded(values, shape):
+    """Flatten a broadcast result to a list rounded to 2 places, None if not finite"""
+    values = np.round(np.broadcast_to(values, shape).ravel(), 2)
+    return [value if math.isfinite(value) else None for value in values.tolist()]
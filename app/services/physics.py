@@ -0,0 +1,176 @@
+"""
+Longitudinal acceleration model
+
+A torque curve is synthesized from the catalog power and torque figures,
+geared through a six-speed box and turned into tractive force against
+road speed. Acceleration runs are integrated over a speed grid:
+dt = m dv / F_net(v), so times and distances are cumulative sums over
+the whole grid instead of a step-by-step loop. The per-bike force curves
+depend only on the specs and are cached per catalog version; a run for
+a given rider mass only redoes the vector arithmetic.
+"""
+
+import numpy as np
+
+from app.services.catalog_repository import catalog_repository
+
+
+GRAVITY = 9.81
+AIR_DENSITY = 1.2  # kg/m^3
+ROLLING_RESISTANCE = 0.02
+DRIVETRAIN_EFFICIENCY = 0.9
+WHEEL_RADIUS = 0.3  # m, 17" sport tyre
+HP_TO_WATTS = 745.7
+MAX_ACCELERATION = 1.0 * GRAVITY  # wheelie / traction limit
+
+GEARS = 6
+FIRST_TO_TOP_RATIO = 2.8  # spread between first and top gear
+DEFAULT_CDA = 0.45  # m^2, bike and tucked rider
+CDA_RANGE = (0.25, 0.8)
+DEFAULT_POWER_RPM = 9000
+DEFAULT_TOP_SPEED = 150  # km/h, only used for gearing when missing
+
+SPEED_STEP = 0.05  # m/s
+QUARTER_MILE = 402.336  # m
+KMH = 1 / 3.6
+
+
+class PowerCurve:
+    """Tractive force against road speed for one bike, independent of rider"""
+
+    def __init__(self, specs):
+        power_w = specs.max_power * HP_TO_WATTS
+        power_rpm = specs.max_power_rpm or DEFAULT_POWER_RPM
+        torque_rpm = specs.max_torque_rpm or 0.8 * power_rpm
+        torque_rpm = min(torque_rpm, power_rpm)
+        peak_power_torque = power_w / (power_rpm * 2 * np.pi / 60)
+        max_torque = max(specs.max_torque or peak_power_torque, peak_power_torque)
+        self.redline = 1.1 * power_rpm
+        self.kerb_weight = specs.kerb_weight
+        self.top_speed = (specs.top_speed or DEFAULT_TOP_SPEED) * KMH
+
+        # Torque rises to its peak, falls to the power-peak torque, then tails off
+        self.rpm = np.array([0.2 * power_rpm, torque_rpm, power_rpm, self.redline])
+        self.torque = np.array([0.6 * max_torque, max_torque, peak_power_torque, 0.85 * peak_power_torque])
+        if torque_rpm == power_rpm:
+            self.rpm, self.torque = self.rpm[[0, 2, 3]], self.torque[[0, 2, 3]]
+
+        # Top gear reaches the power peak at the rated top speed
+        top_ratio = power_rpm * 2 * np.pi / 60 * WHEEL_RADIUS / self.top_speed
+        self.ratios = top_ratio * FIRST_TO_TOP_RATIO ** (np.arange(GEARS - 1, -1, -1) / (GEARS - 1))
+
+        # Drag area that balances rated power at the rated top speed
+        cda = DEFAULT_CDA
+        if specs.top_speed:
+            resistance = ROLLING_RESISTANCE * (self.kerb_weight + 75) * GRAVITY * self.top_speed
+            cda = (power_w * DRIVETRAIN_EFFICIENCY - resistance) / (0.5 * AIR_DENSITY * self.top_speed ** 3)
+            cda = min(max(cda, CDA_RANGE[0]), CDA_RANGE[1])
+        self.cda = cda
+
+        self.speed = np.arange(0, self.top_speed * 1.2, SPEED_STEP)
+        forces = np.stack([self.gear_force(ratio) for ratio in self.ratios])
+        self.best_gear = forces.argmax(axis=0)
+        self.force = forces.max(axis=0)
+        self.top_gear_force = self.gear_force(self.ratios[-1], clutch_slip=False)
+        self.drag = 0.5 * AIR_DENSITY * self.cda * self.speed ** 2
+
+    def gear_force(self, ratio, clutch_slip=True):
+        """Wheel force at each grid speed in one gear; 0 beyond the redline
+
+        With clutch_slip, speeds below the torque peak in this gear are
+        driven with the engine held at the torque peak, as in a launch.
+        """
+        rpm = self.speed * ratio / WHEEL_RADIUS * 60 / (2 * np.pi)
+        engine_rpm = np.maximum(rpm, self.rpm[1]) if clutch_slip else rpm
+        torque = np.interp(engine_rpm, self.rpm, self.torque)
+        force = torque * ratio * DRIVETRAIN_EFFICIENCY / WHEEL_RADIUS
+        force[rpm > self.redline] = 0.0
+        return force
+
+
+class AccelerationRun:
+    """Time and distance against speed for one bike, rider and conditions"""
+
+    def __init__(self, curve, rider_weight, power_modifier=1.0, force=None):
+        self.curve = curve
+        mass = curve.kerb_weight + rider_weight
+        force = curve.force if force is None else force
+        net = force * power_modifier - curve.drag - ROLLING_RESISTANCE * mass * GRAVITY
+        acceleration = np.minimum(net / mass, MAX_ACCELERATION)
+
+        # Stop where the bike can no longer gain speed
+        stalled = np.flatnonzero(acceleration <= 1e-3)
+        end = stalled[0] if len(stalled) else len(acceleration)
+        self.speed = curve.speed[:end]
+        self.acceleration = acceleration[:end]
+
+        # Trapezoidal dt = dv / a between neighbouring grid speeds
+        if len(self.speed) > 1:
+            dt = SPEED_STEP * 0.5 * (1 / self.acceleration[:-1] + 1 / self.acceleration[1:])
+            self.time = np.concatenate(([0.0], np.cumsum(dt)))
+            dx = dt * 0.5 * (self.speed[:-1] + self.speed[1:])
+            self.distance = np.concatenate(([0.0], np.cumsum(dx)))
+        else:
+            self.time = self.distance = np.zeros(len(self.speed))
+
+    @property
+    def top_speed(self):
+        """Highest speed reached, km/h"""
+        return float(self.speed[-1] / KMH) if len(self.speed) else 0.0
+
+    def time_between(self, from_kmh, to_kmh):
+        """Seconds to go from one speed to another, or None if out of reach"""
+        if not len(self.speed) or to_kmh * KMH > self.speed[-1]:
+            return None
+        start, end = np.interp([from_kmh * KMH, to_kmh * KMH], self.speed, self.time)
+        return round(float(end - start), 2)
+
+    def quarter_mile(self):
+        """(elapsed seconds, trap speed km/h), or None if out of reach"""
+        if not len(self.distance) or self.distance[-1] < QUARTER_MILE:
+            return None
+        elapsed = np.interp(QUARTER_MILE, self.distance, self.time)
+        trap = np.interp(QUARTER_MILE, self.distance, self.speed)
+        return round(float(elapsed), 2), round(float(trap / KMH), 1)
+
+    def speed_curve(self, step=0.5, duration=20):
+        """[(seconds, km/h)] sampled every step seconds"""
+        times = np.arange(0, min(duration, self.time[-1]) + 1e-9, step) if len(self.time) else []
+        speeds = np.interp(times, self.time, self.speed) / KMH if len(times) else []
+        return [(round(float(t), 2), round(float(v), 1)) for t, v in zip(times, speeds)]
+
+
+class PhysicsEngine:
+    """Acceleration, quarter-mile and roll-on figures from the longitudinal model"""
+
+    def power_curve(self, bike):
+        """Cached PowerCurve for a catalog bike, or None without the specs it needs"""
+        specs = bike.specs
+        if specs is None or not specs.max_power or not specs.kerb_weight:
+            return None
+        return catalog_repository.derived(f'power_curve:{bike.id}', lambda snapshot: PowerCurve(specs))
+
+    def simulate(self, bike, rider_weight=75, power_modifier=1.0, curve_step=0.5):
+        """Run a full-throttle launch and a top-gear roll-on"""
+        curve = self.power_curve(bike)
+        if curve is None:
+            return None
+
+        launch = AccelerationRun(curve, rider_weight, power_modifier)
+        roll_on = AccelerationRun(curve, rider_weight, power_modifier, force=curve.top_gear_force)
+        quarter_mile = launch.quarter_mile()
+
+        return {
+            'zero_to_60': launch.time_between(0, 60),
+            'zero_to_100': launch.time_between(0, 100),
+            'quarter_mile_time': quarter_mile[0] if quarter_mile else None,
+            'quarter_mile_trap_speed': quarter_mile[1] if quarter_mile else None,
+            'roll_on_60_100_top_gear': roll_on.time_between(60, 100),
+            'roll_on_80_120_top_gear': roll_on.time_between(80, 120),
+            'top_speed': round(launch.top_speed, 1),
+            'drag_area': round(curve.cda, 3),
+            'speed_curve': launch.speed_curve(step=curve_step)
+        }
+
+
+physics_engine = PhysicsEngine()
@@ -0,0 +1,116 @@
+import numpy as np
+from sqlalchemy import select
+
+from app import db
+from app.models.bike_rating_summary import BikeRatingSummary
+from app.services.catalog_repository import catalog_repository
+from app.services.spec_matrix import get_spec_matrix, smallest
+
+
+# Scored components and their default weights
+RANKING_COMPONENTS = {
+    'performance': 1.0,
+    'economy': 1.0,
+    'comfort': 1.0,
+    'price': 1.0,
+    'rating': 1.0
+}
+
+
+class RankingFeatures:
+    """Per-bike component scores in 0-1, higher is better
+
+    Spec-based components are min-max scaled over the active catalog
+    once per catalog version; a missing value scores 0 on its component.
+    Ratings change without a catalog write, so they are read per query.
+    """
+
+    def __init__(self, matrix):
+        self.version = matrix.version
+        self.matrix = matrix
+        self.positions = {int(bike_id): position for position, bike_id in enumerate(matrix.ids)}
+
+        self.components = {
+            'performance': _scaled(matrix.column('performance_score')),
+            'economy': _scaled(matrix.column('mileage_avg')),
+            # Lower seats and lighter bikes are easier to live with
+            'comfort': (_scaled(matrix.column('seat_height'), invert=True)
+                        + _scaled(matrix.column('kerb_weight'), invert=True)) / 2,
+            'price': _scaled(matrix.column('price'), invert=True)
+        }
+
+    def ratings(self):
+        """Average rating / 5 per bike, 0 for unreviewed bikes"""
+        ratings = np.zeros(len(self.matrix))
+        rows = db.session.execute(select(
+            BikeRatingSummary.bike_id, BikeRatingSummary.rating_sum, BikeRatingSummary.review_count
+        ).where(BikeRatingSummary.review_count > 0))
+        for bike_id, rating_sum, review_count in rows:
+            position = self.positions.get(bike_id)
+            if position is not None:
+                ratings[position] = rating_sum / review_count / 5
+        return ratings
+
+    def rank(self, weights=None, k=10, mask=None):
+        """Top k (BikeRecord, score, components) by weighted score, best first
+
+        weights maps component name to a non-negative weight; components
+        left out keep their default weight. Scores are the weighted mean of
+        the components, so they stay in 0-1 whatever the weights.
+        """
+        resolved = resolve_weights(weights)
+        components = dict(self.components)
+        if resolved['rating'] > 0:
+            components['rating'] = self.ratings()
+
+        total = sum(resolved.values())
+        scores = np.zeros(len(self.matrix))
+        for name, weight in resolved.items():
+            if weight > 0:
+                scores += weight * components[name]
+        scores /= total
+
+        candidates = np.arange(len(scores)) if mask is None else np.flatnonzero(mask)
+        top = candidates[smallest(-scores[candidates], k)]
+        return [
+            (
+                self.matrix.records[position],
+                float(scores[position]),
+                {name: round(float(values[position]), 4) for name, values in components.items()}
+            )
+            for position in top
+        ]
+
+
+def resolve_weights(weights=None):
+    """Full weight map with defaults; raises ValueError on bad weights"""
+    resolved = dict(RANKING_COMPONENTS)
+    for name, weight in (weights or {}).items():
+        if name not in resolved:
+            raise ValueError(f"Unknown ranking component: {name}")
+        weight = float(weight)
+        if not np.isfinite(weight) or weight < 0:
+            raise ValueError(f"Weight for {name} must be a non-negative number")
+        resolved[name] = weight
+    if not any(resolved.values()):
+        raise ValueError('At least one weight must be positive')
+    return resolved
+
+
+def get_ranking_features():
+    """Ranking features for the current catalog version"""
+    return catalog_repository.derived('ranking_features', lambda snapshot: RankingFeatures(get_spec_matrix()))
+
+
+def _scaled(values, invert=False):
+    """Min-max scale to 0-1 (1 best); missing values score 0"""
+    scaled = np.zeros(len(values))
+    present = ~np.isnan(values)
+    if present.any():
+        low, high = values[present].min(), values[present].max()
+        if high > low:
+            fraction = (values[present] - low) / (high - low)
+            scaled[present] = 1 - fraction if invert else fraction
+        else:
+            scaled[present] = 1.0
+    return scaled
@@ -0,0 +1,98 @@
+import json
+
+from app import db
+from app.models.bike_rating_summary import BikeRatingSummary, RATING_CATEGORIES, RECENT_REVIEWS
+from app.models.reviews import Review
+
+
+class RatingSummaryService:
+    """Keeps bike_rating_summary in step with verified reviews
+
+    record_review and retract_review only change the session; callers
+    commit them together with the review change itself.
+    """
+
+    def record_review(self, review):
+        """Count a newly verified review"""
+        if review.id is None:
+            db.session.flush()
+        summary = self._locked_summary(review.bike_id)
+        self._apply(summary, review, 1)
+        recent = [review.id] + [rid for rid in summary.recent_ids if rid != review.id]
+        summary.recent_review_ids = json.dumps(recent[:RECENT_REVIEWS])
+        return summary
+
+    def retract_review(self, review):
+        """Stop counting a review that is unverified or about to be deleted"""
+        summary = self._locked_summary(review.bike_id)
+        self._apply(summary, review, -1)
+        if review.id in summary.recent_ids:
+            summary.recent_review_ids = json.dumps(self._recent_ids(review.bike_id, exclude=review.id))
+        return summary
+
+    def rebuild(self, bike_id=None):
+        """Recompute summaries from the reviews table; returns rows written"""
+        query = Review.query.filter_by(is_verified=True)
+        existing = BikeRatingSummary.query
+        if bike_id is not None:
+            query = query.filter_by(bike_id=bike_id)
+            existing = existing.filter_by(bike_id=bike_id)
+
+        summaries = {}
+        for summary in existing.all():
+            summaries[summary.bike_id] = self._reset(summary)
+
+        recent = {}
+        for review in query.order_by(Review.created_at.asc(), Review.id.asc()).yield_per(500):
+            summary = summaries.get(review.bike_id)
+            if summary is None:
+                summary = summaries[review.bike_id] = self._reset(BikeRatingSummary(bike_id=review.bike_id))
+                db.session.add(summary)
+            self._apply(summary, review, 1)
+            ids = recent.setdefault(review.bike_id, [])
+            ids.insert(0, review.id)
+            del ids[RECENT_REVIEWS:]
+
+        for summary in summaries.values():
+            summary.recent_review_ids = json.dumps(recent.get(summary.bike_id, []))
+        return len(summaries)
+
+    def _locked_summary(self, bike_id):
+        summary = BikeRatingSummary.query.filter_by(bike_id=bike_id).with_for_update().first()
+        if summary is None:
+            summary = self._reset(BikeRatingSummary(bike_id=bike_id))
+            db.session.add(summary)
+        return summary
+
+    def _reset(self, summary):
+        summary.review_count = 0
+        summary.rating_sum = 0
+        summary.recent_review_ids = '[]'
+        for category in RATING_CATEGORIES:
+            setattr(summary, f'{category}_sum', 0)
+            setattr(summary, f'{category}_count', 0)
+        for stars in range(1, 6):
+            setattr(summary, f'rating_{stars}', 0)
+        return summary
+
+    def _apply(self, summary, review, sign):
+        summary.review_count += sign
+        summary.rating_sum += sign * review.rating
+        if 1 <= review.rating <= 5:
+            column = f'rating_{review.rating}'
+            setattr(summary, column, getattr(summary, column) + sign)
+        for category in RATING_CATEGORIES:
+            value = getattr(review, f'{category}_rating')
+            if value is not None:
+                setattr(summary, f'{category}_sum', getattr(summary, f'{category}_sum') + sign * value)
+                setattr(summary, f'{category}_count', getattr(summary, f'{category}_count') + sign)
+
+    def _recent_ids(self, bike_id, exclude=None):
+        query = db.session.query(Review.id).filter_by(bike_id=bike_id, is_verified=True)
+        if exclude is not None:
+            query = query.filter(Review.id != exclude)
+        rows = query.order_by(Review.created_at.desc(), Review.id.desc()).limit(RECENT_REVIEWS).all()
+        return [row.id for row in rows]
+
+
+rating_summary_service = RatingSummaryService()
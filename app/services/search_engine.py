@@ -0,0 +1,223 @@
+import math
+import re
+import threading
+
+
+# Relative importance of each field when ranking matches
+FIELD_WEIGHTS = {
+    'model': 3.0,
+    'brand': 2.5,
+    'category': 1.5,
+    'year': 1.0,
+    'engine_type': 0.5,
+    'fuel_system': 0.5,
+    'front_brake': 0.4,
+    'rear_brake': 0.4,
+    'front_tyre': 0.4,
+    'rear_tyre': 0.4
+}
+
+SPEC_SEARCH_FIELDS = (
+    'engine_type', 'fuel_system', 'front_brake', 'rear_brake', 'front_tyre', 'rear_tyre'
+)
+
+EXACT_QUALITY = 1.0
+PREFIX_QUALITY = 0.75
+FUZZY_PENALTY = 0.25  # per edit
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+class BikeSearchEngine:
+    """Token and trigram inverted index over the bike catalog
+
+    The index is built from a CatalogSnapshot and kept in step with it:
+    when the catalog version changes only the bikes whose records differ
+    are re-indexed.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.version = None
+        self._records = {}      # bike_id -> BikeRecord currently indexed
+        self._doc_terms = {}    # bike_id -> {term: weight}
+        self._postings = {}     # term -> {bike_id: weight}
+        self._trigrams = {}     # trigram -> set(term)
+
+    def search(self, snapshot, query, limit=20):
+        """Search active bikes, best match first
+
+        Returns a list of (BikeRecord, score) tuples.
+        """
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            self.refresh(snapshot)
+            scores = {}
+            hits = {}
+            doc_count = max(len(self._doc_terms), 1)
+
+            for position, token in enumerate(query_tokens):
+                allow_prefix = position == len(query_tokens) - 1
+                best = {}
+                for term, quality in self._expand(token, allow_prefix):
+                    postings = self._postings[term]
+                    idf = math.log(1 + doc_count / len(postings))
+                    for bike_id, weight in postings.items():
+                        value = quality * weight * idf
+                        if value > best.get(bike_id, 0):
+                            best[bike_id] = value
+
+                for bike_id, value in best.items():
+                    scores[bike_id] = scores.get(bike_id, 0) + value
+                    hits[bike_id] = hits.get(bike_id, 0) + 1
+
+            # Favour bikes that match every query token
+            results = []
+            for bike_id, score in scores.items():
+                coverage = hits[bike_id] / len(query_tokens)
+                results.append((self._records[bike_id], round(score * coverage * coverage, 4)))
+
+        results.sort(key=lambda item: (-item[1], item[0].brand, item[0].model))
+        return results[:limit]
+
+    def refresh(self, snapshot):
+        """Bring the index up to date with snapshot"""
+        with self._lock:
+            if self.version == snapshot.version:
+                return
+
+            current = {bike.id: bike for bike in snapshot.bikes}
+            for bike_id in list(self._records):
+                if current.get(bike_id) != self._records[bike_id]:
+                    self._remove(bike_id)
+
+            for bike_id, record in current.items():
+                if bike_id not in self._records:
+                    self._add(record)
+
+            self.version = snapshot.version
+
+    def _add(self, record):
+        terms = {}
+        for field, text in _document_fields(record):
+            weight = FIELD_WEIGHTS[field]
+            for term in _index_terms(text):
+                if weight > terms.get(term, 0):
+                    terms[term] = weight
+
+        for term, weight in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                for trigram in _trigrams(term):
+                    self._trigrams.setdefault(trigram, set()).add(term)
+            postings[record.id] = weight
+
+        self._records[record.id] = record
+        self._doc_terms[record.id] = terms
+
+    def _remove(self, bike_id):
+        for term in self._doc_terms.pop(bike_id, {}):
+            postings = self._postings[term]
+            postings.pop(bike_id, None)
+            if not postings:
+                del self._postings[term]
+                for trigram in _trigrams(term):
+                    terms = self._trigrams.get(trigram)
+                    if terms is not None:
+                        terms.discard(term)
+                        if not terms:
+                            del self._trigrams[trigram]
+        self._records.pop(bike_id, None)
+
+    def _expand(self, token, allow_prefix):
+        """Find indexed terms matching token exactly, by prefix or fuzzily"""
+        matches = {}
+        if token in self._postings:
+            matches[token] = EXACT_QUALITY
+
+        max_edits = _max_edits(token)
+        candidates = {}
+        for trigram in _trigrams(token):
+            for term in self._trigrams.get(trigram, ()):
+                candidates[term] = candidates.get(term, 0) + 1
+
+        for term in candidates:
+            if term in matches:
+                continue
+            if allow_prefix and len(token) >= 2 and term.startswith(token):
+                matches[term] = PREFIX_QUALITY
+            elif max_edits and abs(len(term) - len(token)) <= max_edits:
+                edits = _edit_distance(token, term, max_edits)
+                if edits <= max_edits:
+                    matches[term] = EXACT_QUALITY - FUZZY_PENALTY * edits
+
+        return matches.items()
+
+
+def tokenize(text):
+    """Split text into normalized search tokens"""
+    if not text:
+        return []
+    tokens = []
+    for token in _TOKEN_RE.findall(str(text).lower()):
+        # "4oo" -> "400": letter o typed for zero inside numbers
+        if any(char.isdigit() for char in token):
+            token = token.replace('o', '0')
+        tokens.append(token)
+    return tokens
+
+
+def _document_fields(record):
+    yield 'brand', record.brand
+    yield 'model', record.model
+    yield 'category', record.category
+    yield 'year', record.year
+    if record.specs:
+        for field in SPEC_SEARCH_FIELDS:
+            yield field, getattr(record.specs, field)
+
+
+def _index_terms(text):
+    """Tokens plus joined neighbours, so "zx6r" matches "ZX-6R" """
+    tokens = tokenize(text)
+    terms = set(tokens)
+    for left, right in zip(tokens, tokens[1:]):
+        terms.add(left + right)
+    return terms
+
+
+def _trigrams(term):
+    padded = f'  {term} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _max_edits(token):
+    if len(token) <= 3:
+        return 0
+    if len(token) <= 6:
+        return 1
+    return 2
+
+
+def _edit_distance(a, b, limit):
+    """Damerau-Levenshtein (optimal string alignment) distance, capped at limit + 1"""
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+search_engine = BikeSearchEngine()
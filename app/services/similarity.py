@@ -0,0 +1,138 @@
+import numpy as np
+
+from app.services.catalog_repository import catalog_repository
+from app.services.spec_matrix import get_spec_matrix, resolve_column, smallest, UnknownColumn
+
+
+# Matrix columns compared and their default weights
+SIMILARITY_FEATURES = {
+    'max_power': 1.0,
+    'max_torque': 1.0,
+    'kerb_weight': 1.0,
+    'engine_cc': 1.0,
+    'price': 1.0,
+    'seat_height': 0.5,
+    'mileage_avg': 0.5
+}
+
+# Right-skewed features compared on a log scale, so 150 vs 200cc counts
+# for about as much as 600 vs 800cc
+LOG_FEATURES = ('max_power', 'max_torque', 'engine_cc', 'price')
+
+PRECOMPUTED_NEIGHBOURS = 20
+BLOCK_SIZE = 512  # rows per block when building the neighbour table
+
+
+class SimilarityIndex:
+    """Nearest-neighbour lookups over standardized spec vectors
+
+    Each active bike is a vector of z-scored features (missing values sit
+    at the catalog mean). Distances are weighted Euclidean. The top
+    PRECOMPUTED_NEIGHBOURS under the default weights are computed once
+    per catalog version; custom weights cost one O(n) pass per lookup.
+    """
+
+    def __init__(self, matrix):
+        self.version = matrix.version
+        self.records = matrix.records
+        self.features = tuple(SIMILARITY_FEATURES)
+        self.positions = {int(bike_id): position for position, bike_id in enumerate(matrix.ids)}
+
+        vectors = np.empty((len(matrix), len(self.features)))
+        for column, name in enumerate(self.features):
+            vectors[:, column] = self._feature(matrix, name)
+
+        # Standardize; all-missing or constant features contribute nothing
+        with np.errstate(invalid='ignore'):
+            mean = np.nanmean(vectors, axis=0) if len(vectors) else 0
+            std = np.nanstd(vectors, axis=0) if len(vectors) else 1
+        mean = np.nan_to_num(mean)
+        std = np.where(np.isfinite(std) & (std > 0), std, 1.0)
+        vectors = (vectors - mean) / std
+        vectors[np.isnan(vectors)] = 0.0
+        self.vectors = vectors
+
+        self.default_weights = self.weight_vector()
+        self._neighbours, self._distances = self._build_table(self.default_weights)
+
+    def weight_vector(self, weights=None):
+        """Per-feature weights, with overrides by feature name or alias"""
+        resolved = dict(SIMILARITY_FEATURES)
+        for name, weight in (weights or {}).items():
+            column = resolve_column(name)
+            if column not in resolved:
+                raise UnknownColumn(f'Not a similarity feature: {name}')
+            resolved[column] = max(float(weight), 0.0)
+        return np.array([resolved[name] for name in self.features])
+
+    def similar(self, bike_id, k=10, weights=None):
+        """Up to k (BikeRecord, distance) pairs closest to bike_id, nearest first
+
+        Returns None when bike_id is not an active catalog bike.
+        """
+        position = self.positions.get(bike_id)
+        if position is None:
+            return None
+
+        if weights is None and k <= PRECOMPUTED_NEIGHBOURS:
+            neighbours = self._neighbours[position][:k]
+            distances = self._distances[position][:k]
+        else:
+            weight_vector = self.default_weights if weights is None else self.weight_vector(weights)
+            distances = self._distances_from(position, weight_vector)
+            distances[position] = np.inf
+            neighbours = smallest(distances, k)
+            distances = distances[neighbours]
+
+        return [
+            (self.records[neighbour], float(distance))
+            for neighbour, distance in zip(neighbours, distances)
+            if np.isfinite(distance)
+        ]
+
+    def _feature(self, matrix, name):
+        values = matrix.column(name).copy()
+        if name in LOG_FEATURES:
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values = np.log1p(np.where(values >= 0, values, np.nan))
+        return values
+
+    def _distances_from(self, position, weight_vector):
+        diff = self.vectors - self.vectors[position]
+        return np.sqrt((diff * diff) @ weight_vector)
+
+    def _build_table(self, weight_vector):
+        """Top neighbours of every bike, computed block by block"""
+        n = len(self.vectors)
+        k = min(PRECOMPUTED_NEIGHBOURS, max(n - 1, 0))
+        neighbours = np.zeros((n, k), dtype=np.int64)
+        distances = np.zeros((n, k))
+        if k == 0:
+            return neighbours, distances
+
+        scaled = self.vectors * np.sqrt(weight_vector)
+        squared_norms = (scaled * scaled).sum(axis=1)
+        for start in range(0, n, BLOCK_SIZE):
+            block = scaled[start:start + BLOCK_SIZE]
+            squared = squared_norms[start:start + BLOCK_SIZE, None] + squared_norms[None, :] - 2 * block @ scaled.T
+            np.maximum(squared, 0, out=squared)
+            rows = np.arange(len(block))
+            squared[rows, rows + start] = np.inf
+
+            for row in rows:
+                nearest = smallest(squared[row], k)
+                neighbours[start + row] = nearest
+                distances[start + row] = np.sqrt(squared[row, nearest])
+
+        return neighbours, distances
+
+
+def get_similarity_index():
+    """Similarity index for the current catalog version"""
+    return catalog_repository.derived('similarity_index', lambda snapshot: SimilarityIndex(get_spec_matrix()))
+
+
+def similarity_score(distance):
+    """Map a distance to a 0-1 score, 1 being identical"""
+    return 1 / (1 + distance)
+
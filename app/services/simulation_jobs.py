@@ -0,0 +1,317 @@
+"""
+Background simulation jobs
+
+Heavy simulations are submitted as rows in simulation_jobs and run on a
+thread pool outside the request. All job state lives in the database:
+a worker claims a queued job with a conditional UPDATE, so a job runs
+once even with several app processes, and writes its progress and
+result back to the row. A watcher thread in each process requeues
+running jobs whose heartbeat has gone stale (their worker died) and
+picks up every queued job, at startup and every RECOVERY_INTERVAL.
+"""
+
+import json
+import secrets
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from app import db
+from app.models.simulation_jobs import ACTIVE_STATUSES, JOB_KINDS, SimulationJob
+from app.models.user import User
+from app.services import monte_carlo
+from app.services.catalog_repository import catalog_repository
+from app.services.performance_simulator import GRID_COLUMNS, PerformanceSimulator
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_USER_LIMIT = 2  # queued or running jobs per user
+MAX_JOB_GRID_ROWS = 250000
+GRID_BATCH_BIKES = 10  # bikes per simulate_grid call, one progress step each
+PROGRESS_INTERVAL = 0.5  # seconds between progress writes
+STALE_AFTER = timedelta(minutes=5)
+RECOVERY_INTERVAL = 60  # seconds between the watcher's recovery scans
+
+
+class JobLimitExceeded(Exception):
+    """Raised when a user already has the maximum number of active jobs"""
+
+
+class JobCancelled(Exception):
+    """Raised inside a running job once its row is no longer running"""
+
+
+def parse_job_params(kind, data):
+    """Validated, JSON-ready parameters for a job; raises ValueError
+
+    A Monte Carlo job without a seed gets a random one here, so the stored
+    parameters always reproduce the run.
+    """
+    if kind not in JOB_KINDS:
+        raise ValueError(f"kind must be one of: {', '.join(JOB_KINDS)}")
+
+    try:
+        if kind == 'monte_carlo':
+            params = {
+                'bike_id': int(data['bike_id']),
+                'rider_weight': float(data.get('rider_weight', 70)),
+                'road_type': str(data.get('road_type', 'city')),
+                'weather': str(data.get('weather', 'sunny')),
+                'riding_style': str(data.get('riding_style', 'moderate')),
+                'samples': int(data.get('samples', 10000)),
+                'seed': int(data['seed']) if data.get('seed') is not None else secrets.randbits(32)
+            }
+        else:
+            bike_ids = data.get('bike_ids')
+            params = {
+                # None means every active bike with specs
+                'bike_ids': None if bike_ids is None else [int(bike_id) for bike_id in bike_ids],
+                'rider_weights': [float(weight) for weight in data.get('rider_weights', [70])],
+                'road_types': [str(value) for value in data.get('road_types', ['city'])],
+                'weathers': [str(value) for value in data.get('weathers', ['sunny'])],
+                'riding_styles': [str(value) for value in data.get('riding_styles', ['moderate'])]
+            }
+    except KeyError as e:
+        raise ValueError(f'Missing parameter: {e.args[0]}')
+    except TypeError:
+        raise ValueError('Parameters must be numbers, strings or lists of them')
+
+    if kind == 'monte_carlo':
+        if not 1 <= params['samples'] <= monte_carlo.MAX_SAMPLES:
+            raise ValueError(f'samples must be between 1 and {monte_carlo.MAX_SAMPLES}')
+        if params['seed'] < 0:
+            raise ValueError('seed must be non-negative')
+    else:
+        conditions = [params[name] for name in ('rider_weights', 'road_types', 'weathers', 'riding_styles')]
+        if params['bike_ids'] == [] or not all(conditions):
+            raise ValueError('bike_ids and every condition list must be non-empty')
+        if params['bike_ids'] is not None:
+            combinations = len(params['bike_ids'])
+            for values in conditions:
+                combinations *= len(values)
+            if combinations > MAX_JOB_GRID_ROWS:
+                raise ValueError(f'Grid too large; at most {MAX_JOB_GRID_ROWS} combinations per job')
+    return params
+
+
+class SimulationJobQueue:
+    """Submits, runs and tracks simulation jobs
+
+    workers is the size of the thread pool; 0 runs each job inline in
+    submit(), for tests and debugging, and starts no watcher.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._workers = DEFAULT_WORKERS
+        self._watcher = None
+        self._pending = set()  # job ids handed to the pool and not yet finished
+
+    def init_app(self, app):
+        self._workers = app.config.get('SIMULATION_JOB_WORKERS', DEFAULT_WORKERS)
+        app.config.setdefault('SIMULATION_JOB_LIMIT', DEFAULT_USER_LIMIT)
+        if self._workers:
+            with self._lock:
+                if self._watcher is None:
+                    self._watcher = threading.Thread(
+                        target=self._watch, args=(app,), name='simulation-job-watcher', daemon=True
+                    )
+                    self._watcher.start()
+
+    def submit(self, app, user_id, kind, params, limit=DEFAULT_USER_LIMIT):
+        """Store a queued job and hand it to the pool; returns the job
+
+        Raises JobLimitExceeded when the user already has limit active jobs.
+        """
+        # Lock the user's row so concurrent submits can't both pass the limit
+        db.session.execute(select(User.id).where(User.id == user_id).with_for_update())
+        active = SimulationJob.query.filter(
+            SimulationJob.user_id == user_id, SimulationJob.status.in_(ACTIVE_STATUSES)
+        ).count()
+        if active >= limit:
+            db.session.rollback()
+            raise JobLimitExceeded(f'At most {limit} simulation jobs may be queued or running at once')
+
+        job = SimulationJob(id=uuid.uuid4().hex, user_id=user_id, kind=kind, params=json.dumps(params))
+        db.session.add(job)
+        db.session.commit()
+
+        self._dispatch(app, job.id)
+        return job
+
+    def cancel(self, job):
+        """Cancel a queued or running job; a running job stops at its next progress step"""
+        cancelled = db.session.execute(
+            update(SimulationJob)
+            .where(SimulationJob.id == job.id, SimulationJob.status.in_(ACTIVE_STATUSES))
+            .values(status='cancelled', finished_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        return bool(cancelled)
+
+    def recover(self, app):
+        """Requeue jobs abandoned by a dead worker and dispatch queued jobs"""
+        db.session.execute(
+            update(SimulationJob)
+            .where(SimulationJob.status == 'running', SimulationJob.heartbeat_at < datetime.utcnow() - STALE_AFTER)
+            .values(status='queued', progress=0.0, started_at=None)
+        )
+        db.session.commit()
+        queued = db.session.scalars(
+            select(SimulationJob.id).where(SimulationJob.status == 'queued').order_by(SimulationJob.created_at)
+        ).all()
+        for job_id in queued:
+            self._dispatch(app, job_id)
+
+    def run(self, app, job_id):
+        """Claim and run one queued job in its own app context"""
+        try:
+            self._run(app, job_id)
+        finally:
+            with self._lock:
+                self._pending.discard(job_id)
+
+    def _run(self, app, job_id):
+        with app.app_context():
+            now = datetime.utcnow()
+            claimed = db.session.execute(
+                update(SimulationJob)
+                .where(SimulationJob.id == job_id, SimulationJob.status == 'queued')
+                .values(status='running', started_at=now, heartbeat_at=now, progress=0.0)
+            ).rowcount
+            db.session.commit()
+            if not claimed:
+                return
+
+            job = db.session.get(SimulationJob, job_id)
+            kind, params = job.kind, job.params_data
+            db.session.rollback()
+
+            try:
+                result = _JOB_RUNNERS[kind](params, _ProgressReporter(job_id))
+                self._finish(job_id, status='completed', progress=1.0, result=json.dumps(result))
+            except JobCancelled:
+                db.session.rollback()
+            except Exception as e:
+                db.session.rollback()
+                self._finish(job_id, status='failed', error=str(e))
+
+    def _finish(self, job_id, **values):
+        db.session.execute(
+            update(SimulationJob)
+            .where(SimulationJob.id == job_id, SimulationJob.status == 'running')
+            .values(finished_at=datetime.utcnow(), heartbeat_at=datetime.utcnow(), **values)
+        )
+        db.session.commit()
+
+    def _watch(self, app):
+        while True:
+            with app.app_context():
+                try:
+                    self.recover(app)
+                except Exception as e:
+                    db.session.rollback()
+                    app.logger.warning(f'Simulation job recovery failed: {e}')
+                finally:
+                    db.session.remove()
+            time.sleep(RECOVERY_INTERVAL)
+
+    def _dispatch(self, app, job_id):
+        if not self._workers:
+            self.run(app, job_id)
+            return
+        with self._lock:
+            # A queued job is only handed to the pool once per process
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='simulation-job')
+        self._executor.submit(self.run, app, job_id)
+
+
+class _ProgressReporter:
+    """Writes a running job's progress and heartbeat, at most every PROGRESS_INTERVAL
+
+    Raises JobCancelled once the job's row is no longer running.
+    """
+
+    def __init__(self, job_id):
+        self.job_id = job_id
+        self.written_at = 0.0
+
+    def __call__(self, fraction):
+        if time.monotonic() - self.written_at < PROGRESS_INTERVAL:
+            return
+        self.written_at = time.monotonic()
+        running = db.session.execute(
+            update(SimulationJob)
+            .where(SimulationJob.id == self.job_id, SimulationJob.status == 'running')
+            .values(progress=min(max(fraction, 0.0), 1.0), heartbeat_at=datetime.utcnow())
+        ).rowcount
+        db.session.commit()
+        if not running:
+            raise JobCancelled(self.job_id)
+
+
+def _run_monte_carlo(params, progress):
+    bike = catalog_repository.snapshot().get(params['bike_id'])
+    if bike is None:
+        raise ValueError('Bike not found')
+    results = PerformanceSimulator().simulate_monte_carlo(
+        bike, params['rider_weight'], params['road_type'], params['weather'], params['riding_style'],
+        samples=params['samples'], seed=params['seed'],
+        workers=current_app.config.get('SIMULATION_WORKERS'), progress=progress
+    )
+    if 'error' in results:
+        raise ValueError(results['error'])
+    return results
+
+
+def _run_grid(params, progress):
+    snapshot = catalog_repository.snapshot()
+    errors = {}
+    if params['bike_ids'] is None:
+        bikes = [bike for bike in snapshot.bikes if bike.specs]
+    else:
+        bikes = []
+        for bike_id in dict.fromkeys(params['bike_ids']):
+            bike = snapshot.get(bike_id)
+            if bike is None:
+                errors[str(bike_id)] = 'Bike not found'
+            elif not bike.specs:
+                errors[str(bike_id)] = 'Bike specifications not available'
+            else:
+                bikes.append(bike)
+
+    conditions = [params[name] for name in ('rider_weights', 'road_types', 'weathers', 'riding_styles')]
+    combinations = len(bikes)
+    for values in conditions:
+        combinations *= len(values)
+    if combinations > MAX_JOB_GRID_ROWS:
+        raise ValueError(f'Grid too large; at most {MAX_JOB_GRID_ROWS} combinations per job')
+
+    simulator = PerformanceSimulator()
+    columns, rows = list(GRID_COLUMNS), []
+    for start in range(0, len(bikes), GRID_BATCH_BIKES):
+        # Rows are bike-major, so batches of bikes concatenate in order
+        table = simulator.simulate_grid(bikes[start:start + GRID_BATCH_BIKES], *conditions)
+        rows.extend(table['rows'])
+        progress((start + GRID_BATCH_BIKES) / len(bikes))
+
+    return {'count': len(rows), 'columns': columns, 'rows': rows, 'errors': errors}
+
+
+_JOB_RUNNERS = {
+    'monte_carlo': _run_monte_carlo,
+    'grid': _run_grid
+}
+
+
+simulation_jobs = SimulationJobQueue()
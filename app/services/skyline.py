@@ -0,0 +1,113 @@
+import copy
+import functools
+
+import numpy as np
+
+from app.services.catalog_repository import catalog_repository
+from app.services.spec_matrix import get_spec_matrix, resolve_column
+
+
+DIRECTIONS = ('min', 'max')
+DEFAULT_AXES = (('price', 'min'), ('max_power', 'max'), ('kerb_weight', 'min'))
+MAX_AXES = 5
+SKYLINE_CACHE_SIZE = 64  # axis sets kept across catalog versions
+
+
+def parse_axes(raw):
+    """Parse 'price:min,power:max' into ((column, direction), ...)
+
+    Raises UnknownColumn for an unknown attribute and ValueError for a
+    bad direction or axis count.
+    """
+    if not raw:
+        return DEFAULT_AXES
+
+    axes = []
+    for part in raw.split(','):
+        name, _, direction = part.strip().partition(':')
+        direction = (direction or 'min').lower()
+        if direction not in DIRECTIONS:
+            raise ValueError(f'Direction must be min or max: {part}')
+        column = resolve_column(name.strip())
+        if column in (axis[0] for axis in axes):
+            raise ValueError(f'Axis listed twice: {name}')
+        axes.append((column, direction))
+
+    if not 2 <= len(axes) <= MAX_AXES:
+        raise ValueError(f'Between 2 and {MAX_AXES} axes are required')
+    return tuple(axes)
+
+
+def pareto_frontier(costs):
+    """Positions of the non-dominated rows of costs, lower being better
+
+    Sort-filter skyline: rows are visited in order of their summed,
+    range-normalized costs. A row can only be dominated by one with a
+    strictly smaller sum, so each row is checked against the frontier
+    found so far rather than against every other row.
+    """
+    if len(costs) == 0:
+        return np.array([], dtype=np.int64)
+
+    span = costs.max(axis=0) - costs.min(axis=0)
+    span[span == 0] = 1
+    order = np.argsort(((costs - costs.min(axis=0)) / span).sum(axis=1), kind='stable')
+
+    frontier = np.empty_like(costs)
+    positions = []
+    for position in order:
+        row = costs[position]
+        found = frontier[:len(positions)]
+        if len(positions) and np.any(np.all(found <= row, axis=1) & np.any(found < row, axis=1)):
+            continue
+        frontier[len(positions)] = row
+        positions.append(position)
+    return np.array(positions, dtype=np.int64)
+
+
+class Skyline:
+    """Bikes not beaten on every axis, at one catalog version"""
+
+    def __init__(self, matrix, axes):
+        self.version = matrix.version
+        self.axes = axes
+
+        values = np.column_stack([matrix.column(column) for column, _ in axes])
+        complete = np.flatnonzero(~np.isnan(values).any(axis=1))
+        costs = values[complete] * [(-1 if direction == 'max' else 1) for _, direction in axes]
+
+        frontier = complete[pareto_frontier(costs)]
+        self.candidates = len(complete)
+        self.records = [matrix.records[position] for position in frontier]
+        self.values = [dict(zip((column for column, _ in axes), values[position].tolist())) for position in frontier]
+
+    def __len__(self):
+        return len(self.records)
+
+    def presented(self, axes):
+        """The same frontier for axes in the caller's order, best first along the first"""
+        column, direction = axes[0]
+        sign = -1 if direction == 'max' else 1
+        order = sorted(range(len(self)), key=lambda i: (sign * self.values[i][column], self.records[i].id))
+
+        view = copy.copy(self)
+        view.axes = axes
+        view.records = [self.records[i] for i in order]
+        view.values = [self.values[i] for i in order]
+        return view
+
+
+def get_skyline(axes):
+    """Skyline over axes for the current catalog version
+
+    The frontier doesn't depend on the order of the axes, so it is cached
+    once per set of axes and only re-sorted per request.
+    """
+    key = tuple(sorted(set(axes)))
+    return _skyline(catalog_repository.snapshot().version, key).presented(axes)
+
+
+@functools.lru_cache(maxsize=SKYLINE_CACHE_SIZE)
+def _skyline(version, axes):
+    # Entries for older versions are never asked for again and age out
+    return Skyline(get_spec_matrix(), axes)
@@ -0,0 +1,169 @@
+import numpy as np
+
+from app.services.catalog_repository import catalog_repository
+from app.services.derived_metrics import performance_scores
+
+
+# Numeric BikeSpec fields held as matrix columns
+SPEC_COLUMNS = (
+    'engine_cc', 'max_power', 'max_power_rpm', 'max_torque', 'max_torque_rpm',
+    'top_speed', 'acceleration_0_100', 'mileage_city', 'mileage_highway',
+    'length', 'width', 'height', 'wheelbase', 'ground_clearance', 'seat_height',
+    'kerb_weight', 'fuel_capacity'
+)
+
+# Computed from the columns above
+DERIVED_COLUMNS = (
+    'power_to_weight',   # HP per tonne
+    'torque_to_weight',  # Nm per tonne
+    'price_per_hp',
+    'mileage_avg',
+    'performance_score'
+)
+
+COLUMNS = ('id', 'year', 'price') + SPEC_COLUMNS + DERIVED_COLUMNS
+
+# Short names accepted by the API
+COLUMN_ALIASES = {
+    'cc': 'engine_cc',
+    'power': 'max_power',
+    'torque': 'max_torque',
+    'weight': 'kerb_weight',
+    'mileage': 'mileage_avg',
+    'acceleration': 'acceleration_0_100',
+    'score': 'performance_score'
+}
+
+
+class UnknownColumn(ValueError):
+    """Raised for a filter or sort on a column the matrix does not hold"""
+
+
+def resolve_column(name):
+    """Map an API name or alias to a matrix column"""
+    column = COLUMN_ALIASES.get(name, name)
+    if column not in COLUMNS:
+        raise UnknownColumn(f'Unknown attribute: {name}')
+    return column
+
+
+class SpecMatrix:
+    """Column-oriented NumPy matrix of numeric catalog attributes
+
+    One float64 row per attribute, one column per active bike, with NaN
+    for missing values. Range filters and sorts are evaluated as
+    vectorized masks over the whole catalog.
+    """
+
+    def __init__(self, snapshot):
+        self.version = snapshot.version
+        self.records = snapshot.bikes
+        self.index = {name: row for row, name in enumerate(COLUMNS)}
+        self.values = np.full((len(COLUMNS), len(self.records)), np.nan)
+
+        for position, bike in enumerate(self.records):
+            self.values[self.index['id'], position] = bike.id
+            self.values[self.index['year'], position] = _number(bike.year)
+            self.values[self.index['price'], position] = _number(bike.price)
+            if bike.specs:
+                for name in SPEC_COLUMNS:
+                    self.values[self.index[name], position] = _number(getattr(bike.specs, name))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weight_tonnes = self.column('kerb_weight') / 1000
+            self.values[self.index['power_to_weight']] = self.column('max_power') / weight_tonnes
+            self.values[self.index['torque_to_weight']] = self.column('max_torque') / weight_tonnes
+            self.values[self.index['price_per_hp']] = self.column('price') / self.column('max_power')
+            self.values[self.index['mileage_avg']] = (
+                self.column('mileage_city') + self.column('mileage_highway')
+            ) / 2
+            self.values[self.index['performance_score']] = performance_scores(
+                self.column('top_speed'), self.column('acceleration_0_100'),
+                self.column('max_power'), self.column('max_torque')
+            )
+
+        # Division by zero yields inf; treat as missing
+        self.values[~np.isfinite(self.values)] = np.nan
+        self.ids = self.column('id').astype(np.int64)
+
+        self.brands = [(bike.brand or '').lower() for bike in self.records]
+        self.categories = [(bike.category or '').lower() for bike in self.records]
+
+    def __len__(self):
+        return len(self.records)
+
+    def column(self, name):
+        """Get a column as a 1-D array view"""
+        return self.values[self.index[resolve_column(name)]]
+
+    def mask(self, ranges=None, brand=None, category=None):
+        """Boolean mask of bikes satisfying every condition
+
+        ranges maps column name to (low, high); either bound may be None.
+        Bikes with a missing value never satisfy a range on that column.
+        """
+        mask = np.ones(len(self.records), dtype=bool)
+
+        for name, (low, high) in (ranges or {}).items():
+            values = self.column(name)
+            with np.errstate(invalid='ignore'):
+                if low is not None:
+                    mask &= values >= low
+                if high is not None:
+                    mask &= values <= high
+
+        if brand:
+            needle = brand.lower()
+            mask &= np.fromiter((needle in value for value in self.brands), bool, len(self.brands))
+        if category:
+            needle = category.lower()
+            mask &= np.fromiter((needle in value for value in self.categories), bool, len(self.categories))
+
+        return mask
+
+    def sort_keys(self, sort=None, descending=False):
+        """Ascending float keys for the requested order; missing values sort last"""
+        if sort is None:
+            return self.ids.astype(float)
+        keys = self.column(sort)
+        keys = -keys if descending else keys.copy()
+        keys[np.isnan(keys)] = np.inf
+        return keys
+
+    def select(self, mask, sort=None, descending=False, after=None, limit=None):
+        """Positions of matching bikes in (sort key, id) order
+
+        after is the (key, id) of the last row already returned.
+        """
+        keys = self.sort_keys(sort, descending)
+        if after is not None:
+            last_key, last_id = after
+            mask = mask & ((keys > last_key) | ((keys == last_key) & (self.ids > last_id)))
+
+        positions = np.flatnonzero(mask)
+        order = np.lexsort((self.ids[positions], keys[positions]))
+        positions = positions[order]
+        if limit is not None:
+            positions = positions[:limit]
+        return positions, keys
+
+
+def get_spec_matrix():
+    """Spec matrix for the current catalog version"""
+    return catalog_repository.derived('spec_matrix', SpecMatrix)
+
+
+def smallest(values, k):
+    """Positions of the k smallest values, smallest first, ties by position"""
+    k = min(k, len(values))
+    if k == 0:
+        return np.array([], dtype=np.int64)
+    if k < len(values):
+        candidates = np.argpartition(values, k - 1)[:k]
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.lexsort((candidates, values[candidates]))]
+
+
+def _number(value):
+    return np.nan if value is None else float(value)
@@ -0,0 +1,117 @@
+"""
+Response compression with Accept-Encoding negotiation
+
+Compressible responses are encoded with brotli or gzip, whichever the
+client prefers. Shared responses, those with an ETag (versioned catalog
+responses) or marked Cache-Control: public, are cached by ETag or by a
+hash of the body, so the same bytes are compressed once and then reused.
+Everything else, such as per-user pages, is compressed on the fly and
+not stored.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+
+import brotli
+from flask import request
+
+ENCODINGS = ('br', 'gzip')
+
+COMPRESSIBLE_MIMETYPES = (
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+    'application/json', 'application/javascript', 'application/msgpack',
+    'application/x-msgpack', 'image/svg+xml'
+)
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+class CompressedCache:
+    """LRU cache of encoded bodies, bounded by total size in bytes"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get_or_compress(self, key, encoding, data):
+        """Get the encoded body for key, compressing data on a miss"""
+        cache_key = (key, encoding)
+        with self._lock:
+            body = self._entries.get(cache_key)
+            if body is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return body
+            self.misses += 1
+
+        body = compress(data, encoding)
+        if len(body) > self.max_bytes:
+            return body
+
+        with self._lock:
+            if cache_key not in self._entries:
+                self._entries[cache_key] = body
+                self.size += len(body)
+                while self.size > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= len(evicted)
+        return body
+
+    def clear(self):
+        """Drop every cached body"""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+def compress(data, encoding):
+    """Encode data with a content-coding from ENCODINGS"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def init_compression(app):
+    """Compress eligible responses for clients that accept it"""
+    if not app.config.get('COMPRESS_RESPONSES', True):
+        return
+
+    cache = CompressedCache(app.config.get('COMPRESS_CACHE_BYTES', 32 * 1024 * 1024))
+    min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+    app.extensions['compressed_cache'] = cache
+
+    @app.after_request
+    def compress_response(response):
+        if (response.status_code != 200 or response.direct_passthrough
+                or response.is_streamed or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(ENCODINGS)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        etag, _ = response.get_etag()
+        if etag:
+            response.set_data(cache.get_or_compress(('etag', etag), encoding, data))
+        elif response.cache_control.public:
+            response.set_data(cache.get_or_compress(('body', hashlib.sha1(data).hexdigest()), encoding, data))
+        else:
+            response.set_data(compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        if etag:
+            # Same content, different bytes: only a weak validator still holds
+            response.set_etag(etag, weak=True)
+        return response
@@ -1,5 +1,6 @@
+import hashlib
 from functools import wraps
-from flask import redirect, url_for, flash
+from flask import redirect, url_for, flash, request, make_response, current_app, session
 from flask_login import current_user
 
 def admin_required(f):
@@ -26,3 +27,48 @@ def verified_user_required(f):
             return redirect(url_for('index'))
         return f(*args, **kwargs)
     return decorated_function
+
+def public_page(f):
+    """Decorator marking an anonymous, user-independent page as shared"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        # Flashed messages make the page specific to one visitor
+        shared = request.method == 'GET' and not session.get('_flashes')
+        response = make_response(f(*args, **kwargs))
+        if shared and response.status_code == 200:
+            # Shared caches may store it but must revalidate each time
+            response.headers['Cache-Control'] = 'public, no-cache'
+        return response
+    return decorated_function
+
+def catalog_etag(validator=None):
+    """Decorator for conditional GETs on catalog-derived responses"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            from app.services.catalog_repository import catalog_repository
+            from app.utils.serialization import negotiated_mimetype
+            
+            # validator covers data that changes apart from the catalog
+            parts = [catalog_repository.snapshot().fingerprint, request.path, negotiated_mimetype()]
+            parts.extend(f'{key}={value}' for key, value in sorted(request.args.items(multi=True)))
+            if validator is not None:
+                parts.append(str(validator(**kwargs)))
+            etag = hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+            
+            cache_control = f"public, max-age={current_app.config.get('API_CACHE_MAX_AGE', 0)}"
+            
+            # Weak match: compressed responses carry the weak form of the tag
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            response.vary.add('Accept')
+            return response
+        return decorated_function
+    return decorator
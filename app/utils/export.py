@@ -0,0 +1,64 @@
+"""
+Streaming row exports
+
+Rows are read through a server-side cursor in batches and written out as
+they arrive, so memory use does not depend on the number of rows and the
+response starts before the query has finished.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from app import db
+
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+
+def stream_rows(statement, batch_size=EXPORT_BATCH_SIZE):
+    """Yield lists of rows from statement using a server-side cursor"""
+    result = db.session.execute(statement.execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def ndjson_chunks(batches, columns):
+    """One JSON object per line, one chunk per batch"""
+    for rows in batches:
+        yield ''.join(
+            json.dumps(dict(zip(columns, _plain(row))), separators=(',', ':')) + '\n'
+            for row in rows
+        )
+
+
+def csv_chunks(batches, columns):
+    """CSV with a header line sent before the first row is fetched"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield _drain(buffer)
+
+    for rows in batches:
+        writer.writerows(_plain(row) for row in rows)
+        yield _drain(buffer)
+
+
+def _plain(row):
+    return [value.isoformat() if isinstance(value, (datetime, date)) else value for value in row]
+
+
+def _drain(buffer):
+    text = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return text
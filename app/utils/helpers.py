@@ -34,3 +34,13 @@ def save_uploaded_file(file, upload_folder):
         file.save(filepath)
         return filename
     return None
+
+def owned_user_bike_id(bike_id, user_bike_id):
+    """user_bike_id if it is the current user's bike of this model, else None"""
+    from flask_login import current_user
+    from app.models.user_bikes import UserBike
+    
+    if not user_bike_id or not current_user.is_authenticated:
+        return None
+    owned = UserBike.query.filter_by(id=user_bike_id, user_id=current_user.id, bike_id=bike_id).first()
+    return owned.id if owned else None
@@ -0,0 +1,155 @@
+"""
+Keyset (cursor) pagination for the JSON API
+
+Pages are addressed by the (sort key, id) of the last row returned rather
+than by offset, so fetching page N costs the same as page 1. Cursors are
+opaque URL-safe tokens; clients should pass them back unchanged.
+"""
+
+import base64
+import json
+import threading
+import time
+from datetime import date, datetime
+
+from flask import request
+from sqlalchemy import and_, func, or_
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+COUNT_CACHE_TTL = 60  # seconds
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded"""
+
+
+def page_args(default_limit=DEFAULT_PAGE_SIZE):
+    """Read limit, cursor and include_total from the query string"""
+    limit = request.args.get('limit', default_limit, type=int)
+    limit = min(max(limit, 1), MAX_PAGE_SIZE)
+    cursor = request.args.get('cursor') or None
+    include_total = request.args.get('include_total', '').lower() in ('1', 'true', 'yes')
+    return limit, cursor, include_total
+
+
+def encode_cursor(sort_column, values):
+    """Encode the last row's sort values into an opaque token"""
+    payload = {'k': str(sort_column), 'v': [_dump_value(value) for value in values]}
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, sort_column, columns):
+    """Decode a token produced by encode_cursor for the same sort
+
+    columns are SQLAlchemy columns or plain Python types, used to
+    restore each value's type.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        if payload['k'] != str(sort_column) or len(payload['v']) != len(columns):
+            raise InvalidCursor('Cursor does not match this listing')
+        return [_load_value(column, value) for column, value in zip(columns, payload['v'])]
+    except InvalidCursor:
+        raise
+    except Exception:
+        raise InvalidCursor('Invalid cursor')
+
+
+def paginate_keyset(query, sort_column, id_column, cursor=None,
+                    limit=DEFAULT_PAGE_SIZE, descending=True, null_key=None):
+    """Fetch one page ordered by (sort_column, id_column)
+
+    A nullable sort_column needs null_key, the value its NULLs sort as;
+    NULL never compares equal, so those rows would break the cursor.
+    Returns (items, next_cursor); next_cursor is None on the last page.
+    """
+    same_column = sort_column is id_column
+    columns = [id_column] if same_column else [sort_column, id_column]
+    sort_key = sort_column if null_key is None else func.coalesce(sort_column, null_key)
+    keys = [id_column] if same_column else [sort_key, id_column]
+
+    if cursor:
+        values = decode_cursor(cursor, sort_column, columns)
+        if same_column:
+            last_id = values[0]
+            query = query.filter(id_column < last_id if descending else id_column > last_id)
+        else:
+            last_key, last_id = values
+            if descending:
+                query = query.filter(or_(
+                    sort_key < last_key,
+                    and_(sort_key == last_key, id_column < last_id)
+                ))
+            else:
+                query = query.filter(or_(
+                    sort_key > last_key,
+                    and_(sort_key == last_key, id_column > last_id)
+                ))
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    rows = query.order_by(None).order_by(*order).limit(limit + 1).all()
+
+    items = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        values = [getattr(last, column.key) for column in columns]
+        if values[0] is None:
+            values[0] = null_key
+        next_cursor = encode_cursor(sort_column, values)
+
+    return items, next_cursor
+
+
+class CountCache:
+    """Short-lived cache of COUNT(*) results for opt-in total_count"""
+
+    def __init__(self, ttl=COUNT_CACHE_TTL, max_entries=1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def count(self, key, query):
+        """Get the count for key, running query.count() when expired"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        total = query.order_by(None).count()
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + self.ttl, total)
+        return total
+
+    def clear(self):
+        """Drop every cached count"""
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
+
+
+def _dump_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _load_value(column, value):
+    if value is None:
+        return None
+    python_type = column if isinstance(column, type) else column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
@@ -0,0 +1,55 @@
+"""
+Per-endpoint SQL query budgets
+
+Views declare the most queries a request may run with @query_budget(n).
+When ENFORCE_QUERY_BUDGETS is set (the testing config) every statement
+executed during a request is counted and a request that goes over its
+view's budget fails with QueryBudgetExceeded. Budgets include the
+login user lookup and an occasional catalog snapshot reload.
+"""
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request runs more queries than its view allows"""
+
+
+def query_budget(max_queries):
+    """Decorator declaring the query budget of a view"""
+    def decorator(f):
+        # Outer decorators that use functools.wraps carry this attribute up
+        f._query_budget = max_queries
+        return f
+    return decorator
+
+
+def init_query_budgets(app):
+    """Count queries per request and enforce declared budgets"""
+    if not app.config.get('ENFORCE_QUERY_BUDGETS'):
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _count_query):
+        event.listen(Engine, 'before_cursor_execute', _count_query)
+
+    @app.before_request
+    def start_query_count():
+        g._query_count = 0
+
+    @app.after_request
+    def check_query_budget(response):
+        view = current_app.view_functions.get(request.endpoint)
+        budget = getattr(view, '_query_budget', None)
+        count = g.pop('_query_count', 0)
+        if budget is not None and count > budget:
+            raise QueryBudgetExceeded(
+                f'{request.endpoint} ran {count} queries, budget is {budget}'
+            )
+        return response
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and '_query_count' in g:
+        g._query_count += 1
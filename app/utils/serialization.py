@@ -0,0 +1,62 @@
+"""
+Content negotiation for the JSON API
+
+jsonify() goes through ApiJSONProvider.response, so every /api/v1 view
+can answer in MessagePack when the client asks for it with
+Accept: application/msgpack (or application/x-msgpack). JSON stays the
+default, including for Accept: */*.
+"""
+
+import dataclasses
+import decimal
+import uuid
+from datetime import date
+
+import msgpack
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+JSON_MIMETYPE = 'application/json'
+MSGPACK_MIMETYPES = ('application/msgpack', 'application/x-msgpack')
+API_BLUEPRINT = 'api'
+
+
+def negotiated_mimetype():
+    """Mimetype the current API request should be answered with"""
+    if not has_request_context() or request.blueprint != API_BLUEPRINT:
+        return JSON_MIMETYPE
+    return request.accept_mimetypes.best_match((JSON_MIMETYPE,) + MSGPACK_MIMETYPES, JSON_MIMETYPE)
+
+
+class ApiJSONProvider(DefaultJSONProvider):
+    """JSON provider whose response() also speaks MessagePack"""
+
+    def response(self, *args, **kwargs):
+        mimetype = negotiated_mimetype()
+        if mimetype in MSGPACK_MIMETYPES:
+            obj = self._prepare_response_obj(args, kwargs)
+            response = self._app.response_class(packb(obj), mimetype=mimetype)
+        else:
+            response = super().response(*args, **kwargs)
+
+        if has_request_context() and request.blueprint == API_BLUEPRINT:
+            response.vary.add('Accept')
+        return response
+
+
+def packb(obj):
+    """MessagePack-encode obj, converting types the same way as JSON"""
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def _default(o):
+    if isinstance(o, date):
+        return http_date(o)
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o):
+        return dataclasses.asdict(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f'Object of type {type(o).__name__} is not MessagePack serializable')
@@ -0,0 +1,41 @@
+"""
+Add and backfill the derived metric columns on bike_specs
+Run this once after upgrading, or again to recompute the metrics from the stored specs and prices
+"""
+from app import create_app, db
+from app.models.bike_specs import DERIVED_METRICS
+from app.services.derived_metrics import derived_metrics_service
+from sqlalchemy import text
+
+app = create_app()
+
+def backfill_derived_metrics():
+    with app.app_context():
+        try:
+            inspector = db.inspect(db.engine)
+            existing_columns = [col['name'] for col in inspector.get_columns('bike_specs')]
+            existing_indexes = [index['name'] for index in inspector.get_indexes('bike_specs')]
+            
+            for column_name in DERIVED_METRICS:
+                if column_name not in existing_columns:
+                    db.session.execute(text(f"ALTER TABLE bike_specs ADD COLUMN {column_name} FLOAT"))
+                    print(f"✓ Added column: {column_name}")
+                else:
+                    print(f"⊘ Column already exists: {column_name}")
+                
+                index_name = f"ix_bike_specs_{column_name}"
+                if index_name not in existing_indexes:
+                    db.session.execute(text(f"CREATE INDEX {index_name} ON bike_specs ({column_name})"))
+                    print(f"✓ Created index: {index_name}")
+            
+            rows = derived_metrics_service.backfill()
+            db.session.commit()
+            print(f"\n✓ Recomputed derived metrics for {rows} bikes")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error: {str(e)}")
+
+if __name__ == '__main__':
+    print("Backfilling derived metrics on bike_specs...\n")
+    backfill_derived_metrics()
@@ -0,0 +1,27 @@
+"""
+Create and backfill the bike_rating_summary table
+Run this once after upgrading, or again to rebuild the totals from the reviews table
+"""
+from app import create_app, db
+from app.models.bike_rating_summary import BikeRatingSummary
+from app.services.rating_summary import rating_summary_service
+
+app = create_app()
+
+def build_rating_summary():
+    with app.app_context():
+        try:
+            BikeRatingSummary.__table__.create(db.engine, checkfirst=True)
+            print("✓ bike_rating_summary table ready")
+            
+            rows = rating_summary_service.rebuild()
+            db.session.commit()
+            print(f"✓ Rebuilt rating summaries for {rows} bikes")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error: {str(e)}")
+
+if __name__ == '__main__':
+    print("Building bike rating summaries...\n")
+    build_rating_summary()
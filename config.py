@@ -27,6 +27,17 @@ class Config:
     PERMANENT_SESSION_LIFETIME = timedelta(days=7)
     # Password hashing configuration - balance security and performance
     PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'  # Fast hashing for development
+    # Seconds clients and proxies may reuse catalog API responses before revalidating
+    API_CACHE_MAX_AGE = 60
+    # gzip/brotli response compression; shared (ETag or public) bodies are cached and reused
+    COMPRESS_RESPONSES = True
+    COMPRESS_MIN_SIZE = 500  # bytes
+    COMPRESS_CACHE_BYTES = 32 * 1024 * 1024
+    # Worker processes for large Monte Carlo simulations (default: one per CPU)
+    SIMULATION_WORKERS = int(os.environ.get('SIMULATION_WORKERS', 0)) or None
+    # Background simulation jobs: worker threads and active jobs allowed per user
+    SIMULATION_JOB_WORKERS = 2
+    SIMULATION_JOB_LIMIT = 2
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -42,6 +53,12 @@ class TestingConfig(Config):
     """Testing configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    # The MySQL pool and timeout options don't apply to SQLite
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    # Fail requests that run more queries than their view's @query_budget
+    ENFORCE_QUERY_BUDGETS = True
+    # Run simulation jobs inline on submit
+    SIMULATION_JOB_WORKERS = 0
 
 config = {
     'development': DevelopmentConfig,
@@ -15,6 +15,8 @@ load_dotenv()
 from app import create_app, db
 from app.models.bike import Bike
 from app.models.bike_specs import BikeSpec
+from app.services.comparison_catalog import bike_slug
+from app.services.derived_metrics import derived_metrics_service
 from datetime import datetime
 
 def seed_bikes():
@@ -2046,6 +2048,7 @@ def seed_bikes():
         bike = Bike(
             brand=bike_data['brand'],
             model=bike_data['model'],
+            slug=bike_slug(bike_data['brand'], bike_data['model'], bike_data['year']),
             year=bike_data['year'],
             category=bike_data['category'],
             price=bike_data['price'],
@@ -2063,6 +2066,7 @@ def seed_bikes():
             **specs_data,
             created_at=datetime.now()
         )
+        derived_metrics_service.refresh(specs, bike.price)
         
         db.session.add(specs)
         print(f"   ✅ Added {bike_data['brand']} {bike_data['model']}")
@@ -0,0 +1,27 @@
+"""
+Fit fuel consumption coefficients from ride logs
+Creates the fuel_calibrations table if needed; run periodically (e.g. nightly) to refresh it
+"""
+from app import create_app, db
+from app.models.fuel_calibrations import FuelCalibration
+from app.services.fuel_calibration import fuel_calibration_service
+
+app = create_app()
+
+def fit_fuel_calibration():
+    with app.app_context():
+        try:
+            FuelCalibration.__table__.create(db.engine, checkfirst=True)
+            print("✓ fuel_calibrations table ready")
+            
+            bikes, user_bikes = fuel_calibration_service.fit()
+            db.session.commit()
+            print(f"✓ Fitted fuel coefficients for {bikes} bike models and {user_bikes} user bikes")
+            
+        except Exception as e:
+            db.session.rollback()
+            print(f"✗ Error: {str(e)}")
+
+if __name__ == '__main__':
+    print("Fitting fuel calibrations from ride logs...\n")
+    fit_fuel_calibration()
@@ -18,6 +18,9 @@ from app.models.reviews import Review
 from app.models.accident_reports import AccidentReport
 from app.models.resale_predictions import ResalePrediction
 from app.models.admin_logs import AdminLog
+from app.models.bike_rating_summary import BikeRatingSummary
+from app.models.simulation_jobs import SimulationJob
+from app.models.fuel_calibrations import FuelCalibration
 
 def init_database():
     """Initialize the database with all tables"""
@@ -44,6 +47,9 @@ def init_database():
         print("- accident_reports")
         print("- resale_predictions")
         print("- admin_logs")
+        print("- bike_rating_summary")
+        print("- simulation_jobs")
+        print("- fuel_calibrations")
         
         # Check if we need to create a default admin user
         admin = User.query.filter_by(role='admin').first()
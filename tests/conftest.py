@@ -0,0 +1,85 @@
+"""
+Shared test fixtures
+An in-memory SQLite app seeded with the sample catalog and two users
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+
+import pytest
+from app import create_app, db
+from app.models import User
+from app.services.catalog_repository import catalog_repository
+from tests import (
+    TEST_USER_EMAIL, TEST_USER_PASSWORD, TEST_USER_USERNAME,
+    ADMIN_USER_EMAIL, ADMIN_USER_PASSWORD, ADMIN_USER_USERNAME
+)
+
+SEED_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'seed.py')
+
+
+@pytest.fixture(scope='session')
+def app():
+    """Create and configure a test application instance"""
+    app = create_app('testing')
+    app.config.update({
+        'WTF_CSRF_ENABLED': False,
+    })
+
+    # No app context stays pushed, so each request gets its own g and login
+    with app.app_context():
+        db.create_all()
+        _seed_test_data()
+
+    yield app
+
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture(autouse=True)
+def fresh_catalog():
+    """Reload the catalog snapshot, since tests write bikes without bumping it"""
+    catalog_repository.bump_version()
+
+
+@pytest.fixture(scope='function')
+def client(app):
+    """Test client for making requests"""
+    return app.test_client()
+
+
+@pytest.fixture(scope='function')
+def runner(app):
+    """Test CLI runner"""
+    return app.test_cli_runner()
+
+
+def _seed_test_data():
+    """Seed database with the sample catalog and test users"""
+    spec = importlib.util.spec_from_file_location('seed', SEED_SCRIPT)
+    seed = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed.seed_bikes()
+
+    test_user = User(
+        username=TEST_USER_USERNAME,
+        email=TEST_USER_EMAIL,
+        full_name='Test User'
+    )
+    test_user.set_password(TEST_USER_PASSWORD)
+
+    admin_user = User(
+        username=ADMIN_USER_USERNAME,
+        email=ADMIN_USER_EMAIL,
+        full_name='Admin User',
+        role='admin'
+    )
+    admin_user.set_password(ADMIN_USER_PASSWORD)
+
+    db.session.add_all([test_user, admin_user])
+    db.session.commit()
@@ -0,0 +1,610 @@
+"""
+REST API Tests
+Tests for the /api/v1 JSON endpoints
+"""
+
+import pytest
+from app.models import Bike
+
+
+class TestBikesPagination:
+    """Test cursor pagination on the bikes listing"""
+
+    def test_first_page_has_cursor(self, client):
+        """Test a partial page returns a next cursor"""
+        response = client.get('/api/v1/bikes?limit=1')
+        assert response.status_code == 200
+        data = response.get_json()
+        assert data['returned_count'] == 1
+        assert data['has_more'] is True
+        assert data['next_cursor']
+
+    def test_cursor_walks_whole_catalog(self, client, app):
+        """Test following cursors returns every bike exactly once"""
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 1}
+            if cursor:
+                params['cursor'] = cursor
+            data = client.get('/api/v1/bikes', query_string=params).get_json()
+            seen.extend(bike['id'] for bike in data['data'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+
+        with app.app_context():
+            assert len(seen) == len(set(seen))
+            assert len(seen) == Bike.query.filter_by(is_active=True).count()
+
+    def test_total_count_is_opt_in(self, client, app):
+        """Test total_count is only returned when requested"""
+        data = client.get('/api/v1/bikes').get_json()
+        assert 'total_count' not in data
+
+        data = client.get('/api/v1/bikes?include_total=true').get_json()
+        with app.app_context():
+            assert data['total_count'] == Bike.query.filter_by(is_active=True).count()
+
+    def test_invalid_cursor(self, client):
+        """Test a malformed cursor is rejected"""
+        response = client.get('/api/v1/bikes?cursor=not-a-cursor')
+        assert response.status_code == 400
+        assert response.get_json()['success'] is False
+
+
+class TestRidesPagination:
+    """Test cursor pagination on the user's ride logs"""
+
+    def test_cursor_walks_undated_rides(self, client, app):
+        """Test rides without a date are returned once each, after dated ones"""
+        from datetime import datetime
+        from app import db
+        from app.models import RideLog, User, UserBike
+
+        with app.app_context():
+            user = User.query.filter_by(username='testuser').first()
+            user_bike = UserBike(user_id=user.id, bike_id=Bike.query.first().id, registration_number='CURSOR-1')
+            db.session.add(user_bike)
+            db.session.flush()
+            dates = [datetime(2025, 1, day) for day in (1, 2, 2, 3)] + [None] * 3
+            for ride_date in dates:
+                db.session.add(RideLog(user_bike_id=user_bike.id, ride_date=ride_date, distance=10))
+            db.session.flush()
+            # The column default fills in None on insert
+            RideLog.query.filter(
+                RideLog.user_bike_id == user_bike.id, RideLog.ride_date > datetime(2025, 2, 1)
+            ).update({'ride_date': None})
+            db.session.commit()
+            user_bike_id = user_bike.id
+
+        client.post('/auth/login', data={'username': 'testuser', 'password': 'testpass123'})
+        try:
+            seen = []
+            cursor = None
+            while True:
+                params = {'limit': 2, 'bike_id': user_bike_id}
+                if cursor:
+                    params['cursor'] = cursor
+                data = client.get('/api/v1/user/rides', query_string=params).get_json()
+                seen.extend(data['data'])
+                cursor = data['next_cursor']
+                if not cursor:
+                    break
+
+            assert len({ride['id'] for ride in seen}) == len(seen) == len(dates)
+            assert [ride['ride_date'] is None for ride in seen] == [False] * 4 + [True] * 3
+        finally:
+            with app.app_context():
+                RideLog.query.filter_by(user_bike_id=user_bike_id).delete()
+                db.session.delete(db.session.get(UserBike, user_bike_id))
+                db.session.commit()
+
+
+class TestBikeSpecFilters:
+    """Test range filters and sorting on the bikes listing"""
+
+    def test_filter_by_power_range(self, client):
+        """Test min/max filters on any numeric attribute"""
+        data = client.get('/api/v1/bikes?min_power=40').get_json()
+        assert data['data']
+        assert all(bike['specs']['max_power'] >= 40 for bike in data['data'])
+
+    def test_sort_descending(self, client):
+        """Test sort with a leading minus orders high to low"""
+        data = client.get('/api/v1/bikes?sort=-power_to_weight').get_json()
+        ratios = [
+            bike['specs']['max_power'] / bike['specs']['kerb_weight']
+            for bike in data['data']
+        ]
+        assert len(ratios) >= 2
+        assert ratios == sorted(ratios, reverse=True)
+
+    def test_unknown_attribute(self, client):
+        """Test filtering on an unknown attribute is rejected"""
+        response = client.get('/api/v1/bikes?min_wingspan=3')
+        assert response.status_code == 400
+
+
+class TestBikeFacets:
+    """Test faceted navigation"""
+
+    def test_facets_without_selection(self, client):
+        """Test unfiltered facets count the whole catalog"""
+        data = client.get('/api/v1/bikes/facets').get_json()
+        brand_total = sum(item['count'] for item in data['facets']['brand'])
+        assert brand_total == data['total_count']
+
+    def test_facet_selection_filters_results(self, client):
+        """Test selecting a brand filters results but not brand counts"""
+        data = client.get('/api/v1/bikes/facets?brand=Yamaha').get_json()
+        assert all(bike['brand'] == 'Yamaha' for bike in data['data'])
+
+        brands = {item['value']: item['count'] for item in data['facets']['brand']}
+        assert brands['ktm'] >= 1
+
+    def test_categories_use_catalog(self, client):
+        """Test category counts are served"""
+        data = client.get('/api/v1/bikes/categories').get_json()
+        assert data['success'] is True
+        assert data['data']
+
+class TestBikeSearch:
+    """Test the indexed bike search endpoint"""
+
+    def test_search_requires_query(self, client):
+        """Test empty query is rejected"""
+        response = client.get('/api/v1/bikes/search')
+        assert response.status_code == 400
+
+    def test_search_ranks_best_match_first(self, client):
+        """Test the closest match is returned first"""
+        data = client.get('/api/v1/bikes/search?q=duke 390').get_json()
+        assert data['success'] is True
+        assert data['data'][0]['brand'] == 'KTM'
+
+    def test_search_tolerates_typos(self, client):
+        """Test misspelt and mistyped queries still match"""
+        data = client.get('/api/v1/bikes/search?q=yamha').get_json()
+        assert data['data'][0]['brand'] == 'Yamaha'
+
+        data = client.get('/api/v1/bikes/search?q=duke 39o').get_json()
+        assert '390' in data['data'][0]['model']
+
+    def test_search_limit_is_clamped(self, client):
+        """Test out-of-range limits are clamped to 1..100"""
+        data = client.get('/api/v1/bikes/search?q=ktm&limit=-5').get_json()
+        assert data['count'] == 1
+
+        data = client.get('/api/v1/bikes/search?q=ktm&limit=100000').get_json()
+        assert data['success'] is True and data['count'] <= 100
+
+
+class TestBikeSuggest:
+    """Test the autocomplete endpoint"""
+
+    def test_suggest_requires_prefix(self, client):
+        """Test empty prefix is rejected"""
+        response = client.get('/api/v1/bikes/suggest?prefix=')
+        assert response.status_code == 400
+
+    def test_suggest_by_brand_prefix(self, client):
+        """Test brand prefix returns that brand's bikes"""
+        data = client.get('/api/v1/bikes/suggest?prefix=yam').get_json()
+        assert data['count'] >= 1
+        assert all(item['brand'] == 'Yamaha' for item in data['data'])
+
+    def test_suggest_by_model_word(self, client):
+        """Test completions start from any word of the model name"""
+        data = client.get('/api/v1/bikes/suggest?prefix=r15').get_json()
+        assert data['data'][0]['model'] == 'R15 V4'
+
+    def test_suggest_limit_is_clamped(self, client):
+        """Test out-of-range limits are clamped to 1..100"""
+        data = client.get('/api/v1/bikes/suggest?prefix=k&limit=-5').get_json()
+        assert data['count'] == 1
+
+        data = client.get('/api/v1/bikes/suggest?prefix=k&limit=100000').get_json()
+        assert data['success'] is True and data['count'] <= 100
+
+
+class TestConditionalRequests:
+    """Test ETag handling on catalog endpoints"""
+
+    def test_catalog_responses_have_etag(self, client):
+        """Test catalog responses carry an ETag and Cache-Control"""
+        response = client.get('/api/v1/bikes')
+        assert response.headers.get('ETag')
+        assert 'max-age' in response.headers.get('Cache-Control', '')
+
+    def test_matching_etag_returns_304(self, client):
+        """Test If-None-Match with the current ETag returns 304"""
+        etag = client.get('/api/v1/bikes/brands').headers['ETag']
+        response = client.get('/api/v1/bikes/brands', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+
+    def test_etag_changes_with_catalog_contents(self, client, app):
+        """Test an admin edit invalidates previously issued ETags"""
+        from app import db
+        from app.services.catalog_repository import catalog_repository
+
+        etag = client.get('/api/v1/bikes').headers['ETag']
+        with app.app_context():
+            bike = Bike.query.first()
+            bike_id, price = bike.id, bike.price
+            bike.price = price + 1
+            db.session.commit()
+            catalog_repository.bump_version()
+        try:
+            response = client.get('/api/v1/bikes', headers={'If-None-Match': etag})
+            assert response.status_code == 200
+        finally:
+            with app.app_context():
+                db.session.get(Bike, bike_id).price = price
+                db.session.commit()
+                catalog_repository.bump_version()
+
+    def test_etag_is_the_same_across_processes(self, client, app):
+        """Test the ETag depends on the catalog contents, not the in-process version counter"""
+        from app.services.catalog_repository import catalog_repository
+
+        etag = client.get('/api/v1/bikes').headers['ETag']
+        # A reload with the same contents, as in a restarted or sibling worker
+        catalog_repository.bump_version()
+        response = client.get('/api/v1/bikes', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_etag_depends_on_parameters(self, client):
+        """Test different query parameters give different ETags"""
+        first = client.get('/api/v1/bikes?sort=price').headers['ETag']
+        second = client.get('/api/v1/bikes?sort=-price').headers['ETag']
+        assert first != second
+
+
+class TestBikeBatch:
+    """Test the batch bike details endpoint"""
+
+    def test_batch_matches_single_details(self, client, app):
+        """Test batch entries have the same structure as bike details"""
+        with app.app_context():
+            bike_id = Bike.query.first().id
+        single = client.get(f'/api/v1/bikes/{bike_id}').get_json()['data']
+        batch = client.get(f'/api/v1/bikes/batch?ids={bike_id}').get_json()
+        assert batch['success'] is True
+        assert batch['data'] == [single]
+
+    def test_partial_misses_are_reported(self, client, app):
+        """Test unknown ids come back as per-id errors"""
+        with app.app_context():
+            bike_id = Bike.query.first().id
+        response = client.post('/api/v1/bikes/batch', json={'bike_ids': [bike_id, 999999]})
+        assert response.status_code == 200
+        data = response.get_json()
+        assert [bike['id'] for bike in data['data']] == [bike_id]
+        assert data['errors'] == [{'id': 999999, 'error': 'Bike not found'}]
+
+    def test_invalid_ids(self, client):
+        """Test malformed ids are rejected"""
+        response = client.get('/api/v1/bikes/batch?ids=1,abc')
+        assert response.status_code == 400
+
+
+class TestSimilarBikes:
+    """Test the similar bikes endpoint"""
+
+    def test_similar_excludes_target(self, client, app):
+        """Test results are ranked and never include the bike itself"""
+        with app.app_context():
+            bike_id = Bike.query.filter_by(is_active=True).first().id
+        data = client.get(f'/api/v1/bikes/{bike_id}/similar?k=3').get_json()
+        assert data['success'] is True
+        assert 0 < data['count'] <= 3
+        assert bike_id not in [bike['id'] for bike in data['data']]
+        scores = [bike['similarity'] for bike in data['data']]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_custom_weights(self, client, app):
+        """Test feature weights are accepted and validated"""
+        with app.app_context():
+            bike_id = Bike.query.filter_by(is_active=True).first().id
+        response = client.get(f'/api/v1/bikes/{bike_id}/similar?weights=price:0,power:3')
+        assert response.status_code == 200
+        response = client.get(f'/api/v1/bikes/{bike_id}/similar?weights=colour:1')
+        assert response.status_code == 400
+
+    def test_unknown_bike(self, client):
+        """Test a missing bike returns 404"""
+        response = client.get('/api/v1/bikes/999999/similar')
+        assert response.status_code == 404
+
+
+
+class TestCatalogComparison:
+    """Test the vectorized comparison engine and catalog ranking"""
+
+    def test_compare_scores_and_picks(self, client, app):
+        """Test compare returns scores and picks from the selected bikes"""
+        with app.app_context():
+            ids = [bike.id for bike in Bike.query.filter_by(is_active=True).limit(3)]
+        data = client.get('/api/v1/bikes/compare?ids=' + ','.join(map(str, ids))).get_json()
+        assert data['success'] is True
+        assert all(bike['performance_score'] > 0 for bike in data['data'])
+        assert set(data['recommendations'].values()) <= set(ids)
+
+    def test_compare_rejects_malformed_ids(self, client):
+        """Test non-integer ids are a 400, not a server error"""
+        for response in (
+            client.get('/api/v1/bikes/compare?ids=1,abc'),
+            client.post('/api/v1/bikes/compare', json={'bike_ids': [1, 'abc']})
+        ):
+            assert response.status_code == 400
+            assert response.get_json()['error'] == 'Invalid bike IDs provided'
+
+    def test_rank_catalog_is_ordered(self, client):
+        """Test catalog rankings are sorted best first"""
+        data = client.get('/api/v1/bikes/compare/catalog?limit=5').get_json()
+        assert data['success'] is True
+        assert len(data['performance']) == 5
+        scores = [bike['performance_score'] for bike in data['performance']]
+        assert scores == sorted(scores, reverse=True)
+        mileage = [bike['avg_mileage'] for bike in data['economy']]
+        assert mileage == sorted(mileage, reverse=True)
+        assert data['recommendations']['best_track'] == data['recommendations']['best_performance']
+
+    def test_engine_matches_catalog_ranking(self, app):
+        """Test ranking a list of bikes and the whole catalog agree"""
+        from app.services.catalog_repository import catalog_repository
+        from app.services.comparison_engine import comparison_engine
+
+        with app.app_context():
+            bikes = catalog_repository.snapshot().bikes
+            listed = comparison_engine.compare_bikes(bikes)
+            ranked = comparison_engine.rank_catalog()
+            assert [row['bike'].id for row in listed['performance']] == \
+                [row['bike'].id for row in ranked['performance']]
+
+
+class TestDerivedMetrics:
+    """Test stored derived metric columns on bike specs"""
+
+    def test_stored_metrics_match_specs(self, app):
+        """Test stored metrics agree with the spec matrix"""
+        from app.models.bike_specs import BikeSpec
+        from app.services.spec_matrix import get_spec_matrix
+
+        with app.app_context():
+            matrix = get_spec_matrix()
+            positions = {int(bike_id): position for position, bike_id in enumerate(matrix.ids)}
+            for specs in BikeSpec.query.all():
+                position = positions.get(specs.bike_id)
+                if position is None:
+                    continue
+                assert specs.performance_score == pytest.approx(matrix.column('performance_score')[position])
+                assert specs.power_to_weight == pytest.approx(matrix.column('power_to_weight')[position])
+
+    def test_export_sorted_by_metric(self, client):
+        """Test exports can be ordered by a stored metric"""
+        import json
+
+        response = client.get('/api/v1/bikes/export?sort=-performance_score')
+        assert response.status_code == 200
+        scores = [json.loads(line)['performance_score'] for line in response.data.decode().splitlines()]
+        assert scores == sorted(scores, reverse=True)
+
+        response = client.get('/api/v1/bikes/export?sort=engine_cc')
+        assert response.status_code == 400
+
+    def test_metric_sort_uses_index(self, app):
+        """Test sorting by performance score walks its index"""
+        from sqlalchemy import select, text
+        from app import db
+        from app.models.bike_specs import BikeSpec
+
+        with app.app_context():
+            if db.engine.dialect.name != 'sqlite':
+                pytest.skip('query plan check is SQLite specific')
+            statement = select(BikeSpec.id).order_by(BikeSpec.performance_score.desc(), BikeSpec.id.desc())
+            plan = db.session.execute(text(f'EXPLAIN QUERY PLAN {statement}')).all()
+            assert any('ix_bike_specs_performance_score' in row[-1] for row in plan)
+
+
+class TestBikeSkyline:
+    """Test the Pareto frontier endpoint"""
+
+    def test_frontier_is_not_dominated(self, client):
+        """Test no frontier bike is beaten on every axis by another bike"""
+        data = client.get('/api/v1/bikes/skyline?axes=price:min,power:max,weight:min').get_json()
+        assert data['success'] is True
+        assert 0 < data['count'] <= data['candidates']
+
+        costs = [(b['axes']['price'], -b['axes']['max_power'], b['axes']['kerb_weight']) for b in data['data']]
+        for i, a in enumerate(costs):
+            for j, b in enumerate(costs):
+                if i != j:
+                    assert not (all(x <= y for x, y in zip(b, a)) and b != a)
+
+    def test_frontier_matches_pairwise_check(self):
+        """Test the skyline algorithm agrees with brute force"""
+        import numpy as np
+        from app.services.skyline import pareto_frontier
+
+        costs = np.random.default_rng(7).integers(0, 6, (150, 3)).astype(float)
+        expected = [
+            i for i, row in enumerate(costs)
+            if not any((other <= row).all() and (other < row).any() for other in costs)
+        ]
+        assert sorted(pareto_frontier(costs).tolist()) == expected
+
+    def test_invalid_axes(self, client):
+        """Test bad axis specs are rejected"""
+        assert client.get('/api/v1/bikes/skyline?axes=price:up,power:max').status_code == 400
+        assert client.get('/api/v1/bikes/skyline?axes=colour:min,power:max').status_code == 400
+        assert client.get('/api/v1/bikes/skyline?axes=price:min').status_code == 400
+
+    def test_skyline_cached_per_axis_set(self, app):
+        """Test axis sets that differ only in order share one cached frontier"""
+        from app.services.skyline import SKYLINE_CACHE_SIZE, _skyline, get_skyline, parse_axes
+
+        with app.app_context():
+            get_skyline(parse_axes('price:min,torque:max'))
+            hits = _skyline.cache_info().hits
+            reordered = get_skyline(parse_axes('torque:max,price:min'))
+            assert _skyline.cache_info().hits == hits + 1
+            assert reordered.axes == (('max_torque', 'max'), ('price', 'min'))
+            torques = [values['max_torque'] for values in reordered.values]
+            assert torques == sorted(torques, reverse=True)
+
+            get_skyline(parse_axes('price:min,torque:min'))
+            assert _skyline.cache_info().hits == hits + 1
+            assert _skyline.cache_info().maxsize == SKYLINE_CACHE_SIZE
+
+
+class TestBikeRank:
+    """Test the weighted top-k ranking endpoint"""
+
+    def test_rank_returns_top_k_in_order(self, client):
+        """Test results are limited to k and sorted by score"""
+        data = client.get('/api/v1/bikes/rank?k=5').get_json()
+        assert data['success'] is True
+        assert data['count'] == 5
+        scores = [bike['score'] for bike in data['data']]
+        assert scores == sorted(scores, reverse=True)
+        assert all(0 <= score <= 1 for score in scores)
+
+    def test_single_component_weight(self, client):
+        """Test weighting only price puts the cheapest bike first"""
+        from app.services.catalog_repository import catalog_repository
+
+        data = client.get('/api/v1/bikes/rank?k=1&price=1&performance=0&economy=0&comfort=0&rating=0').get_json()
+        cheapest = min(bike.price for bike in catalog_repository.snapshot().bikes if bike.price)
+        assert data['data'][0]['price'] == cheapest
+
+    def test_filters_narrow_candidates(self, client):
+        """Test range filters apply before ranking"""
+        data = client.get('/api/v1/bikes/rank?k=50&max_price=200000').get_json()
+        assert data['count'] > 0
+        assert all(bike['price'] <= 200000 for bike in data['data'])
+
+    def test_invalid_weights(self, client):
+        """Test negative, non-numeric and all-zero weights are rejected"""
+        assert client.get('/api/v1/bikes/rank?price=-1').status_code == 400
+        assert client.get('/api/v1/bikes/rank?price=cheap').status_code == 400
+        zero = 'performance=0&economy=0&comfort=0&price=0&rating=0'
+        assert client.get(f'/api/v1/bikes/rank?{zero}').status_code == 400
+
+class TestBikeExport:
+    """Test the streaming catalog export"""
+
+    def test_ndjson_has_one_line_per_bike(self, client, app):
+        """Test NDJSON export streams every active bike with its specs"""
+        import json
+
+        response = client.get('/api/v1/bikes/export')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        with app.app_context():
+            assert len(rows) == Bike.query.filter_by(is_active=True).count()
+        assert 'kerb_weight' in rows[0]
+
+    def test_csv_header(self, client):
+        """Test CSV export starts with the column header"""
+        response = client.get('/api/v1/bikes/export?format=csv')
+        assert response.status_code == 200
+        header = response.data.decode().splitlines()[0].split(',')
+        assert header[:3] == ['id', 'brand', 'model']
+        assert 'rear_tyre' in header
+
+    def test_unknown_format(self, client):
+        """Test an unsupported format is rejected"""
+        response = client.get('/api/v1/bikes/export?format=xml')
+        assert response.status_code == 400
+
+
+class TestContentNegotiation:
+    """Test MessagePack responses on the API"""
+
+    def test_msgpack_matches_json(self, client):
+        """Test the MessagePack body carries the same data as JSON"""
+        import msgpack
+
+        as_json = client.get('/api/v1/bikes?limit=5').get_json()
+        response = client.get('/api/v1/bikes?limit=5', headers={'Accept': 'application/msgpack'})
+        assert response.mimetype == 'application/msgpack'
+        assert msgpack.unpackb(response.data) == as_json
+        assert 'Accept' in response.headers['Vary']
+
+    def test_x_msgpack_alias(self, client):
+        """Test the x- prefixed mimetype is honoured"""
+        response = client.get('/api/v1/bikes/categories', headers={'Accept': 'application/x-msgpack'})
+        assert response.mimetype == 'application/x-msgpack'
+
+    def test_json_is_default(self, client):
+        """Test wildcard Accept still gets JSON"""
+        response = client.get('/api/v1/bikes/categories', headers={'Accept': '*/*'})
+        assert response.mimetype == 'application/json'
+
+    def test_etag_differs_by_representation(self, client):
+        """Test JSON and MessagePack responses are cached separately"""
+        as_json = client.get('/api/v1/bikes/categories')
+        as_msgpack = client.get('/api/v1/bikes/categories', headers={'Accept': 'application/msgpack'})
+        assert as_json.headers['ETag'] != as_msgpack.headers['ETag']
+
+
+class TestQueryBudgets:
+    """Test declared query budgets are enforced"""
+
+    def _count_queries(self, app, client, url):
+        from sqlalchemy import event
+        from app import db
+
+        statements = []
+
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', count)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(engine, 'before_cursor_execute', count)
+        assert response.status_code == 200
+        return len(statements)
+
+    def test_list_queries_do_not_grow_with_page_size(self, client, app):
+        """Test a larger page runs no extra queries"""
+        client.get('/api/v1/bikes?limit=1')
+        small = self._count_queries(app, client, '/api/v1/bikes?limit=1')
+        large = self._count_queries(app, client, '/api/v1/bikes?limit=100')
+        assert small == large
+
+    def test_bike_details_within_budget(self, client, app):
+        """Test bike details with specs and reviews stays in budget"""
+        with app.app_context():
+            bike_id = Bike.query.first().id
+        queries = self._count_queries(app, client, f'/api/v1/bikes/{bike_id}')
+        budget = app.view_functions['api.get_bike_details']._query_budget
+        assert queries <= budget
+
+    def test_exceeding_budget_fails(self, client, app, monkeypatch):
+        """Test a view over its budget raises in testing"""
+        from app.utils.query_budget import QueryBudgetExceeded
+
+        with app.app_context():
+            bike_id = Bike.query.first().id
+        view = app.view_functions['api.get_bike_details']
+        monkeypatch.setattr(view, '_query_budget', 0)
+        with pytest.raises(QueryBudgetExceeded):
+            client.get(f'/api/v1/bikes/{bike_id}')
+
+    def test_batch_queries_do_not_grow_with_ids(self, client, app):
+        """Test batch details run a fixed number of queries"""
+        with app.app_context():
+            ids = [bike.id for bike in Bike.query.all()]
+        client.get('/api/v1/bikes/batch?ids=' + str(ids[0]))
+        one = self._count_queries(app, client, f'/api/v1/bikes/batch?ids={ids[0]}')
+        many = self._count_queries(app, client, '/api/v1/bikes/batch?ids=' + ','.join(map(str, ids)))
+        assert one == many
@@ -0,0 +1,153 @@
+"""
+Catalog Repository Tests
+Tests for the in-process catalog snapshot and its versioning
+"""
+
+import pytest
+from app.models import Bike
+from app.services.catalog_repository import catalog_repository
+from app import db
+
+
+class TestCatalogSnapshot:
+    """Test catalog snapshot contents"""
+
+    def test_snapshot_contains_active_bikes(self, app):
+        """Test snapshot lists every active bike"""
+        with app.app_context():
+            snapshot = catalog_repository.snapshot()
+            active_ids = {bike.id for bike in Bike.query.filter_by(is_active=True).all()}
+            assert {bike.id for bike in snapshot.bikes} == active_ids
+
+    def test_snapshot_carries_specs(self, app):
+        """Test snapshot records expose specs like the ORM model"""
+        with app.app_context():
+            snapshot = catalog_repository.snapshot()
+            bike = next(bike for bike in snapshot.bikes if bike.model == 'R15 V4')
+            assert bike.specs is not None
+            assert bike.specs.engine_cc == 155
+
+    def test_snapshot_is_reused_between_calls(self, app):
+        """Test snapshot is not reloaded while the version is unchanged"""
+        with app.app_context():
+            assert catalog_repository.snapshot() is catalog_repository.snapshot()
+
+    def test_records_are_immutable(self, app):
+        """Test snapshot records cannot be modified"""
+        with app.app_context():
+            bike = catalog_repository.snapshot().bikes[0]
+            with pytest.raises(AttributeError):
+                bike.price = 0
+
+
+class TestCatalogVersioning:
+    """Test catalog version bumps"""
+
+    def test_bump_version_is_monotonic(self, app):
+        """Test version always increases"""
+        version = catalog_repository.version
+        assert catalog_repository.bump_version() == version + 1
+
+    def test_bump_version_reloads_snapshot(self, app):
+        """Test a bump makes the next snapshot reflect DB changes"""
+        with app.app_context():
+            catalog_repository.snapshot()
+            bike = Bike.query.filter_by(brand='KTM').first()
+            bike.is_active = False
+            db.session.commit()
+
+            # Stale until the version is bumped
+            assert catalog_repository.snapshot().get(bike.id) is not None
+
+            catalog_repository.bump_version()
+            assert catalog_repository.snapshot().get(bike.id) is None
+            assert catalog_repository.snapshot().get(bike.id, include_inactive=True) is not None
+
+            bike.is_active = True
+            db.session.commit()
+            catalog_repository.bump_version()
+
+    def test_derived_values_follow_version(self, app):
+        """Test derived values are rebuilt only on version change"""
+        with app.app_context():
+            calls = []
+
+            def builder(snapshot):
+                calls.append(snapshot.version)
+                return len(snapshot)
+
+            catalog_repository.derived('test-count', builder)
+            catalog_repository.derived('test-count', builder)
+            assert len(calls) == 1
+
+            catalog_repository.bump_version()
+            catalog_repository.derived('test-count', builder)
+            assert len(calls) == 2
+
+
+class TestAdminBikeEdits:
+    """Test admin edits reach the catalog without clobbering specs"""
+
+    def test_edit_clears_specs_left_blank(self, client, app):
+        """Test blank spec inputs clear the field and omitted ones keep it"""
+        with app.app_context():
+            bike = Bike.query.filter_by(slug='ktm-rc390').first()
+            bike_id = bike.id
+            form = {
+                'brand': bike.brand, 'model': bike.model, 'year': bike.year, 'category': bike.category,
+                'price': bike.price, 'image_url': bike.image_url or '', 'is_active': 'on'
+            }
+            before = {
+                'mileage_city': bike.specs.mileage_city, 'mileage_highway': bike.specs.mileage_highway,
+                'max_power': bike.specs.max_power, 'engine_type': bike.specs.engine_type
+            }
+
+        client.post('/auth/login', data={'username': 'adminuser', 'password': 'adminpass123'})
+        try:
+            response = client.post(f'/admin/edit-bike/{bike_id}', data={
+                **form, 'mileage_city': before['mileage_city'] + 1, 'max_power': '', 'engine_type': ''
+            })
+            assert response.status_code == 302
+
+            with app.app_context():
+                specs = db.session.get(Bike, bike_id).specs
+                assert specs.mileage_city == before['mileage_city'] + 1
+                assert specs.mileage_highway == before['mileage_highway']
+                assert specs.max_power is None
+                assert specs.engine_type is None
+                assert specs.power_to_weight is None
+                assert catalog_repository.snapshot().get(bike_id).specs.mileage_city == before['mileage_city'] + 1
+        finally:
+            from app.services.derived_metrics import derived_metrics_service
+
+            with app.app_context():
+                bike = db.session.get(Bike, bike_id)
+                for field, value in before.items():
+                    setattr(bike.specs, field, value)
+                derived_metrics_service.refresh(bike.specs, bike.price)
+                db.session.commit()
+            catalog_repository.bump_version()
+
+    def test_add_skips_blank_specs(self, client, app):
+        """Test blank spec inputs on the add form are left unset"""
+        client.post('/auth/login', data={'username': 'adminuser', 'password': 'adminpass123'})
+        try:
+            response = client.post('/admin/add-bike', data={
+                'brand': 'Blank', 'model': 'Specs', 'year': 2024, 'category': 'Sport', 'price': 100000,
+                'engine_cc': 300, 'engine_type': '', 'max_power': '40', 'weight': ''
+            })
+            assert response.status_code == 302
+
+            with app.app_context():
+                specs = Bike.query.filter_by(brand='Blank').first().specs
+                assert (specs.engine_cc, specs.max_power) == (300, 40)
+                assert specs.engine_type is None and specs.kerb_weight is None
+        finally:
+            from app.models import BikeSpec
+
+            with app.app_context():
+                bike = Bike.query.filter_by(brand='Blank').first()
+                if bike:
+                    BikeSpec.query.filter_by(bike_id=bike.id).delete()
+                    db.session.delete(bike)
+                    db.session.commit()
@@ -4,7 +4,7 @@ Tests for bike comparison functionality and filters
 """
 
 import pytest
-from app.models import Bike, BikeSpecs
+from app.models import Bike
 from app import db
 
 
@@ -33,7 +33,7 @@ class TestBikeComparison:
             bike1 = Bike.query.filter_by(brand='Yamaha').first()
             bike2 = Bike.query.filter_by(brand='KTM').first()
             
-            response = client.get(f'/comparison/compare?bike1={bike1.id}&bike2={bike2.id}')
+            response = client.post('/comparison/results', data={'bike_ids[]': [bike1.slug, bike2.slug]})
             assert response.status_code == 200
             assert b'Yamaha' in response.data
             assert b'KTM' in response.data
@@ -43,15 +43,16 @@ class TestBikeComparison:
         with app.app_context():
             bikes = Bike.query.limit(3).all()
             if len(bikes) >= 3:
-                response = client.get(
-                    f'/comparison/compare?bike1={bikes[0].id}&bike2={bikes[1].id}&bike3={bikes[2].id}'
-                )
+                response = client.post('/comparison/results', data={
+                    'bike_ids[]': [bike.slug for bike in bikes]
+                })
                 assert response.status_code == 200
     
     def test_compare_with_missing_bike(self, client):
         """Test comparison with non-existent bike ID"""
-        response = client.get('/comparison/compare?bike1=999&bike2=1000')
-        assert response.status_code in [404, 400] or b'not found' in response.data.lower()
+        response = client.post('/comparison/results', data={'bike_ids[]': ['no-such-bike', 'another-missing-bike']})
+        # Unknown bikes send the user back to the selection page
+        assert response.status_code in [404, 400] or b'bike_ids[]' in response.data
     
     def test_comparison_shows_specs(self, client, app):
         """Test comparison shows bike specifications"""
@@ -59,7 +60,7 @@ class TestBikeComparison:
             bike1 = Bike.query.filter_by(brand='Yamaha').first()
             bike2 = Bike.query.filter_by(brand='KTM').first()
             
-            response = client.get(f'/comparison/compare?bike1={bike1.id}&bike2={bike2.id}')
+            response = client.post('/comparison/results', data={'bike_ids[]': [bike1.slug, bike2.slug]})
             assert response.status_code == 200
             
             # Check for spec data
@@ -142,9 +143,78 @@ class TestComparisonUtilities:
     def test_compare_performance_metrics(self, app):
         """Test performance comparison logic"""
         with app.app_context():
-            bike1 = Bike.query.filter_by(brand='Yamaha').first()
-            bike2 = Bike.query.filter_by(brand='KTM').first()
+            bike1 = Bike.query.filter_by(brand='Yamaha', model='R15 V4').first()
+            bike2 = Bike.query.filter_by(brand='KTM', model='390 Duke').first()
             
             if bike1.specs and bike2.specs:
                 # KTM Duke 390 should have more power than R15
                 assert bike2.specs.max_power > bike1.specs.max_power
+
+
+class TestComparisonResults:
+    """Test comparison results served from the catalog by slug"""
+
+    def test_results_match_selected_slugs(self, client):
+        """Test each posted slug resolves to the bike it names"""
+        response = client.post('/comparison/results', data={
+            'bike_ids[]': ['ktm-rc125', 'bajaj-pulsar-ns200', 'suzuki-gixxer-sf250']
+        })
+        assert response.status_code == 200
+        assert b'RC 125' in response.data
+        assert b'Pulsar NS200' in response.data
+        assert b'Gixxer SF 250' in response.data
+
+    def test_results_follow_catalog_edits(self, client, app):
+        """Test an admin price change shows up in the next comparison"""
+        from app.services.catalog_repository import catalog_repository
+        from app.services.comparison_catalog import get_comparison_index
+        from app.services.derived_metrics import derived_metrics_service
+
+        with app.app_context():
+            bike = Bike.query.filter_by(slug='ktm-rc390').first()
+            original = bike.price
+            try:
+                bike.price = 345678
+                derived_metrics_service.refresh(bike.specs, bike.price)
+                db.session.commit()
+                catalog_repository.bump_version()
+
+                row = get_comparison_index()['ktm-rc390']
+                assert row['price'] == 345678
+                assert row['price_per_hp'] == round(345678 / row['power'], 0)
+
+                response = client.post('/comparison/results', data={
+                    'bike_ids[]': ['ktm-rc390', 'yamaha-r15-v4']
+                })
+                assert b'345,678' in response.data
+            finally:
+                bike.price = original
+                derived_metrics_service.refresh(bike.specs, bike.price)
+                db.session.commit()
+                catalog_repository.bump_version()
+
+    def test_bike_slug_avoids_taken_slugs(self, app):
+        """Test a second bike with the same name gets a distinct slug"""
+        from app.services.comparison_catalog import bike_slug
+
+        with app.app_context():
+            bike = Bike.query.filter_by(slug='ktm-rc125').first()
+            assert bike_slug('KTM', 'RC 125', bike_id=bike.id) == 'ktm-rc125'
+            assert bike_slug('KTM', 'RC 125', 2026) == 'ktm-rc125-2026'
+            assert bike_slug('Some Brand', 'Model X') == 'some-brand-model-x'
+
+    def test_repeated_bike_gets_numbered_slugs(self, client, app):
+        """Test adding the same bike three times gives three distinct slugs"""
+        client.post('/auth/login', data={'username': 'adminuser', 'password': 'adminpass123'})
+        form = {'brand': 'Foo', 'model': 'Bar', 'year': 2024, 'category': 'Sport', 'price': 100000}
+        try:
+            for _ in range(3):
+                assert client.post('/admin/add-bike', data=form).status_code == 302
+
+            with app.app_context():
+                slugs = [bike.slug for bike in Bike.query.filter_by(brand='Foo').order_by(Bike.id)]
+            assert slugs == ['foo-bar', 'foo-bar-2024', 'foo-bar-2']
+        finally:
+            with app.app_context():
+                Bike.query.filter_by(brand='Foo').delete()
+                db.session.commit()
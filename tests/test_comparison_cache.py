@@ -0,0 +1,74 @@
+"""
+Comparison Cache Tests
+Tests for memoized comparison results and their counters
+"""
+
+import pytest
+from app.services.comparison_cache import ComparisonCache, comparison_cache
+from app.services.catalog_repository import catalog_repository
+
+
+class TestComparisonCache:
+    """Test the LRU cache of comparison results"""
+
+    def test_key_ignores_bike_order(self, app):
+        """Test the same bike set in any order is one entry"""
+        cache = ComparisonCache(max_entries=4)
+        with app.app_context():
+            first = cache.get_or_build('api', [2, 1], lambda: object())
+            assert cache.get_or_build('api', [1, 2, 2], lambda: object()) is first
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_catalog_version_changes_key(self, app):
+        """Test a catalog write means the next lookup is a miss"""
+        cache = ComparisonCache(max_entries=4)
+        with app.app_context():
+            cache.get_or_build('api', [1, 2], lambda: 'old')
+            catalog_repository.bump_version()
+            assert cache.get_or_build('api', [1, 2], lambda: 'new') == 'new'
+        assert cache.misses == 2
+
+    def test_size_bound_evicts_least_recent(self, app):
+        """Test the oldest unused entry is dropped first"""
+        cache = ComparisonCache(max_entries=2)
+        with app.app_context():
+            cache.get_or_build('api', [1, 2], lambda: 'a')
+            cache.get_or_build('api', [1, 3], lambda: 'b')
+            cache.get_or_build('api', [1, 2], lambda: 'a')
+            cache.get_or_build('api', [1, 4], lambda: 'c')
+            assert cache.stats()['entries'] == 2
+            assert cache.get_or_build('api', [1, 2], lambda: 'rebuilt') == 'a'
+            assert cache.get_or_build('api', [1, 3], lambda: 'rebuilt') == 'rebuilt'
+
+
+class TestCachedComparisons:
+    """Test comparison views reuse cached results"""
+
+    def test_api_compare_hits_cache(self, client):
+        """Test a repeated matchup is served from the cache, in request order"""
+        client.get('/api/v1/bikes/compare?ids=1,2')
+        hits = comparison_cache.hits
+        data = client.get('/api/v1/bikes/compare?ids=2,1').get_json()
+        assert comparison_cache.hits == hits + 1
+        assert [bike['id'] for bike in data['data']] == [2, 1]
+
+    def test_results_fragment_hits_cache(self, client):
+        """Test the rendered results page is reused for the same selection"""
+        first = client.post('/comparison/results', data={'bike_ids[]': ['ktm-rc390', 'kawasaki-ninja300']})
+        hits = comparison_cache.hits
+        second = client.post('/comparison/results', data={'bike_ids[]': ['ktm-rc390', 'kawasaki-ninja300']})
+        assert comparison_cache.hits == hits + 1
+        assert first.data == second.data
+
+    def test_results_keep_selection_order(self, client):
+        """Test the results columns follow the order the bikes were picked in"""
+        forward = client.post('/comparison/results', data={'bike_ids[]': ['ktm-rc390', 'kawasaki-ninja300']})
+        reverse = client.post('/comparison/results', data={'bike_ids[]': ['kawasaki-ninja300', 'ktm-rc390']})
+        assert forward.data.index(b'RC 390') < forward.data.index(b'Ninja 300')
+        assert reverse.data.index(b'Ninja 300') < reverse.data.index(b'RC 390')
+
+    def test_results_only_compare_catalog_bikes(self, client):
+        """Test slugs without a catalog bike are not compared"""
+        response = client.post('/comparison/results', data={'bike_ids[]': ['ktm-rc390', 'triumph-daytona']})
+        assert b'Daytona' not in response.data
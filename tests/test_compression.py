@@ -0,0 +1,73 @@
+"""
+Response Compression Tests
+Tests for Accept-Encoding negotiation and the compressed body cache
+"""
+
+import gzip
+import brotli
+import pytest
+
+
+class TestCompression:
+    """Test negotiated response compression"""
+
+    def test_uncompressed_without_accept_encoding(self, client):
+        """Test clients that send no Accept-Encoding get plain bodies"""
+        response = client.get('/api/v1/bikes')
+        assert 'Content-Encoding' not in response.headers
+        assert response.get_json()['success'] is True
+
+    def test_gzip(self, client):
+        """Test gzip is used when it is the only accepted coding"""
+        plain = client.get('/api/v1/bikes/facets').data
+        response = client.get('/api/v1/bikes/facets', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert gzip.decompress(response.data) == plain
+        assert 'Accept-Encoding' in response.headers['Vary']
+
+    def test_brotli_preferred(self, client):
+        """Test brotli wins when both codings are accepted"""
+        plain = client.get('/api/v1/bikes/facets').data
+        response = client.get('/api/v1/bikes/facets', headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert brotli.decompress(response.data) == plain
+
+    def test_compressed_etag_still_validates(self, client):
+        """Test the weak ETag of a compressed response yields 304"""
+        headers = {'Accept-Encoding': 'gzip'}
+        response = client.get('/api/v1/bikes/facets', headers=headers)
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+
+        headers['If-None-Match'] = etag
+        assert client.get('/api/v1/bikes/facets', headers=headers).status_code == 304
+
+    def test_compressed_body_is_reused(self, client, app):
+        """Test a repeated response is served from the cache"""
+        cache = app.extensions['compressed_cache']
+        headers = {'Accept-Encoding': 'gzip'}
+        client.get('/api/v1/bikes/facets', headers=headers)
+        hits = cache.hits
+        client.get('/api/v1/bikes/facets', headers=headers)
+        assert cache.hits == hits + 1
+
+    def test_public_page_is_reused(self, client, app):
+        """Test a second GET of the login page is served from the cache"""
+        cache = app.extensions['compressed_cache']
+        headers = {'Accept-Encoding': 'gzip'}
+        response = client.get('/auth/login', headers=headers)
+        assert response.cache_control.public
+        assert b'Login' in gzip.decompress(response.data)
+        hits = cache.hits
+        client.get('/auth/login', headers=headers)
+        assert cache.hits == hits + 1
+
+    def test_private_responses_are_not_stored(self, client, app):
+        """Test responses without an ETag or public caching are compressed but not cached"""
+        cache = app.extensions['compressed_cache']
+        client.post('/auth/login', data={'username': 'testuser', 'password': 'testpass123'})
+        size, misses = cache.size, cache.misses
+        response = client.get('/dashboard/', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert not response.cache_control.public
+        assert (cache.size, cache.misses) == (size, misses)
@@ -0,0 +1,161 @@
+"""
+Fuel Calibration Tests
+Tests for fuel coefficients fitted from ride logs
+"""
+
+import numpy as np
+import pytest
+from app import db
+from app.models import Bike, RideLog, User, UserBike
+from app.models.fuel_calibrations import FuelCalibration
+from app.services.fuel_calibration import DEFAULT_FACTORS, MIN_RIDES, fuel_calibration_service
+
+# Consumption the synthetic rides are generated from
+TRUE_FACTORS = {'smooth': 0.9, 'aggressive': 1.5, 'city': 1.3, 'highway': 0.8, 'rainy': 1.1}
+
+
+@pytest.fixture
+def ride_history(app):
+    """Many logged rides for one bike, plus a second owner with only a few"""
+    with app.app_context():
+        user = User.query.filter_by(username='testuser').first()
+        bike = Bike.query.filter_by(is_active=True).first()
+        regular = UserBike(user_id=user.id, bike_id=bike.id, registration_number='FUEL-1')
+        occasional = UserBike(user_id=user.id, bike_id=bike.id, registration_number='FUEL-2')
+        db.session.add_all([regular, occasional])
+        db.session.flush()
+
+        rng = np.random.default_rng(0)
+        for ride in range(600):
+            user_bike, base = (regular, 2.5) if ride >= 5 else (occasional, 3.5)
+            style = ('smooth', 'moderate', 'aggressive')[ride % 3]
+            road = ('city', 'highway', 'track')[(ride // 3) % 3]
+            weather = ('sunny', 'rainy')[(ride // 9) % 2]
+            consumption = (base * TRUE_FACTORS.get(style, 1) * TRUE_FACTORS.get(road, 1)
+                           * TRUE_FACTORS.get(weather, 1) * rng.lognormal(0, 0.05))
+            distance = float(rng.uniform(10, 100))
+            db.session.add(RideLog(
+                user_bike_id=user_bike.id, distance=distance, fuel_consumed=consumption * distance / 100,
+                riding_style=style, road_type=road, weather_condition=weather
+            ))
+        db.session.commit()
+        ids = {'bike': bike.id, 'regular': regular.id, 'occasional': occasional.id}
+
+    yield ids
+
+    with app.app_context():
+        FuelCalibration.query.delete()
+        RideLog.query.filter(RideLog.user_bike_id.in_([ids['regular'], ids['occasional']])).delete()
+        UserBike.query.filter(UserBike.id.in_([ids['regular'], ids['occasional']])).delete()
+        db.session.commit()
+    fuel_calibration_service.invalidate()
+
+
+def _fit(app):
+    with app.app_context():
+        fitted = fuel_calibration_service.fit()
+        db.session.commit()
+    fuel_calibration_service.invalidate()
+    return fitted
+
+
+class TestFuelCalibrationFit:
+    """Test fitting coefficients from ride logs"""
+
+    def test_defaults_match_simulator(self):
+        """Test the prior factors are the simulator's fixed multipliers"""
+        from app.services.performance_simulator import PerformanceSimulator
+
+        simulator = PerformanceSimulator()
+        assert simulator._get_fuel_modifier('smooth', 'track') == DEFAULT_FACTORS['style_smooth']
+        assert simulator._get_fuel_modifier('aggressive', 'track') == DEFAULT_FACTORS['style_aggressive']
+        assert simulator._get_fuel_modifier('moderate', 'city') == DEFAULT_FACTORS['road_city']
+        assert simulator._get_fuel_modifier('moderate', 'highway') == DEFAULT_FACTORS['road_highway']
+
+    def test_recovers_ride_coefficients(self, app, ride_history):
+        """Test a long ride history recovers the consumption it was logged at"""
+        assert _fit(app) == (1, 2)
+
+        with app.app_context():
+            model = fuel_calibration_service.model_for(ride_history['bike'])
+        assert model.source == 'bike'
+        assert model.base == pytest.approx(2.5, rel=0.05)
+        assert model.modifier('aggressive', 'city', 'rainy') == pytest.approx(1.5 * 1.3 * 1.1, rel=0.05)
+        assert model.modifier('smooth', 'highway') == pytest.approx(0.9 * 0.8, rel=0.05)
+
+    def test_few_rides_shrink_toward_model(self, app, ride_history):
+        """Test a user bike with few rides sits between its logs and the model"""
+        _fit(app)
+
+        with app.app_context():
+            model = fuel_calibration_service.model_for(ride_history['bike'])
+            occasional = fuel_calibration_service.model_for(ride_history['bike'], ride_history['occasional'])
+        assert occasional.source == 'user_bike'
+        assert occasional.rides == 5 >= MIN_RIDES
+        assert model.base < occasional.base < 3.5
+
+    def test_refit_replaces_rows(self, app, ride_history):
+        """Test refitting leaves one row per bike and user bike"""
+        _fit(app)
+        _fit(app)
+        with app.app_context():
+            assert FuelCalibration.query.count() == 3
+
+
+class TestCalibratedPredictions:
+    """Test the simulator and cost calculator use fitted coefficients"""
+
+    def test_simulator_uses_user_bike_model(self, app, ride_history):
+        """Test simulate_performance prefers the user bike's coefficients"""
+        from app.services.performance_simulator import PerformanceSimulator
+
+        _fit(app)
+        with app.app_context():
+            bike = db.session.get(Bike, ride_history['bike'])
+            by_model = PerformanceSimulator().simulate_performance(bike, 75, 'city', 'rainy', 'aggressive')
+            by_user_bike = PerformanceSimulator().simulate_performance(
+                bike, 75, 'city', 'rainy', 'aggressive', user_bike_id=ride_history['occasional']
+            )
+        assert by_model['fuel_model'] == {'source': 'bike', 'rides': 600}
+        assert by_model['fuel_consumption'] == pytest.approx(2.5 * 1.5 * 1.3 * 1.1, rel=0.05)
+        assert by_user_bike['fuel_model']['source'] == 'user_bike'
+        assert by_user_bike['fuel_consumption'] > by_model['fuel_consumption']
+
+    def test_grid_matches_single_simulation(self, app, ride_history):
+        """Test calibrated grid rows agree with simulate_performance"""
+        from app.services.performance_simulator import PerformanceSimulator
+
+        _fit(app)
+        with app.app_context():
+            bike = db.session.get(Bike, ride_history['bike'])
+            table = PerformanceSimulator().simulate_grid([bike], [75], ['city', 'track'], ['sunny', 'rainy'], ['smooth'])
+            for row in table['rows']:
+                result = dict(zip(table['columns'], row))
+                expected = PerformanceSimulator().simulate_performance(
+                    bike, 75, result['road_type'], result['weather'], 'smooth'
+                )
+                assert result['fuel_consumption'] == expected['fuel_consumption']
+
+    def test_cost_calculator_uses_model(self, app, ride_history):
+        """Test annual fuel cost follows the fitted consumption"""
+        from app.services.cost_calculator import CostCalculator
+
+        _fit(app)
+        with app.app_context():
+            bike = db.session.get(Bike, ride_history['bike'])
+            results = CostCalculator().calculate_ownership_cost(bike, 10000, 100, 'comprehensive')
+        expected = 10000 * 2.5 * (1.3 + 0.8) / 2 / 100 * 100
+        assert results['fuel_model']['source'] == 'bike'
+        assert results['breakdown']['fuel_cost'] == pytest.approx(expected, rel=0.05)
+
+    def test_uncalibrated_bike_uses_specs(self, app):
+        """Test bikes without ride history keep the spec-based figures"""
+        from app.services.performance_simulator import PerformanceSimulator
+
+        fuel_calibration_service.invalidate()
+        with app.app_context():
+            bike = Bike.query.filter_by(is_active=True).first()
+            results = PerformanceSimulator().simulate_performance(bike, 75, 'city', 'sunny', 'moderate')
+            expected = 100 / ((bike.specs.mileage_city + bike.specs.mileage_highway) / 2) * 1.2
+        assert results['fuel_model']['source'] == 'specs'
+        assert results['fuel_consumption'] == round(expected, 2)
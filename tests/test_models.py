@@ -4,8 +4,8 @@ Tests for all database models and their relationships
 """
 
 import pytest
-from datetime import datetime
-from app.models import User, Bike, BikeSpecs, UserBike, Ride, MaintenanceRecord
+from datetime import date, datetime
+from app.models import User, Bike, BikeSpec, UserBike, RideLog, MaintenanceRecord
 from app import db
 
 
@@ -16,18 +16,17 @@ class TestUserModel:
         """Test creating a new user"""
         with app.app_context():
             user = User(
-                username='newuser',
-                email='newuser@test.com',
-                first_name='New',
-                last_name='User'
+                username='modeluser',
+                email='modeluser@test.com',
+                full_name='New User'
             )
             user.set_password('password123')
             db.session.add(user)
             db.session.commit()
             
             assert user.id is not None
-            assert user.username == 'newuser'
-            assert user.email == 'newuser@test.com'
+            assert user.username == 'modeluser'
+            assert user.email == 'modeluser@test.com'
     
     def test_password_hashing(self, app):
         """Test password hashing and verification"""
@@ -50,7 +49,7 @@ class TestUserModel:
         """Test user-bikes relationship"""
         with app.app_context():
             user = User.query.filter_by(email='test@example.com').first()
-            bikes = user.bikes  # Should access relationship
+            bikes = user.user_bikes.all()  # Should access relationship
             assert isinstance(bikes, list)
 
 
@@ -85,14 +84,15 @@ class TestBikeModel:
                 category='sport'
             )
             
-            specs = BikeSpecs(
+            specs = BikeSpec(
                 bike=bike,
                 engine_cc=399,
                 max_power=45,
                 max_torque=38,
                 kerb_weight=168,
                 fuel_capacity=14,
-                mileage=28
+                mileage_city=26,
+                mileage_highway=30
             )
             
             db.session.add(bike)
@@ -123,7 +123,7 @@ class TestUserBikeModel:
             user_bike = UserBike(
                 user_id=user.id,
                 bike_id=bike.id,
-                purchase_date=datetime.utcnow(),
+                purchase_date=date.today(),
                 purchase_price=bike.price,
                 current_km=5000,
                 registration_number='MH01AB1234'
@@ -145,19 +145,19 @@ class TestUserBikeModel:
             user_bike = UserBike(
                 user_id=user.id,
                 bike_id=bike.id,
-                purchase_date=datetime.utcnow()
+                purchase_date=date.today()
             )
             
             db.session.add(user_bike)
             db.session.commit()
             
             # Test relationships
-            assert user_bike.user == user
+            assert user_bike.owner == user
             assert user_bike.bike == bike
 
 
 class TestRideModel:
-    """Test Ride model"""
+    """Test RideLog model"""
     
     def test_create_ride(self, app):
         """Test creating a ride record"""
@@ -169,12 +169,12 @@ class TestRideModel:
             user_bike = UserBike(
                 user_id=user.id,
                 bike_id=bike.id,
-                purchase_date=datetime.utcnow()
+                purchase_date=date.today()
             )
             db.session.add(user_bike)
             db.session.commit()
             
-            ride = Ride(
+            ride = RideLog(
                 user_bike_id=user_bike.id,
                 ride_date=datetime.utcnow(),
                 distance=50.5,
@@ -183,7 +183,7 @@ class TestRideModel:
                 max_speed=80.0,
                 fuel_consumed=2.5,
                 road_type='highway',
-                weather='sunny'
+                weather_condition='sunny'
             )
             
             db.session.add(ride)
@@ -196,7 +196,7 @@ class TestRideModel:
     def test_ride_mileage_calculation(self, app):
         """Test calculating mileage from ride data"""
         with app.app_context():
-            ride = Ride(
+            ride = RideLog(
                 distance=100,
                 fuel_consumed=4
             )
@@ -217,15 +217,15 @@ class TestMaintenanceModel:
             user_bike = UserBike(
                 user_id=user.id,
                 bike_id=bike.id,
-                purchase_date=datetime.utcnow()
+                purchase_date=date.today()
             )
             db.session.add(user_bike)
             db.session.commit()
             
             maintenance = MaintenanceRecord(
                 user_bike_id=user_bike.id,
-                service_date=datetime.utcnow(),
-                service_type='oil_change',
+                service_date=date.today(),
+                maintenance_type='oil_change',
                 odometer_reading=5000,
                 cost=1500,
                 description='Engine oil and filter change'
@@ -235,7 +235,7 @@ class TestMaintenanceModel:
             db.session.commit()
             
             assert maintenance.id is not None
-            assert maintenance.service_type == 'oil_change'
+            assert maintenance.maintenance_type == 'oil_change'
             assert maintenance.cost == 1500
 
 
@@ -0,0 +1,86 @@
+"""
+Rating Summary Tests
+Tests for the incrementally maintained bike_rating_summary table
+"""
+
+import pytest
+from app.models import Bike, User, Review, BikeRatingSummary
+from app.services.rating_summary import rating_summary_service
+from app import db
+
+
+def _review(bike, user, rating, **kwargs):
+    review = Review(
+        user_id=user.id,
+        bike_id=bike.id,
+        rating=rating,
+        title='Test review',
+        content='x' * 120,
+        is_verified=True,
+        **kwargs
+    )
+    db.session.add(review)
+    db.session.flush()
+    return review
+
+
+class TestRatingSummary:
+    """Test summary updates match the reviews table"""
+
+    def test_record_review_updates_totals(self, app):
+        """Test recording reviews updates count, averages and histogram"""
+        with app.app_context():
+            bike = Bike.query.order_by(Bike.id.desc()).first()
+            user = User.query.first()
+            try:
+                rating_summary_service.record_review(_review(bike, user, 4, comfort_rating=3))
+                last = _review(bike, user, 2)
+                summary = rating_summary_service.record_review(last)
+
+                assert summary.review_count == 2
+                assert summary.average_rating == 3
+                assert summary.category_averages['comfort'] == 3
+                assert summary.histogram[4] == 1 and summary.histogram[2] == 1
+                assert summary.recent_ids[0] == last.id
+            finally:
+                db.session.rollback()
+
+    def test_retract_review_reverses_record(self, app):
+        """Test retracting a review restores the previous totals"""
+        with app.app_context():
+            bike = Bike.query.order_by(Bike.id.desc()).first()
+            user = User.query.first()
+            try:
+                kept = _review(bike, user, 5)
+                rating_summary_service.record_review(kept)
+                removed = _review(bike, user, 1)
+                rating_summary_service.record_review(removed)
+
+                removed.is_verified = False
+                summary = rating_summary_service.retract_review(removed)
+
+                assert summary.review_count == 1
+                assert summary.average_rating == 5
+                assert summary.histogram[1] == 0
+                assert summary.recent_ids == [kept.id]
+            finally:
+                db.session.rollback()
+
+    def test_rebuild_matches_incremental(self, app):
+        """Test a full rebuild agrees with incremental updates"""
+        with app.app_context():
+            bike = Bike.query.order_by(Bike.id.desc()).first()
+            user = User.query.first()
+            try:
+                for rating in (3, 4, 5):
+                    rating_summary_service.record_review(_review(bike, user, rating, looks_rating=rating))
+                incremental = db.session.get(BikeRatingSummary, bike.id)
+                expected = (incremental.review_count, incremental.rating_sum,
+                            incremental.category_averages, incremental.recent_ids)
+
+                rating_summary_service.rebuild(bike.id)
+                rebuilt = db.session.get(BikeRatingSummary, bike.id)
+                assert (rebuilt.review_count, rebuilt.rating_sum,
+                        rebuilt.category_averages, rebuilt.recent_ids) == expected
+            finally:
+                db.session.rollback()
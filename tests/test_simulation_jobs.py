@@ -0,0 +1,188 @@
+"""
+Simulation Job Tests
+Tests for background simulation jobs, their persistence and limits
+"""
+
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from app import db
+from app.models import Bike, User
+from app.models.simulation_jobs import SimulationJob
+
+
+@pytest.fixture
+def user_client(client):
+    """Client logged in as the test user"""
+    client.post('/auth/login', data={
+        'username': 'testuser',
+        'password': 'testpass123'
+    })
+    return client
+
+
+def _user_id(app):
+    with app.app_context():
+        return User.query.filter_by(username='testuser').first().id
+
+
+def _bike_id(app):
+    with app.app_context():
+        return Bike.query.filter_by(is_active=True).first().id
+
+
+class TestJobSubmission:
+    """Test submitting jobs and fetching their results"""
+
+    def test_requires_login(self, client):
+        """Test anonymous users cannot submit jobs"""
+        response = client.post('/simulator/jobs', json={'kind': 'grid'})
+        assert response.status_code == 302
+
+    def test_monte_carlo_job(self, user_client, app):
+        """Test a Monte Carlo job completes with the direct simulation's result"""
+        from app.services.performance_simulator import PerformanceSimulator
+
+        bike_id = _bike_id(app)
+        response = user_client.post('/simulator/jobs', json={
+            'kind': 'monte_carlo', 'bike_id': bike_id, 'samples': 2000, 'seed': 11
+        })
+        assert response.status_code == 202
+        job = response.get_json()['job']
+        assert response.headers['Location'] == job['status_url']
+
+        status = user_client.get(job['status_url']).get_json()['job']
+        assert status['status'] == 'completed'
+        assert status['progress'] == 1.0
+
+        result = user_client.get(job['result_url']).get_json()['data']
+        with app.app_context():
+            expected = PerformanceSimulator().simulate_monte_carlo(
+                db.session.get(Bike, bike_id), 70, 'city', 'sunny', 'moderate', samples=2000, seed=11
+            )
+        assert result == json.loads(json.dumps(expected))
+
+    def test_catalog_grid_job(self, user_client, app):
+        """Test a grid job without bike_ids covers every bike with specs"""
+        with app.app_context():
+            bikes = Bike.query.filter_by(is_active=True).all()
+            with_specs = sum(1 for bike in bikes if bike.specs)
+
+        job = user_client.post('/simulator/jobs', json={
+            'kind': 'grid', 'road_types': ['city', 'track'], 'riding_styles': ['smooth', 'aggressive']
+        }).get_json()['job']
+
+        data = user_client.get(job['result_url']).get_json()['data']
+        assert data['count'] == with_specs * 2 * 2
+        assert len({row[0] for row in data['rows']}) == with_specs
+
+    def test_invalid_job(self, user_client):
+        """Test unknown kinds and missing parameters are rejected"""
+        assert user_client.post('/simulator/jobs', json={'kind': 'drag_race'}).status_code == 400
+        assert user_client.post('/simulator/jobs', json={'kind': 'monte_carlo'}).status_code == 400
+
+    def test_failed_job_reports_error(self, user_client):
+        """Test a job that fails keeps its error and has no result"""
+        job = user_client.post('/simulator/jobs', json={
+            'kind': 'monte_carlo', 'bike_id': 999999
+        }).get_json()['job']
+
+        response = user_client.get(job['result_url'])
+        assert response.status_code == 409
+        assert response.get_json()['job']['status'] == 'failed'
+        assert response.get_json()['error'] == 'Bike not found'
+
+
+class TestJobState:
+    """Test job ownership, limits, cancellation and recovery"""
+
+    def _queued_job(self, app, user_id, **values):
+        with app.app_context():
+            job = SimulationJob(
+                id=uuid.uuid4().hex, user_id=user_id, kind='monte_carlo',
+                params=json.dumps({
+                    'bike_id': Bike.query.filter_by(is_active=True).first().id, 'rider_weight': 70,
+                    'road_type': 'city', 'weather': 'sunny', 'riding_style': 'moderate',
+                    'samples': 100, 'seed': 1
+                }),
+                **values
+            )
+            db.session.add(job)
+            db.session.commit()
+            return job.id
+
+    def _delete(self, app, *job_ids):
+        with app.app_context():
+            SimulationJob.query.filter(SimulationJob.id.in_(job_ids)).delete()
+            db.session.commit()
+
+    def test_per_user_limit(self, user_client, app):
+        """Test submits beyond the active job limit are refused"""
+        limit = app.config['SIMULATION_JOB_LIMIT']
+        job_ids = [self._queued_job(app, _user_id(app)) for _ in range(limit)]
+        try:
+            response = user_client.post('/simulator/jobs', json={'kind': 'grid', 'bike_ids': [_bike_id(app)]})
+            assert response.status_code == 429
+        finally:
+            self._delete(app, *job_ids)
+
+    def test_poll_hint(self, user_client, app):
+        """Test active jobs ask the client to poll again later and finished ones don't"""
+        job_id = self._queued_job(app, _user_id(app))
+        try:
+            response = user_client.get(f'/simulator/jobs/{job_id}')
+            assert response.headers['Retry-After'].isdigit()
+            user_client.delete(f'/simulator/jobs/{job_id}')
+            assert 'Retry-After' not in user_client.get(f'/simulator/jobs/{job_id}').headers
+        finally:
+            self._delete(app, job_id)
+
+    def test_cancel_queued_job(self, user_client, app):
+        """Test a queued job can be cancelled once and then has no result"""
+        job_id = self._queued_job(app, _user_id(app))
+        try:
+            response = user_client.delete(f'/simulator/jobs/{job_id}')
+            assert response.status_code == 200
+            assert response.get_json()['job']['status'] == 'cancelled'
+            assert user_client.delete(f'/simulator/jobs/{job_id}').status_code == 409
+            assert user_client.get(f'/simulator/jobs/{job_id}/result').status_code == 409
+        finally:
+            self._delete(app, job_id)
+
+    def test_other_users_jobs_are_hidden(self, user_client, app):
+        """Test a job is only visible to the user who submitted it"""
+        with app.app_context():
+            other_id = User.query.filter(User.username != 'testuser').first().id
+        job_id = self._queued_job(app, other_id, status='cancelled')
+        try:
+            assert user_client.get(f'/simulator/jobs/{job_id}').status_code == 404
+            assert user_client.delete(f'/simulator/jobs/{job_id}').status_code == 404
+        finally:
+            self._delete(app, job_id)
+
+    def test_recover_requeues_stale_jobs(self, app):
+        """Test each scan reruns jobs left running by a dead worker, not live ones"""
+        from app.services.simulation_jobs import SimulationJobQueue, STALE_AFTER
+
+        user_id = _user_id(app)
+        stale = self._queued_job(
+            app, user_id, status='running', heartbeat_at=datetime.utcnow() - STALE_AFTER - timedelta(minutes=1)
+        )
+        live = self._queued_job(app, user_id, status='running', heartbeat_at=datetime.utcnow())
+        try:
+            queue = SimulationJobQueue()
+            queue.init_app(app)
+            with app.app_context():
+                queue.recover(app)
+                assert db.session.get(SimulationJob, stale).status == 'completed'
+                assert db.session.get(SimulationJob, live).status == 'running'
+
+                # Later scans pick up jobs whose worker has died since
+                db.session.get(SimulationJob, live).heartbeat_at = datetime.utcnow() - STALE_AFTER
+                db.session.commit()
+                queue.recover(app)
+                assert db.session.get(SimulationJob, live).status == 'completed'
+        finally:
+            self._delete(app, stale, live)